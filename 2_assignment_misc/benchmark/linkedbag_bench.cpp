@@ -0,0 +1,105 @@
+// Benchmark driver for the LinkedBag functions of assignment 2.
+//
+// Built by grader/complexity.py against each student's LinkedBag.h:
+//
+//     g++ -std=c++20 -O2 -I <folder of LinkedBag.h> linkedbag_bench.cpp
+//
+// Usage: linkedbag_bench <function> <n>
+//
+// Fills a LinkedBag<int> with n items, then calls the function repeatedly
+// at positions spread over the bag and prints three lines:
+//
+//     setup <seconds to fill the bag>
+//     calls <number of calls> <seconds spent in them>
+//     peak_kb <peak resident memory, from /proc/self/status; Linux only>
+//
+// Edit call() if the assignment's signatures change.
+
+#include "LinkedBag.h"
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <string>
+
+using Clock = std::chrono::steady_clock;
+
+static const double TARGET_SECONDS = 0.2; // Stop repeating once the calls took this long
+static const long MAX_CALLS = 100000;
+
+static volatile long sink = 0; // Keeps results alive so calls are not optimised away
+
+static double since(Clock::time_point start) {
+    return std::chrono::duration<double>(Clock::now() - start).count();
+}
+
+// Position for call i: spread over the middle of the bag (valid whether k
+// counts from 0 or from 1)
+static int position(long i, long n) {
+    if (n < 3) {
+        return 1;
+    }
+    return 1 + static_cast<int>((i * 7919 + n / 2) % (n - 2));
+}
+
+static bool call(LinkedBag<int>& bag, const char* function, long i, long n) {
+    if (std::strcmp(function, "findKthItem") == 0) {
+        sink = sink + bag.findKthItem(position(i, n));
+        return true;
+    }
+    if (std::strcmp(function, "reverseAppendK") == 0) {
+        sink = sink + bag.reverseAppendK(static_cast<int>(i), position(i, n));
+        return true;
+    }
+    return false;
+}
+
+static long peak_kb() {
+    std::ifstream status("/proc/self/status");
+    std::string line;
+    while (std::getline(status, line)) {
+        if (line.compare(0, 6, "VmHWM:") == 0) {
+            return std::atol(line.c_str() + 6);
+        }
+    }
+    return 0;
+}
+
+// Functions that add to the bag are called at most n / 4 times, so the bag
+// stays close to n items
+static bool grows(const char* function) {
+    return std::strcmp(function, "reverseAppendK") == 0;
+}
+
+int main(int argc, char* argv[]) {
+    if (argc != 3) {
+        std::fprintf(stderr, "usage: %s <function> <n>\n", argv[0]);
+        return 2;
+    }
+    const char* function = argv[1];
+    long n = std::atol(argv[2]);
+
+    Clock::time_point start = Clock::now();
+    LinkedBag<int> bag;
+    for (long i = 0; i < n; i++) {
+        bag.add(static_cast<int>(i));
+    }
+    std::printf("setup %.6f\n", since(start));
+    std::fflush(stdout);
+
+    long limit = grows(function) ? (n / 4 > 0 ? n / 4 : 1) : MAX_CALLS;
+    long calls = 0;
+    start = Clock::now();
+    while (calls < limit && (calls == 0 || since(start) < TARGET_SECONDS)) {
+        if (!call(bag, function, calls, n)) {
+            std::fprintf(stderr, "unknown function: %s\n", function);
+            return 2;
+        }
+        calls++;
+    }
+    std::printf("calls %ld %.9f\n", calls, since(start));
+    std::printf("peak_kb %ld\n", peak_kb());
+    return 0;
+}
@@ -1,34 +1,162 @@
+import os
 import glob
+import time
+import signal
+import tempfile
+import threading
 import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
 
-def compile_cpp_files():
-    cpp_files = glob.glob("*.cpp")
+from .diagnostics import (
+    GCC_JSON_FLAG,
+    parse_compiler_output,
+    parse_linker_output,
+    render_diagnostics,
+)
+
+CXX_FLAGS = ["-std=c++20"]
+
+
+class CompileError(RuntimeError):
+    """A g++ step failed; `diagnostics` holds what g++ reported (see grader/diagnostics.py)."""
+
+    def __init__(self, message, diagnostics=()):
+        super().__init__(message)
+        self.diagnostics = list(diagnostics)
+
+
+def _run_gxx(args, cwd=None, timeout=None, step="g++"):
+    """Run g++, turning a timeout into TimeoutError."""
+    try:
+        return subprocess.run(["g++"] + args, capture_output=True, text=True,
+                              cwd=cwd, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise TimeoutError(f"{step} took longer than {timeout} seconds")
+
+
+@lru_cache(maxsize=None)
+def build_id():
+    """Compiler version and flags; part of every object cache key (see grader/sandbox.py)."""
+    try:
+        version = subprocess.run(["g++", "--version"], capture_output=True, text=True).stdout
+    except OSError:
+        version = ''
+    return f"{version.splitlines()[0] if version else 'g++'} {' '.join(CXX_FLAGS)}"
+
+
+def _report(result, step):
+    """Print g++ output as capped diagnostic lines and return the diagnostics."""
+    if step == 'link':
+        diagnostics, other = parse_linker_output(result.stderr)
+    else:
+        diagnostics, other = parse_compiler_output(result.stderr, step)
+    print(result.stdout, end='')
+    for line in render_diagnostics(diagnostics) + other:
+        print(line)
+    return diagnostics
+
+
+def syntax_check(cpp_files, cwd=None, timeout=None):
+    """
+    Parse .cpp files without generating code (g++ -fsyntax-only).
+
+    Much cheaper than compiling, so a submission that does not even parse
+    fails before any object files are built.
+
+    Raises:
+        CompileError: With the parsed diagnostics, if g++ reports errors
+    """
     if not cpp_files:
         raise FileNotFoundError("No .cpp files found in current folder")
-    print("\n--- Compiling: ---\n", cpp_files)
-    result = subprocess.run(["g++", "-std=c++20", "-c"] + cpp_files,
-                            capture_output=True, text=True)
-    print(result.stdout, end='')
-    print(result.stderr, end='')
+    print("\n--- Syntax check: ---\n", cpp_files)
+    result = _run_gxx(CXX_FLAGS + ["-fsyntax-only", GCC_JSON_FLAG] + cpp_files, cwd, timeout,
+                      "Syntax check")
+    diagnostics = _report(result, 'syntax')
     if result.returncode != 0:
-        raise RuntimeError("Compilation failed")
-    o_files = glob.glob("*.o")
+        raise CompileError("Syntax check failed", diagnostics)
+
+
+def compile_cpp_files(cpp_files=None, cwd=None, timeout=None, cache=None, keys=None):
+    """
+    Compile .cpp files to object files.
+
+    Args:
+        cpp_files: Files to compile (e.g. from the submission manifest);
+            every *.cpp in the folder when not given
+        cwd: Folder to compile in (default: the current folder)
+        timeout: Seconds before giving up (raises TimeoutError)
+        cache: ObjectCache to take unchanged object files from and add new
+            ones to (see grader/sandbox.py)
+        keys: Cache key of each file in cpp_files (required with cache)
+
+    Raises:
+        CompileError: With the parsed diagnostics, if g++ reports errors
+    """
+    if cpp_files is None:
+        cpp_files = glob.glob(os.path.join(cwd or ".", "*.cpp"))
+        cpp_files = [os.path.basename(f) for f in cpp_files]
+    if not cpp_files:
+        raise FileNotFoundError("No .cpp files found in current folder")
+    folder = cwd or "."
+    o_files = [os.path.splitext(os.path.basename(f))[0] + ".o" for f in cpp_files]
+    objects = dict(zip(cpp_files, o_files))
+    todo = list(cpp_files)
+    if cache is not None:
+        todo = [f for f in cpp_files if not cache.fetch(keys[f], os.path.join(folder, objects[f]))]
+        if len(todo) < len(cpp_files):
+            print("\n--- Unchanged, taken from the object cache: ---\n",
+                  [f for f in cpp_files if f not in todo])
+
+    if todo:
+        print("\n--- Compiling: ---\n", todo)
+        result = _run_gxx(CXX_FLAGS + ["-c", GCC_JSON_FLAG] + todo, cwd, timeout, "Compilation")
+        diagnostics = _report(result, 'compile')
+        if result.returncode != 0:
+            raise CompileError("Compilation failed", diagnostics)
+        if cache is not None:
+            for f in todo:
+                if os.path.exists(os.path.join(folder, objects[f])):
+                    cache.store(keys[f], os.path.join(folder, objects[f]))
+    o_files = [f for f in o_files if os.path.exists(os.path.join(folder, f))]
     if not o_files:
         raise RuntimeError("No object files generated after compilation")
     return o_files
 
 
-def link_executable(o_files, executable_name):
-    result = subprocess.run(["g++", "-o", executable_name] + o_files,
-                            capture_output=True, text=True)
-    print(result.stdout, end='')
-    print(result.stderr, end='')
+def link_executable(o_files, executable_name, cwd=None, timeout=None):
+    result = _run_gxx(["-o", executable_name] + o_files, cwd, timeout, "Linking")
+    diagnostics = _report(result, 'link')
     if result.returncode != 0:
-        raise RuntimeError("Linking failed")
+        raise CompileError("Linking failed", diagnostics)
     return executable_name
 
 
-def run_executable(executable_name, timeout_seconds=5):
+def compile_driver(driver, include_dirs, executable_name, cwd=None, timeout=None):
+    """
+    Build an instructor-provided program against a submission's headers.
+
+    Compiled with optimisation (-O2), so timings reflect the algorithm
+    rather than debug code.
+
+    Args:
+        driver: Path to the driver's .cpp file
+        include_dirs: Folders searched for the headers it includes
+        executable_name: Output file, relative to cwd
+        cwd: Folder to build in
+        timeout: Seconds before giving up (raises TimeoutError)
+
+    Raises:
+        CompileError: With the parsed diagnostics, if g++ reports errors
+    """
+    args = CXX_FLAGS + ["-O2", GCC_JSON_FLAG] + [f"-I{d}" for d in include_dirs]
+    result = _run_gxx(args + [driver, "-o", executable_name], cwd, timeout, "Building the driver")
+    diagnostics = parse_compiler_output(result.stderr, 'driver')[0]
+    if result.returncode != 0:
+        raise CompileError("Building the driver failed", diagnostics)
+    return executable_name
+
+def run_executable(executable_name, timeout_seconds=5, cwd=None):
     """
     Run executable with timeout and capture output.
     Works for both interactive and non-interactive programs.
@@ -36,6 +164,7 @@ def run_executable(executable_name, timeout_seconds=5):
     Args:
         executable_name: Name of executable to run
         timeout_seconds: Max seconds to let it run (default 5)
+        cwd: Folder holding the executable (default: the current folder)
     
     Returns:
         bool: True if executable started, False if failed
@@ -46,7 +175,8 @@ def run_executable(executable_name, timeout_seconds=5):
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True
+            text=True,
+            cwd=cwd,
         )
         
         try:
@@ -79,3 +209,60 @@ def run_executable(executable_name, timeout_seconds=5):
     except Exception as e:
         print(f"✗ Execution failed: {e}")
         return False
+
+
+@dataclass(slots=True)
+class LimitedRun:
+    """Outcome of run_limited."""
+    returncode: int
+    stdout: str
+    stderr: str
+    seconds: float          # Wall-clock time
+    timed_out: bool
+
+
+def run_limited(args, cwd=None, seconds=10, memory_mb=512):
+    """
+    Run a program under CPU, memory and wall-clock limits.
+
+    The limits are set with ulimit in a shell that then execs the program,
+    so this is safe to call from several threads at once. Output goes to
+    temporary files rather than pipes, so a program printing a lot cannot
+    block.
+
+    Args:
+        args: Program and arguments
+        cwd: Folder to run in
+        seconds: CPU limit; the wall-clock limit is twice this
+        memory_mb: Address space limit
+
+    Returns:
+        LimitedRun; a program killed for using too much CPU or wall-clock
+        time has timed_out set
+    """
+    limits = f"ulimit -S -t {int(seconds)} && ulimit -v {int(memory_mb) * 1024}"
+    command = ["/bin/sh", "-c", f'{limits} && exec "$0" "$@"'] + list(args)
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        start = time.monotonic()
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=out, stderr=err, cwd=cwd)
+        killed = threading.Event()
+
+        def kill():
+            killed.set()
+            process.kill()
+
+        timer = threading.Timer(2 * seconds, kill)
+        timer.start()
+        try:
+            process.wait()
+        finally:
+            timer.cancel()
+        elapsed = time.monotonic() - start
+        out.seek(0)
+        err.seek(0)
+        stdout = out.read().decode('utf-8', errors='replace')
+        stderr = err.read().decode('utf-8', errors='replace')
+
+    # SIGXCPU (CPU limit) or our kill (wall clock)
+    timed_out = killed.is_set() or process.returncode == -signal.SIGXCPU
+    return LimitedRun(process.returncode, stdout, stderr, round(elapsed, 6), timed_out)
@@ -0,0 +1,255 @@
+"""
+Growth-rate profiler for functions an assignment requires.
+
+The rubric checks only see that a function like findKthItem exists.
+This module builds an instructor driver (rubric [benchmark] table)
+against the student's header in the build sandbox, times each function
+at increasing sizes (10^3 to 10^6 elements by default) and fits the
+per-call time to n^x on a log-log scale. A function growing clearly
+faster than expected (e.g. n^2 where n^1 was expected) is flagged as a
+probable accidental O(n^2); so is one that hits the time limit at a size
+where the expected growth would have finished easily.
+
+Every run goes through run_limited (CPU, memory and wall-clock limits),
+so one student's runaway loop cannot stall the cohort; submissions are
+profiled in parallel by the grading pool like every other stage. All
+runs of one submission share a time budget (DEFAULT_BUDGET, or the
+rubric's `budget`): sizes left when it runs out are reported as not
+measured (WARN), so a slow submission cannot push the whole grade past
+its timeout.
+
+The driver is run as `driver <function> <n>` and prints:
+
+    setup <seconds>
+    calls <number of calls> <seconds>
+    peak_kb <peak resident memory>     (optional; shown as unknown without it)
+"""
+
+import math
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .compile import CompileError, compile_driver, run_limited
+from .index import SubmissionIndex
+from .results import CheckResult, Status
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_SECONDS = 10        # CPU seconds per driver run
+DEFAULT_MEMORY_MB = 512
+DEFAULT_REPEATS = 2         # Runs per size; the fastest counts
+DEFAULT_BUDGET = 60         # Wall-clock seconds for all runs of one submission
+SLOPE_TOLERANCE = 0.5       # Fitted exponent may exceed the expected one by this much
+BUILD_TIMEOUT = 60
+DRIVER_NAME = 'complexity_driver'
+
+
+@dataclass(slots=True)
+class FunctionProfile:
+    """
+    Timings of one function.
+
+    Attributes:
+        function: Function name passed to the driver
+        sizes: Sizes that finished
+        per_call: Seconds per call at each of those sizes
+        slope: Fitted exponent x of n^x (None with fewer than two sizes)
+        expected: Exponent the function should have
+        peak_kb: Highest peak memory the driver reported for any run
+            (None if it never reported one)
+        stopped_at: Size that did not finish (timeout or crash), if any
+        problem: Why it did not finish
+        flagged: Grows faster than expected or stopped early
+    """
+    function: str
+    sizes: List[int] = field(default_factory=list)
+    per_call: List[float] = field(default_factory=list)
+    slope: Optional[float] = None
+    expected: float = 1.0
+    peak_kb: Optional[int] = None
+    stopped_at: Optional[int] = None
+    problem: str = ''
+    flagged: bool = False
+
+
+def fit_slope(sizes: List[int], seconds: List[float]) -> Optional[float]:
+    """Least-squares slope of log(seconds) against log(size); None with fewer than two points."""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+def parse_driver_output(stdout: str) -> Dict[str, List[str]]:
+    """Driver output lines as {first word: remaining words}."""
+    fields = {}
+    for line in stdout.splitlines():
+        words = line.split()
+        if words:
+            fields[words[0]] = words[1:]
+    return fields
+
+
+def _describe_stop(run, fields: dict, seconds: int, memory_mb: int) -> str:
+    if run.timed_out:
+        what = "calls" if 'setup' in fields else "filling the container"
+        return f"{what} did not finish within {seconds} s"
+    # Under the address space limit an allocation fails with bad_alloc
+    # (or the program is killed); a plain crash is not reported as memory
+    if 'bad_alloc' in run.stderr or run.returncode == -signal.SIGKILL:
+        return f"ran out of memory (limit {memory_mb} MB)"
+    detail = run.stderr.strip().splitlines()[-1] if run.stderr.strip() else ''
+    return f"crashed (exit code {run.returncode}){': ' + detail if detail else ''}"
+
+
+def profile_function(executable: str, function: str, sizes=DEFAULT_SIZES, cwd: str = None,
+                     seconds: int = DEFAULT_SECONDS, memory_mb: int = DEFAULT_MEMORY_MB,
+                     repeats: int = DEFAULT_REPEATS, expected: float = 1.0,
+                     deadline: Optional[float] = None) -> FunctionProfile:
+    """
+    Time one function at increasing sizes, stopping at the first size that
+    fails or when the deadline leaves no time for another run.
+
+    Args:
+        executable: Built driver, relative to cwd
+        function: Function name passed to the driver
+        sizes: Container sizes, ascending
+        cwd: Folder to run in
+        seconds: CPU limit per run
+        memory_mb: Memory limit per run
+        repeats: Runs per size; the fastest counts
+        expected: Exponent x of the expected n^x time per call
+        deadline: time.monotonic() by which every run must be over (None:
+            no limit); each run's CPU limit is cut to fit
+    """
+    profile = FunctionProfile(function, expected=expected)
+    limit = seconds
+    for n in sizes:
+        best = None
+        for _ in range(repeats):
+            if deadline is not None:
+                # run_limited kills a run at twice its CPU limit of wall-clock time
+                limit = min(seconds, int((deadline - time.monotonic()) / 2))
+                if limit < 1:
+                    profile.stopped_at = n
+                    profile.problem = "not run: benchmark time budget used up"
+                    break
+            run = run_limited([f"./{executable}", function, str(n)], cwd, limit, memory_mb)
+            fields = parse_driver_output(run.stdout)
+            if fields.get('peak_kb') and int(fields['peak_kb'][0]) > 0:
+                profile.peak_kb = max(profile.peak_kb or 0, int(fields['peak_kb'][0]))
+            if run.returncode != 0 or 'calls' not in fields:
+                profile.stopped_at = n
+                profile.problem = _describe_stop(run, fields, limit, memory_mb)
+                break
+            calls, total = int(fields['calls'][0]), float(fields['calls'][1])
+            per_call = total / max(calls, 1)
+            best = per_call if best is None else min(best, per_call)
+        if profile.stopped_at is not None:
+            break
+        profile.sizes.append(n)
+        profile.per_call.append(best)
+
+    profile.slope = fit_slope(profile.sizes, profile.per_call)
+    if profile.slope is not None and profile.slope > expected + SLOPE_TOLERANCE:
+        profile.flagged = True
+    if profile.stopped_at is not None and 'finish' in profile.problem and profile.sizes:
+        # At the expected growth, the size that timed out would have been quick
+        projected = profile.per_call[-1] * (profile.stopped_at / profile.sizes[-1]) ** expected
+        profile.flagged = profile.flagged or projected < limit / 10
+    return profile
+
+
+def _format_seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.2f} s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f} ms"
+    return f"{value * 1e6:.2f} µs"
+
+
+def _format_exponent(x: float) -> str:
+    return f"n^{x:g}" if x != 1 else "n"
+
+
+def profile_budget(benchmark: dict) -> float:
+    """Longest profile_submission can take with this [benchmark] table (driver build plus runs)."""
+    return BUILD_TIMEOUT + benchmark.get('budget', DEFAULT_BUDGET) + 10
+
+
+def profile_submission(index: SubmissionIndex, sandbox: str, benchmark: dict) -> CheckResult:
+    """
+    Profile a submission's required functions with the rubric's driver.
+
+    Args:
+        index: Index of the submission
+        sandbox: Build sandbox holding the submission's files
+        benchmark: The rubric's [benchmark] table (driver, header,
+            functions, and optionally expected, sizes, seconds,
+            memory_mb, repeats, budget)
+
+    Returns:
+        CheckResult whose value maps each function to its FunctionProfile
+        fields; WARN if any function was flagged or did not finish every size
+    """
+    result = CheckResult('profile_complexity', Status.PASS, value={})
+    header = benchmark['header'].lower()
+    matches = [f for f in index.files(recursive=True) if os.path.basename(f).lower() == header]
+    if not matches:
+        result.status = Status.FAIL
+        result.add(Status.FAIL, f"{benchmark['header']} not found; functions not profiled")
+        return result
+    include_dir = os.path.dirname(matches[0]) or '.'
+
+    try:
+        compile_driver(benchmark['driver'], [include_dir], DRIVER_NAME, cwd=sandbox, timeout=BUILD_TIMEOUT)
+    except CompileError as e:
+        result.status = Status.FAIL
+        result.add(Status.FAIL, f"Benchmark driver does not build against {matches[0]}")
+        for diagnostic in e.diagnostics[:5]:
+            result.add(Status.INFO, diagnostic.format(), indent=1)
+        return result
+
+    expected = benchmark.get('expected', {})
+    sizes = sorted(benchmark.get('sizes', DEFAULT_SIZES))
+    deadline = time.monotonic() + benchmark.get('budget', DEFAULT_BUDGET)
+    for function in benchmark['functions']:
+        profile = profile_function(
+            DRIVER_NAME, function, sizes, cwd=sandbox,
+            seconds=benchmark.get('seconds', DEFAULT_SECONDS),
+            memory_mb=benchmark.get('memory_mb', DEFAULT_MEMORY_MB),
+            repeats=benchmark.get('repeats', DEFAULT_REPEATS),
+            expected=expected.get(function, 1.0) if isinstance(expected, dict) else expected,
+            deadline=deadline,
+        )
+        result.value[function] = {
+            'sizes': profile.sizes, 'per_call': profile.per_call, 'slope': profile.slope,
+            'expected': profile.expected, 'peak_kb': profile.peak_kb,
+            'stopped_at': profile.stopped_at, 'problem': profile.problem, 'flagged': profile.flagged,
+        }
+
+        status = Status.WARN if profile.flagged or profile.stopped_at is not None else Status.PASS
+        if status == Status.WARN:
+            result.status = Status.WARN
+        if profile.sizes:
+            growth = f"~{_format_exponent(round(profile.slope, 2))}" if profile.slope is not None else "?"
+            memory = f"{profile.peak_kb / 1024:.1f} MB" if profile.peak_kb is not None else "unknown"
+            result.add(status, f"{function}: {growth} per call (expected {_format_exponent(profile.expected)}), "
+                               f"peak memory {memory}")
+        else:
+            result.add(status, f"{function}: not measured")
+        for n, seconds in zip(profile.sizes, profile.per_call):
+            result.add(Status.INFO, f"n = {n:>9,}: {_format_seconds(seconds)} per call", indent=1)
+        if profile.stopped_at is not None:
+            result.add(Status.WARN, f"n = {profile.stopped_at:>9,}: {profile.problem}", indent=1)
+        if profile.flagged:
+            result.add(Status.WARN, f"Grows faster than {_format_exponent(profile.expected)} per call: "
+                                    f"probably an accidental quadratic (or worse) loop", indent=1)
+    return result
@@ -0,0 +1,66 @@
+"""
+Grading identical submissions once.
+
+Resubmissions, group members and duplicate downloads often flatten to
+the same source tree (the manifest's tree hash, see grader/manifest.py).
+group_identical groups them so each tree is graded once; shared_record
+gives the other submissions of a group the same results, marked as
+shared with the one that was graded, and a short log of their own.
+"""
+
+import os
+from typing import List, Tuple
+
+from .logs import log_banner, write_log
+
+
+def group_identical(prepared: List[dict], done: dict) -> Tuple[list, list]:
+    """
+    Group extracted submissions by tree hash.
+
+    Args:
+        prepared: Extracted submissions, each a dict with 'entry' and
+            (unless extraction failed) 'tree_hash'
+        done: {submission: record} already graded; submissions being
+            grouped again are not matched against their own old records
+
+    Returns:
+        (shared, to_grade): shared is a list of (graded record, entry) for
+        submissions identical to one in `done`; to_grade is a list of
+        (prepared submission to grade, [entries that share its results])
+    """
+    entries = {item['entry'] for item in prepared}
+    graded_by_hash = {record['tree_hash']: record for entry, record in done.items()
+                      if record.get('tree_hash') and 'shared_with' not in record and entry not in entries}
+    groups = {}
+    for item in prepared:
+        key = item.get('tree_hash') or item['entry']
+        groups.setdefault(key, []).append(item)
+
+    shared, to_grade = [], []
+    for key, group in groups.items():
+        if key in graded_by_hash:
+            shared.extend((graded_by_hash[key], item['entry']) for item in group)
+        else:
+            to_grade.append((group[0], [item['entry'] for item in group[1:]]))
+    return shared, to_grade
+
+
+def shared_record(record: dict, entry: str, log_dir: str) -> dict:
+    """
+    Journal record for a submission identical to the one `record` graded.
+
+    The submission gets its own short log naming the original; the build
+    output and source dump are only in the original's log.
+    """
+    log_path = os.path.join(log_dir, f"{entry}.txt")
+    note = (f"Source tree identical to {record['entry']} (tree hash {record.get('tree_hash')}).\n"
+            f"It was graded once and the results are shared; the full log is "
+            f"{os.path.relpath(record['log'], log_dir)}.\n\n"
+            f"{record['summary']}\n")
+    shared = dict(record, entry=entry, log=log_path, shared_with=record['entry'],
+                  summary=f"{record['summary']} (shared with {record['entry']})")
+    shared['sections'] = write_log(log_path, [('PROCESSING', [log_banner(entry)]), ('SHARED', [note])])
+    if record['results'] is not None:
+        shared['results'] = dict(record['results'], shared_with=record['entry'])
+    return shared
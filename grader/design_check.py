@@ -1,63 +1,95 @@
 import os
 import re
-from .utils import log_diff
+import sys
+from .utils import dump_file, file_digest, install_file, log_diff
+from .index import SubmissionIndex, as_index
+from .matcher import get_matcher
+from .patterns import count_matches, search_lines
+from .results import CheckResult, FileDump, Status, status_from_flags
 from pathlib import Path
-import filecmp
-import shutil
-from typing import Dict, List, Tuple, Set
-
-def check_program_design(fname, required_program_files):
-    print("\n--- Program Design Check ---")
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple, Set
+
+def check_program_design(fname, required_program_files) -> CheckResult:
+    index = as_index(fname)
+    result = CheckResult('check_program_design')
+    result.add(Status.INFO, "--- Program Design Check ---")
+    found = {}
     for req_file in required_program_files:
-        path = os.path.join(fname, req_file)
-        print(f"{req_file}: {'SUCCESS' if os.path.exists(path) else 'FAILURE'}")
+        found[req_file] = index.exists(req_file)
+        result.add(Status.INFO, f"{req_file}: {'SUCCESS' if found[req_file] else 'FAILURE'}",
+                   file=req_file if found[req_file] else '')
+
+    result.add(Status.INFO, "")
+    result.add(Status.INFO, "--- Current directory listing ---")
+    for file in index.entries:
+        result.add(Status.INFO, file)
 
-    print("\n--- Current directory listing ---")
-    for file in os.listdir(fname):
-        print(file)
+    result.value = found
+    result.status = status_from_flags(found.values()) if found else Status.INFO
+    return result
 
 
 def print_library_files(fname):
+    index = as_index(fname)
     print("\n--- Student Library Files ---")
     for lib_file in ["myLibrary.hpp", "myLibrary.cpp"]:
-        path = os.path.join(fname, lib_file)
-        if os.path.exists(path):
+        if index.exists(lib_file):
             print(f"\n--- {lib_file} ---")
-            with open(path, "r", encoding="utf-8") as f:
-                print(f.read())
+            dump_file(sys.stdout, index.path(lib_file))
         else:
             print(f"{lib_file} not found!")
 
 
+_standard_digests: Dict[tuple, str] = {}
+
+
+def _standard_digest(path: str) -> str:
+    """Digest of an instructor file, computed once per run (until it changes)."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _standard_digests:
+        _standard_digests[key] = file_digest(path)
+    return _standard_digests[key]
+
+
+def _same_content(student_file: str, standard_file: str) -> bool:
+    """Compare a student file against an instructor file by size, then by hash."""
+    if os.path.getsize(student_file) != os.path.getsize(standard_file):
+        return False
+    return file_digest(student_file) == _standard_digest(standard_file)
+
+
 def move_test_files(fname, test_files_folder):
     required_files = ["mainProgram.cpp", "testing.cpp", "testing.hpp", "test_cases.txt"]
     for file_name in required_files:
         student_file = os.path.join(fname, file_name)
         standard_file = os.path.join(test_files_folder, file_name)
 
-        if not os.path.exists(student_file):
-            shutil.copy(standard_file, fname)
-        else:
-            if file_name != "test_cases.txt" and not filecmp.cmp(student_file, standard_file, shallow=False):
+        # Student copies are never hardlinks: a build or test writing to one
+        # in place would change the instructor's file for the whole cohort
+        if not os.path.exists(student_file) or os.path.samefile(student_file, standard_file):
+            install_file(standard_file, student_file, hardlink=False)
+        elif not _same_content(student_file, standard_file):
+            if file_name != "test_cases.txt":
                 log_diff(student_file, standard_file, file_name)
-                shutil.copy(standard_file, fname)
-            elif file_name == "test_cases.txt" and not filecmp.cmp(student_file, standard_file, shallow=False):
-                shutil.copy(standard_file, fname)
+            install_file(standard_file, student_file, hardlink=False)
 
 
-def check_class_files_exist(folder_path: str, class_names: List[str]) -> Dict[str, bool]:
+def check_class_files_exist(folder_path: str, class_names: List[str]) -> CheckResult:
     """
     Check if class files (.h and .cpp) exist for given class names.
     
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         class_names: List of class names to check for
         
     Returns:
-        Dict mapping class name to whether both .h and .cpp exist
+        CheckResult whose value maps class name to whether both .h and .cpp exist
     """
+    result = CheckResult('check_class_files_exist')
     results = {}
-    files = os.listdir(folder_path)
+    files = as_index(folder_path).entries
     
     for class_name in class_names:
         # Check various naming conventions
@@ -79,203 +111,230 @@ def check_class_files_exist(folder_path: str, class_names: List[str]) -> Dict[st
         results[class_name] = has_header and has_cpp
         
         if has_header and has_cpp:
-            print(f"✓ {class_name}: Found both .h and .cpp files")
+            result.add(Status.PASS, f"{class_name}: Found both .h and .cpp files")
         else:
-            print(f"✗ {class_name}: Missing files (header: {has_header}, cpp: {has_cpp})")
+            result.add(Status.FAIL, f"{class_name}: Missing files (header: {has_header}, cpp: {has_cpp})")
     
-    return results
+    result.value = results
+    result.status = status_from_flags(results.values())
+    return result
 
 
-def find_inheritance(folder_path: str) -> List[tuple]:
+def find_inheritance(folder_path: str) -> CheckResult:
     """
     Find inheritance relationships in header files.
+
+    Uses the file outlines, so any access specifier, multiple bases and
+    templated classes or bases are all reported.
     
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         
     Returns:
-        List of tuples: (derived_class, base_class, filename)
+        CheckResult whose value is a list of (derived_class, base_class, filename)
     """
-    header_files = [f for f in os.listdir(folder_path) if f.endswith('.h')]
+    result = CheckResult('find_inheritance')
+    index = as_index(folder_path)
+    header_files = [f for f in index.entries if f.endswith('.h')]
     
     inheritance_found = []
-    inheritance_pattern = re.compile(r'class\s+(\w+)\s*:\s*public\s+(\w+)')
     
     for file in header_files:
         try:
-            with open(os.path.join(folder_path, file), 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                matches = inheritance_pattern.findall(content)
-                for derived, base in matches:
-                    inheritance_found.append((derived, base, file))
-                    print(f"✓ Found inheritance: {derived} : public {base} in {file}")
+            for cls in index.outline(file).classes:
+                for base in cls.bases:
+                    inheritance_found.append((cls.name, base.name, file))
+                    result.add(Status.PASS, f"Found inheritance: {cls.name} : {base.access} {base.name} in {file}",
+                               file=file, line=cls.line)
         except Exception as e:
-            print(f"Warning: Could not read {file}: {e}")
+            result.add(Status.WARN, f"Could not read {file}: {e}", file=file)
     
     if not inheritance_found:
-        print("✗ No inheritance found")
+        result.add(Status.FAIL, "No inheritance found")
     
-    return inheritance_found
+    result.value = inheritance_found
+    result.status = Status.PASS if inheritance_found else Status.FAIL
+    return result
 
 
 def check_function_exists_in_file(folder_path: str, filename_pattern: str, 
-                                   function_names: List[str]) -> Dict[str, bool]:
+                                   function_names: List[str]) -> CheckResult:
     """
     Check if functions exist in files matching a pattern.
     
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         filename_pattern: Pattern to match filenames (e.g., 'linkedbag')
         function_names: List of function names to search for
         
     Returns:
-        Dict mapping function name to whether it was found
+        CheckResult whose value maps function name to whether it was found
     """
-    matching_files = []
-    
+    result = CheckResult('check_function_exists_in_file')
+    index = as_index(folder_path)
+
     # Find matching files (could be in subfolder)
-    for root, dirs, files in os.walk(folder_path):
-        for file in files:
-            if filename_pattern.lower() in file.lower() and file.endswith('.cpp'):
-                matching_files.append(os.path.join(root, file))
+    matching_files = [f for f in index.files(('.cpp',), recursive=True)
+                      if filename_pattern.lower() in os.path.basename(f).lower()]
     
     results = {func: False for func in function_names}
+    result.value = results
     
     if not matching_files:
-        print(f"✗ No files matching '{filename_pattern}' found")
-        return results
+        result.add(Status.FAIL, f"No files matching '{filename_pattern}' found")
+        result.status = Status.FAIL
+        return result
+    
+    # One pass per file finds every function name at once
+    matcher = get_matcher(tuple(re.escape(func) for func in function_names))
+    names = {re.escape(func): func for func in function_names}
     
     for file in matching_files:
-        print(f"Checking {file} for functions...")
+        result.add(Status.INFO, f"Checking {index.path(file)} for functions...")
         try:
-            with open(file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                for func in function_names:
-                    if func in content:
-                        results[func] = True
-                        print(f"✓ Found {func} in file")
+            reported = set()
+            for key, line in matcher.scan(index.code(file)):
+                func = names[key]
+                results[func] = True
+                if func not in reported:
+                    reported.add(func)
+                    result.add(Status.PASS, f"Found {func} in file (line {line})", file=file, line=line)
         except Exception as e:
-            print(f"Warning: Could not read {file}: {e}")
+            result.add(Status.WARN, f"Could not read {file}: {e}", file=file)
     
     for func, found in results.items():
         if not found:
-            print(f"✗ {func} not found")
+            result.add(Status.FAIL, f"{func} not found")
     
-    return results
+    result.status = status_from_flags(results.values())
+    return result
 
 
-def check_function_usage(folder_path: str, function_names: List[str]) -> Dict[str, bool]:
+def check_function_usage(folder_path: str, function_names: List[str]) -> CheckResult:
     """
     Check if functions are called/used in any .cpp files.
     
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         function_names: List of function names to search for usage
         
     Returns:
-        Dict mapping function name to whether usage was found
+        CheckResult whose value maps function name to whether usage was found
     """
-    cpp_files = [f for f in os.listdir(folder_path) if f.endswith('.cpp')]
+    result = CheckResult('check_function_usage')
+    index = as_index(folder_path)
+    cpp_files = [f for f in index.entries if f.endswith('.cpp')]
     
     usage_found = {func: False for func in function_names}
     
+    # Look for function calls (basic pattern), all functions in one pass
+    patterns = {rf'\b{re.escape(func)}\s*\(': func for func in function_names}
+    matcher = get_matcher(tuple(patterns))
+    
     for file in cpp_files:
         try:
-            with open(os.path.join(folder_path, file), 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                
-                for func in function_names:
-                    # Look for function calls (basic pattern)
-                    if re.search(rf'\b{func}\s*\(', content):
-                        usage_found[func] = True
-                        print(f"✓ Found usage of {func} in {file}")
+            first_lines = {}
+            for pattern, line in matcher.scan(index.code(file)):
+                first_lines.setdefault(patterns[pattern], line)
+            
+            for func, line in first_lines.items():
+                usage_found[func] = True
+                result.add(Status.PASS, f"Found usage of {func} in {file} (line {line})", file=file, line=line)
         except Exception as e:
-            print(f"Warning: Could not read {file}: {e}")
+            result.add(Status.WARN, f"Could not read {file}: {e}", file=file)
     
     for func, found in usage_found.items():
         if not found:
-            print(f"✗ No usage of {func} found")
+            result.add(Status.FAIL, f"No usage of {func} found")
     
-    return usage_found
+    result.value = usage_found
+    result.status = status_from_flags(usage_found.values())
+    return result
 
 
 def count_pattern_in_files(folder_path: str, filename_pattern: str, 
-                           search_pattern: str) -> int:
+                           search_pattern: str) -> CheckResult:
     """
     Count occurrences of a regex pattern in files matching filename pattern.
     
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         filename_pattern: Pattern to match filenames (e.g., 'organizer')
         search_pattern: Regex pattern to search for
         
     Returns:
-        Count of pattern occurrences
+        CheckResult whose value is the count of pattern occurrences
     """
-    matching_files = [f for f in os.listdir(folder_path) 
+    result = CheckResult('count_pattern_in_files', value=0)
+    index = as_index(folder_path)
+    matching_files = [f for f in index.entries 
                       if filename_pattern.lower() in f.lower() and 
                       (f.endswith('.h') or f.endswith('.cpp'))]
     
     if not matching_files:
-        print(f"✗ No files matching '{filename_pattern}' found")
-        return 0
+        result.add(Status.FAIL, f"No files matching '{filename_pattern}' found")
+        result.status = Status.FAIL
+        return result
     
     total_count = 0
     
     for file in matching_files:
         try:
-            with open(os.path.join(folder_path, file), 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                matches = re.findall(search_pattern, content)
-                count = len(matches)
-                total_count += count
-                
-                if count > 0:
-                    print(f"Found {count} occurrence(s) in {file}")
+            content = index.code(file)
+            count = count_matches(search_pattern, content)
+            total_count += count
+            
+            if count > 0:
+                result.add(Status.INFO, f"Found {count} occurrence(s) in {file}", file=file)
         except Exception as e:
-            print(f"Warning: Could not read {file}: {e}")
+            result.add(Status.WARN, f"Could not read {file}: {e}", file=file)
     
-    return total_count
+    result.value = total_count
+    result.status = Status.PASS if total_count else Status.FAIL
+    return result
 
 
 def check_keyword_in_files(folder_path: str, filename_pattern: str, 
-                           keywords: List[str]) -> Dict[str, bool]:
+                           keywords: List[str]) -> CheckResult:
     """
     Check if keywords/patterns exist in files matching filename pattern.
     
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         filename_pattern: Pattern to match filenames (e.g., 'main')
         keywords: List of regex patterns to search for
         
     Returns:
-        Dict mapping keyword to whether it was found
+        CheckResult whose value maps keyword to whether it was found
     """
-    matching_files = [f for f in os.listdir(folder_path) 
+    result = CheckResult('check_keyword_in_files')
+    index = as_index(folder_path)
+    matching_files = [f for f in index.entries 
                       if filename_pattern.lower() in f.lower() and f.endswith('.cpp')]
     
     if not matching_files:
         # Try all .cpp files if no match
-        matching_files = [f for f in os.listdir(folder_path) if f.endswith('.cpp')]
+        matching_files = [f for f in index.entries if f.endswith('.cpp')]
     
     results = {kw: False for kw in keywords}
+    matcher = get_matcher(tuple(keywords), ignore_case=True)
     
     for file in matching_files:
         try:
-            with open(os.path.join(folder_path, file), 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read().lower()
-                
-                for keyword in keywords:
-                    if re.search(keyword.lower(), content):
-                        results[keyword] = True
+            for keyword, line in matcher.scan(index.code(file)):
+                if not results[keyword]:
+                    results[keyword] = True
+                    result.add(Status.PASS, f"Found '{keyword}' in {file} (line {line})", file=file, line=line)
         except Exception as e:
-            print(f"Warning: Could not read {file}: {e}")
+            result.add(Status.WARN, f"Could not read {file}: {e}", file=file)
     
-    return results
+    result.value = results
+    result.status = status_from_flags(results.values())
+    return result
 
 
-def check_files_exist(folder_path: str, filenames: List[str]) -> Dict[str, bool]:
+
+def check_files_exist(folder_path: str, filenames: List[str]) -> CheckResult:
     """
     Check if specific files exist in folder.
     
@@ -284,9 +343,10 @@ def check_files_exist(folder_path: str, filenames: List[str]) -> Dict[str, bool]
         filenames: List of filenames to look for
         
     Returns:
-        Dict mapping filename to whether it exists
+        CheckResult whose value maps filename to whether it exists
     """
-    files = os.listdir(folder_path)
+    result = CheckResult('check_files_exist')
+    files = as_index(folder_path).entries
     results = {}
     
     for filename in filenames:
@@ -294,25 +354,26 @@ def check_files_exist(folder_path: str, filenames: List[str]) -> Dict[str, bool]
         results[filename] = exists
         
         if exists:
-            print(f"✓ Found {filename}")
+            result.add(Status.PASS, f"Found {filename}", file=filename)
         else:
-            print(f"✗ {filename} not found")
+            result.add(Status.FAIL, f"{filename} not found")
     
-    return results
+    result.value = results
+    result.status = status_from_flags(results.values())
+    return result
 
 
-def print_source_files(folder_path: str):
+def source_files_dump(folder_path: str) -> FileDump:
     """
-    Print contents of all .h and .cpp files in folder.
+    List all .h and .cpp files in folder for a full source dump.
     Skips CMake files, CLion files, and dotfiles.
 
     Args:
-        folder_path: Path to folder containing source files
-    """
-    print("\n" + "="*70)
-    print("SOURCE FILE CONTENTS")
-    print("="*70)
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
 
+    Returns:
+        FileDump of the source files (headers first, then cpp)
+    """
     # Patterns to skip
     skip_patterns = [
         'cmake',           # CMake files
@@ -336,36 +397,14 @@ def print_source_files(folder_path: str):
         return False
 
     # Get all .h and .cpp files, excluding skipped patterns
-    files = [f for f in os.listdir(folder_path)
+    index = as_index(folder_path)
+    files = [f for f in index.entries
              if (f.endswith('.h') or f.endswith('.cpp')) and not should_skip(f)]
 
-    # Sort: headers first, then cpp
-    headers = sorted([f for f in files if f.endswith('.h')])
-    cpp_files = sorted([f for f in files if f.endswith('.cpp')])
-    all_files = headers + cpp_files
-    
-    if not all_files:
-        print("No .h or .cpp files found")
-        return
-    
-    for file in all_files:
-        print(f"\n{'='*70}")
-        print(f"FILE: {file}")
-        print('='*70)
-        try:
-            with open(os.path.join(folder_path, file), 'r', 
-                     encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                print(content)
-        except Exception as e:
-            print(f"Error reading file: {e}")
-    
-    print(f"\n{'='*70}")
-    print(f"END OF SOURCE FILES")
-    print('='*70 + "\n")
+    return FileDump("SOURCE FILE CONTENTS", files, note="No .h or .cpp files found", style='source')
 
 
-def check_smart_pointers(folder_path: str, print_files: bool = True) -> Dict[str, any]:
+def check_smart_pointers(folder_path: str, print_files: bool = True) -> CheckResult:
     """
     Check for smart pointer usage in the codebase.
 
@@ -375,12 +414,13 @@ def check_smart_pointers(folder_path: str, print_files: bool = True) -> Dict[str
     - Polymorphism with smart pointers
 
     Args:
-        folder_path: Path to folder containing source files
-        print_files: Whether to print relevant file contents
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
+        print_files: Whether to include Organizer.cpp for review on failure
 
     Returns:
-        Dict with results of smart pointer checks
+        CheckResult whose value is a dict of the smart pointer findings
     """
+    result = CheckResult('check_smart_pointers')
     results = {
         'linkedbag_of_pointers': False,
         'smart_pointer_types': [],
@@ -388,403 +428,300 @@ def check_smart_pointers(folder_path: str, print_files: bool = True) -> Dict[str
         'polymorphism_detected': False
     }
 
-    # Track which files had matches and what lines matched
-    matched_lines = {}  # filename -> list of (check_type, line)
-
     # Get all source files
-    source_files = []
-    for root, dirs, files in os.walk(folder_path):
-        for f in files:
-            if f.endswith('.cpp') or f.endswith('.h'):
-                source_files.append(os.path.join(root, f))
+    index = as_index(folder_path)
+    source_files = index.files(('.cpp', '.h'), recursive=True)
 
-    print("Checking for smart pointer usage...")
+    result.add(Status.INFO, "Checking for smart pointer usage...")
 
-    # Store Organizer.cpp content in case we need to print it
-    organizer_content = None
+    # Organizer.cpp is shown for review if anything is missing
+    organizer_file = None
+
+    def first_line_with(content, needle):
+        for i, line in enumerate(content.split('\n'), start=1):
+            if needle in line:
+                return i, line
+        return 0, ''
 
     for file_path in source_files:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                filename = os.path.basename(file_path)
-
-                # Store Organizer.cpp content
-                if 'organizer' in filename.lower() and filename.endswith('.cpp'):
-                    organizer_content = content
-
-                # Check for LinkedBag of pointers
-                match = re.search(r'.*LinkedBag\s*<\s*(\w+::)?(shared_ptr|unique_ptr|[\w]+\s*\*).*', content)
-                if match:
-                    results['linkedbag_of_pointers'] = True
-                    print(f"✓ Found LinkedBag of pointers in {filename}")
-                    if filename not in matched_lines:
-                        matched_lines[filename] = []
-                    # Find the actual line
-                    for line in content.split('\n'):
-                        if re.search(r'LinkedBag\s*<\s*(\w+::)?(shared_ptr|unique_ptr|[\w]+\s*\*)', line):
-                            matched_lines[filename].append(('LinkedBag of pointers', line.strip()))
-                            break
-
-                # Check for smart pointer type usage
-                for ptr_type in ['shared_ptr', 'unique_ptr']:
-                    if ptr_type in content:
-                        if ptr_type not in results['smart_pointer_types']:
-                            results['smart_pointer_types'].append(ptr_type)
-                            print(f"✓ Found {ptr_type} usage in {filename}")
-                            if filename not in matched_lines:
-                                matched_lines[filename] = []
-                            # Find example line
-                            for line in content.split('\n'):
-                                if ptr_type in line:
-                                    matched_lines[filename].append((f'{ptr_type} usage', line.strip()))
-                                    break
-
-                # Check for smart pointer creation
-                for creation in ['make_shared', 'make_unique']:
-                    if creation in content:
-                        if creation not in results['smart_pointer_creation']:
-                            results['smart_pointer_creation'].append(creation)
-                            print(f"✓ Found {creation} usage in {filename}")
-                            if filename not in matched_lines:
-                                matched_lines[filename] = []
-                            # Find example line
-                            for line in content.split('\n'):
-                                if creation in line:
-                                    matched_lines[filename].append((f'{creation} usage', line.strip()))
-                                    break
-
-                # Check for polymorphism patterns (base pointer to derived)
-                if re.search(r'(std\s*::\s*)?(shared_ptr|unique_ptr)\s*<\s*(Event|EventTicket340)\s*>', content):
-                    if re.search(r'(VirtualEvent|VenueEvent)', content):
-                        results['polymorphism_detected'] = True
-                        print(f"✓ Polymorphism pattern detected in {filename}")
-                        if filename not in matched_lines:
-                            matched_lines[filename] = []
-                        matched_lines[filename].append(('Polymorphism', 'Base pointer with derived types'))
+            content = index.code(file_path)
+            filename = os.path.basename(file_path)
+
+            if 'organizer' in filename.lower() and filename.endswith('.cpp'):
+                organizer_file = file_path
+
+            # Check for LinkedBag of pointers
+            match = search_lines(r'LinkedBag\s*<\s*(\w+::)?(shared_ptr|unique_ptr|[\w]+\s*\*)', content)
+            if match:
+                results['linkedbag_of_pointers'] = True
+                result.add(Status.PASS, f"Found LinkedBag of pointers in {filename}",
+                           file=file_path, line=match[0], text=match[1].strip())
+
+            # Check for smart pointer type usage and creation
+            for kind, names in (('smart_pointer_types', ['shared_ptr', 'unique_ptr']),
+                                ('smart_pointer_creation', ['make_shared', 'make_unique'])):
+                for name in names:
+                    if name in content and name not in results[kind]:
+                        results[kind].append(name)
+                        line, text = first_line_with(content, name)
+                        result.add(Status.PASS, f"Found {name} usage in {filename}",
+                                   file=file_path, line=line, text=text.strip())
+
+            # Check for polymorphism patterns (base pointer to derived)
+            base_match = search_lines(r'(std\s*::\s*)?(shared_ptr|unique_ptr)\s*<\s*(Event|EventTicket340)\s*>', content)
+            if base_match and search_lines(r'(VirtualEvent|VenueEvent)', content):
+                results['polymorphism_detected'] = True
+                result.add(Status.PASS, f"Polymorphism pattern detected in {filename} "
+                           "(base pointer with derived types)",
+                           file=file_path, line=base_match[0], text=base_match[1].strip())
 
         except Exception as e:
-            print(f"Warning: Could not read {file_path}: {e}")
+            result.add(Status.WARN, f"Could not read {index.path(file_path)}: {e}", file=file_path)
 
     # Summary of failures
-    any_failure = False
     if not results['linkedbag_of_pointers']:
-        print("✗ LinkedBag of pointers not found")
-        any_failure = True
+        result.add(Status.FAIL, "LinkedBag of pointers not found")
     if not results['smart_pointer_types']:
-        print("✗ No smart pointer types found")
-        any_failure = True
+        result.add(Status.FAIL, "No smart pointer types found")
     if not results['smart_pointer_creation']:
-        print("✗ No smart pointer creation (make_shared/make_unique) found")
-        any_failure = True
+        result.add(Status.FAIL, "No smart pointer creation (make_shared/make_unique) found")
     if not results['polymorphism_detected']:
-        print("⚠ Polymorphism with smart pointers not clearly detected")
-        any_failure = True
-
-    # Print matched lines for successes
-    if print_files and matched_lines:
-        print(f"\n{'-'*50}")
-        print("MATCHED SMART POINTER LINES")
-        print(f"{'-'*50}")
-        for filename, lines in matched_lines.items():
-            print(f"\n{filename}:")
-            for check_type, line in lines:
-                print(f"  [{check_type}] {line}")
-
-    # If any check failed, print Organizer.cpp
-    if print_files and any_failure:
-        print(f"\n{'-'*50}")
-        print("Organizer.cpp (for manual review)")
-        print(f"{'-'*50}")
-        if organizer_content:
-            print(organizer_content)
-        else:
-            print("(Organizer.cpp not found)")
+        result.add(Status.WARN, "Polymorphism with smart pointers not clearly detected")
 
-    return results
+    flags = [bool(v) for v in results.values()]
+    result.value = results
+    result.status = status_from_flags(flags)
+
+    # If any check failed, show Organizer.cpp
+    if print_files and not all(flags):
+        result.dumps.append(FileDump("Organizer.cpp (for manual review)",
+                                     [organizer_file] if organizer_file else [],
+                                     note="(Organizer.cpp not found)"))
+
+    return result
 
 
 def check_friend_operator_overload(folder_path: str, class_name: str,
                                     operators: List[str],
-                                    print_files: bool = True) -> Dict[str, bool]:
+                                    print_files: bool = True) -> CheckResult:
     """
     Check if friend operator overloads are implemented for a class.
 
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         class_name: Name of the class to check
         operators: List of operators to check (e.g., ['<<', '>>'])
-        print_files: Whether to print matched lines or full files on failure
+        print_files: Whether to include the class files for review on failure
 
     Returns:
-        Dict mapping operator to whether it was found
+        CheckResult whose value maps operator to whether it was found
     """
+    result = CheckResult('check_friend_operator_overload')
     results = {op: False for op in operators}
-    matched_lines = {}  # op -> (filename, line)
-    file_contents = {}  # filename -> content
+    matched = {}  # op -> (filename, line number, line)
+    result.value = results
 
     # Find matching files (skip Mac metadata files)
+    index = as_index(folder_path)
     matching_files = []
-    for f in os.listdir(folder_path):
+    for f in index.entries:
         if f.startswith('._'):
             continue
         if class_name.lower() in f.lower() and (f.endswith('.cpp') or f.endswith('.h')):
             matching_files.append(f)
 
     if not matching_files:
-        print(f"✗ No files found for class {class_name}")
-        return results
+        result.add(Status.FAIL, f"No files found for class {class_name}")
+        result.status = Status.FAIL
+        return result
 
     for file in matching_files:
         try:
-            with open(os.path.join(folder_path, file), 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                file_contents[file] = content
-
-                for op in operators:
-                    if results[op]:  # Already found this operator
-                        continue
-
-                    # Check for friend declaration or implementation
-                    # Pattern: friend ... operator<< or operator<<
-                    escaped_op = re.escape(op)
-                    patterns = [
-                        rf'friend\s+.*operator\s*{escaped_op}',
-                        rf'operator\s*{escaped_op}\s*\([^)]*{class_name}',
-                        rf'ostream\s*&\s*operator\s*{escaped_op}',
-                        rf'istream\s*&\s*operator\s*{escaped_op}'
-                    ]
-
-                    for pattern in patterns:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results[op] = True
-                            # Find the matching line
-                            for line in content.split('\n'):
-                                if re.search(pattern, line, re.IGNORECASE):
-                                    matched_lines[op] = (file, line.strip())
-                                    break
-                            break
+            raw_lines = index.read(file).split('\n')
+
+            # A friend declaration, an overload taking the class, or a stream
+            # operator all count
+            for func in index.outline(file).all_functions():
+                op = func.operator
+                if op not in results or results[op]:
+                    continue
+                if (func.is_friend
+                        or class_name.lower() in func.params.lower()
+                        or re.search(r'[io]stream\s*&', func.returns)):
+                    results[op] = True
+                    matched[op] = (file, func.line, raw_lines[func.line - 1].strip())
 
         except Exception as e:
-            print(f"Warning: Could not read {file}: {e}")
+            result.add(Status.WARN, f"Could not read {file}: {e}", file=file)
 
-    # Print results
-    any_failure = False
     for op, found in results.items():
         if found:
-            print(f"✓ {class_name}: operator{op} found")
+            file, line, text = matched[op]
+            result.add(Status.PASS, f"{class_name}: operator{op} found in {file}",
+                       file=file, line=line, text=text)
         else:
-            print(f"✗ {class_name}: operator{op} not found")
-            any_failure = True
-
-    # Print matched lines for successes
-    if print_files and matched_lines:
-        print(f"\n  Matched lines:")
-        for op, (filename, line) in matched_lines.items():
-            print(f"    [operator{op}] {filename}: {line}")
-
-    # If any operator not found, print the class files
-    if print_files and any_failure and file_contents:
-        print(f"\n{'-'*50}")
-        print(f"{class_name} FILES (for manual review)")
-        print(f"{'-'*50}")
-        # Sort: headers first
-        filenames = list(file_contents.keys())
-        headers = sorted([f for f in filenames if f.endswith('.h')])
-        cpp_files = sorted([f for f in filenames if f.endswith('.cpp')])
-        for filename in headers + cpp_files:
-            print(f"\n--- {filename} ---")
-            print(file_contents[filename])
-            print(f"--- END {filename} ---")
-
-    return results
+            result.add(Status.FAIL, f"{class_name}: operator{op} not found")
+
+    result.status = status_from_flags(results.values())
+
+    # If any operator not found, show the class files
+    if print_files and not all(results.values()):
+        result.dumps.append(FileDump(f"{class_name} FILES (for manual review)", matching_files))
+
+    return result
 
 
 def check_big3_implementation(folder_path: str, class_name: str,
-                              print_files: bool = True) -> Dict[str, bool]:
+                              print_files: bool = True) -> CheckResult:
     """
     Check if the Big 3 (destructor, copy constructor, copy assignment) are implemented.
 
     Args:
-        folder_path: Path to folder containing source files
+        folder_path: Path to folder containing source files (or its SubmissionIndex)
         class_name: Name of the class to check
-        print_files: Whether to print the class file contents after checking
+        print_files: Whether to include the class files for review
 
     Returns:
-        Dict with 'destructor', 'copy_constructor', 'copy_assignment' keys
+        CheckResult whose value has 'destructor', 'copy_constructor', 'copy_assignment' keys
     """
+    result = CheckResult('check_big3_implementation')
     results = {
         'destructor': False,
         'copy_constructor': False,
         'copy_assignment': False
     }
+    result.value = results
 
     # Find matching files (skip Mac metadata files)
+    index = as_index(folder_path)
     matching_files = []
-    for root, dirs, files in os.walk(folder_path):
-        for f in files:
-            if f.startswith('._'):
-                continue
-            if class_name.lower() in f.lower() and (f.endswith('.cpp') or f.endswith('.h')):
-                matching_files.append(os.path.join(root, f))
+    for file_path in index.files(('.cpp', '.h'), recursive=True):
+        f = os.path.basename(file_path)
+        if f.startswith('._'):
+            continue
+        if class_name.lower() in f.lower():
+            matching_files.append(file_path)
 
     if not matching_files:
-        print(f"✗ No files found for class {class_name}")
-        return results
+        result.add(Status.FAIL, f"No files found for class {class_name}")
+        result.status = Status.FAIL
+        return result
 
-    file_contents = {}  # Store contents for printing later
+    locations = {}  # kind -> (file, line)
 
     for file_path in matching_files:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                filename = os.path.basename(file_path)
-                file_contents[filename] = content
-
-                # Check for destructor: ~ClassName
-                if re.search(rf'~\s*{class_name}\s*\(', content):
-                    results['destructor'] = True
-
-                # Check for copy constructor: ClassName(const ClassName&) or ClassName(ClassName&)
-                if re.search(rf'{class_name}\s*\(\s*(const\s+)?{class_name}\s*&', content):
-                    results['copy_constructor'] = True
-
-                # Check for copy assignment operator: operator=(const ClassName&) or operator=(ClassName&)
-                if re.search(rf'operator\s*=\s*\(\s*(const\s+)?{class_name}\s*&', content):
-                    results['copy_assignment'] = True
+            # Declared in the class body or defined out of line (X::~X() ...);
+            # deleted members do not count
+            specials = index.outline(file_path).special_members(class_name)
+            for kind in results:
+                if kind in specials:
+                    results[kind] = True
+                    locations.setdefault(kind, (file_path, specials[kind]))
 
         except Exception as e:
-            print(f"Warning: Could not read {file_path}: {e}")
-
-    # Print results
-    print(f"\n{class_name} Big 3 check:")
-    if results['destructor']:
-        print(f"  ✓ Destructor (~{class_name}) found")
-    else:
-        print(f"  ✗ Destructor (~{class_name}) not found")
-
-    if results['copy_constructor']:
-        print(f"  ✓ Copy constructor found")
-    else:
-        print(f"  ✗ Copy constructor not found")
-
-    if results['copy_assignment']:
-        print(f"  ✓ Copy assignment operator (operator=) found")
-    else:
-        print(f"  ✗ Copy assignment operator (operator=) not found")
-
-    # Print file contents if requested
-    if print_files and file_contents:
-        print_class_files(class_name, file_contents)
-
-    return results
-
+            result.add(Status.WARN, f"Could not read {index.path(file_path)}: {e}", file=file_path)
 
-def print_class_files(class_name: str, file_contents: Dict[str, str]):
-    """
-    Print the contents of class files.
+    labels = {
+        'destructor': f"Destructor (~{class_name})",
+        'copy_constructor': "Copy constructor",
+        'copy_assignment': "Copy assignment operator (operator=)",
+    }
+    result.add(Status.INFO, f"{class_name} Big 3 check:")
+    for kind, label in labels.items():
+        if results[kind]:
+            file, line = locations[kind]
+            result.add(Status.PASS, f"{label} found ({file}, line {line})", file=file, line=line, indent=1)
+        else:
+            result.add(Status.FAIL, f"{label} not found", indent=1)
 
-    Args:
-        class_name: Name of the class (for header)
-        file_contents: Dict mapping filename to content
-    """
-    print(f"\n{'-'*50}")
-    print(f"{class_name} FILE CONTENTS")
-    print(f"{'-'*50}")
+    result.status = status_from_flags(results.values())
 
-    # Sort: headers first, then cpp (skip Mac metadata files)
-    filenames = [f for f in file_contents.keys() if not f.startswith('._')]
-    headers = sorted([f for f in filenames if f.endswith('.h')])
-    cpp_files = sorted([f for f in filenames if f.endswith('.cpp')])
-    sorted_files = headers + cpp_files
+    if print_files:
+        result.dumps.append(FileDump(f"{class_name} FILE CONTENTS",
+                                     [f for f in matching_files if f.endswith(('.h', '.cpp'))]))
 
-    for filename in sorted_files:
-        print(f"\n--- {filename} ---")
-        print(file_contents[filename])
-        print(f"--- END {filename} ---")
+    return result
 
 
-def check_linkedbag_operator_overload(folder_path: str) -> bool:
+def check_linkedbag_operator_overload(folder_path: str) -> CheckResult:
     """
     Check if LinkedBag has operator= overloaded.
     Looks in LinkedBagDS folder or linkedbag files.
 
     Returns:
-        True if operator= is found in LinkedBag
+        CheckResult whose value is True if operator= is found in LinkedBag
     """
-    print("\nChecking LinkedBag operator= overload...")
+    result = CheckResult('check_linkedbag_operator_overload')
+    result.add(Status.INFO, "Checking LinkedBag operator= overload...")
 
     # Search in LinkedBagDS folder and root
-    search_paths = [folder_path]
-    linkedbag_dir = os.path.join(folder_path, 'LinkedBagDS')
-    if os.path.exists(linkedbag_dir) and os.path.isdir(linkedbag_dir):
-        search_paths.append(linkedbag_dir)
+    index = as_index(folder_path)
+    candidates = [p for p in index.files(('.h', '.cpp'), recursive=True)
+                  if os.path.dirname(p) in ('', 'LinkedBagDS')]
 
     found_header = False
     found_impl = False
 
-    for search_path in search_paths:
-        if not os.path.exists(search_path) or not os.path.isdir(search_path):
+    for file_path in candidates:
+        f = os.path.basename(file_path)
+        # Skip if not a linkedbag file
+        if 'linkedbag' not in f.lower():
             continue
+        # Skip Mac metadata files
+        if f.startswith('._'):
+            continue
+
+        try:
+            outline = index.outline(file_path)
+
+            # Check for operator= in header (.h file)
+            if f.endswith('.h'):
+                bag = outline.find_class('LinkedBag')
+                method = bag and next((m for m in bag.methods if m.operator == '='), None)
+                if method:
+                    found_header = True
+                    result.add(Status.PASS, f"operator= prototype found in {f}",
+                               file=file_path, line=method.line, indent=1)
+
+            # Check for operator= implementation (.cpp file)
+            if f.endswith('.cpp'):
+                impl = next((func for func in outline.operators('=')
+                             if func.is_definition and (func.owner == 'LinkedBag' or 'LinkedBag' in func.params)),
+                            None)
+                if impl:
+                    found_impl = True
+                    result.add(Status.PASS, f"operator= implementation found in {f}",
+                               file=file_path, line=impl.line, indent=1)
 
-        for f in os.listdir(search_path):
-            # Skip if not a linkedbag file
-            if 'linkedbag' not in f.lower():
-                continue
-
-            # Skip directories and non-source files
-            file_path = os.path.join(search_path, f)
-            if os.path.isdir(file_path):
-                continue
-            if not (f.endswith('.h') or f.endswith('.cpp')):
-                continue
-            # Skip Mac metadata files
-            if f.startswith('._'):
-                continue
-
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                    content = file.read()
-
-                    # Check for operator= in header (.h file)
-                    if f.endswith('.h'):
-                        if re.search(r'LinkedBag\s*<[^>]+>\s*&\s*operator\s*=', content):
-                            found_header = True
-                            print(f"  ✓ operator= prototype found in {f}")
-
-                    # Check for operator= implementation (.cpp file)
-                    if f.endswith('.cpp'):
-                        if re.search(r'LinkedBag\s*<[^>]+>\s*&\s*LinkedBag\s*<[^>]+>\s*::\s*operator\s*=', content):
-                            found_impl = True
-                            print(f"  ✓ operator= implementation found in {f}")
-                        elif re.search(r'operator\s*=\s*\(\s*(const\s+)?LinkedBag', content):
-                            found_impl = True
-                            print(f"  ✓ operator= implementation found in {f}")
-
-            except Exception as e:
-                print(f"Warning: Could not read {f}: {e}")
+        except Exception as e:
+            result.add(Status.WARN, f"Could not read {f}: {e}", file=file_path)
 
     if found_header and found_impl:
-        print("✓ LinkedBag operator= correctly overloaded (header + implementation)")
-        return True
+        result.add(Status.PASS, "LinkedBag operator= correctly overloaded (header + implementation)")
+        result.status = Status.PASS
     elif found_header:
-        print("⚠ LinkedBag operator= prototype found but implementation may be missing")
-        return True
+        result.add(Status.WARN, "LinkedBag operator= prototype found but implementation may be missing")
+        result.status = Status.PARTIAL
     elif found_impl:
-        print("⚠ LinkedBag operator= implementation found but prototype may be missing")
-        return True
+        result.add(Status.WARN, "LinkedBag operator= implementation found but prototype may be missing")
+        result.status = Status.PARTIAL
     else:
-        print("✗ LinkedBag operator= not found")
-        return False
+        result.add(Status.FAIL, "LinkedBag operator= not found")
+        result.status = Status.FAIL
+    result.value = found_header or found_impl
+    return result
 
 
-def check_test_case_files(folder_path: str) -> Dict[str, bool]:
+def check_test_case_files(folder_path: str) -> CheckResult:
     """
     Check for non-trivial test case files.
 
     Returns:
-        Dict with test file findings
+        CheckResult whose value is a dict of test file findings
     """
+    result = CheckResult('check_test_case_files')
     results = {
         'has_input_file': False,
         'has_output_file': False,
@@ -792,9 +729,9 @@ def check_test_case_files(folder_path: str) -> Dict[str, bool]:
         'output_files': []
     }
 
-    print("\nChecking for test case files...")
+    result.add(Status.INFO, "Checking for test case files...")
 
-    for f in os.listdir(folder_path):
+    for f in as_index(folder_path).entries:
         f_lower = f.lower()
 
         # Check for input files
@@ -802,18 +739,143 @@ def check_test_case_files(folder_path: str) -> Dict[str, bool]:
             if f.endswith('.txt'):
                 results['has_input_file'] = True
                 results['input_files'].append(f)
-                print(f"  ✓ Found input file: {f}")
+                result.add(Status.PASS, f"Found input file: {f}", file=f, indent=1)
 
         # Check for output files
         if 'output' in f_lower or f_lower.startswith('out') or 'expected' in f_lower:
             if f.endswith('.txt'):
                 results['has_output_file'] = True
                 results['output_files'].append(f)
-                print(f"  ✓ Found output file: {f}")
+                result.add(Status.PASS, f"Found output file: {f}", file=f, indent=1)
 
     if not results['has_input_file']:
-        print("  ✗ No input test file found")
+        result.add(Status.FAIL, "No input test file found", indent=1)
     if not results['has_output_file']:
-        print("  ✗ No output/expected file found")
+        result.add(Status.FAIL, "No output/expected file found", indent=1)
+
+    result.value = results
+    result.status = status_from_flags([results['has_input_file'], results['has_output_file']])
+    return result
+
+
+class CheckTable:
+    """
+    Columnar results of checks run over a cohort: one row per student,
+    one column per result field.
+
+    Attributes:
+        students: Student (submission folder) names, in row order
+        columns: Dict mapping column name -> list of values, one per student
+        results: Dict mapping student -> list of CheckResults (render them later)
+    """
+
+    def __init__(self, students: List[str]):
+        self.students = list(students)
+        self.columns: Dict[str, list] = {}
+        self.results: Dict[str, List[CheckResult]] = {s: [] for s in self.students}
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def add_column(self, name: str, values: list):
+        """Add (or replace) a column; values are in student order."""
+        if len(values) != len(self.students):
+            raise ValueError(f"Column '{name}' has {len(values)} values for {len(self.students)} students")
+        self.columns[name] = list(values)
+
+    def column(self, name: str) -> list:
+        """Values of one column, in student order."""
+        return self.columns[name]
+
+    def row(self, student: str) -> dict:
+        """All column values for one student."""
+        i = self.students.index(student)
+        return {name: values[i] for name, values in self.columns.items()}
+
+    def merge(self, other: 'CheckTable'):
+        """Add another table's columns (same students, same order)."""
+        if other.students != self.students:
+            raise ValueError("Tables cover different students")
+        for name, values in other.columns.items():
+            self.add_column(name, values)
+        for student, results in other.results.items():
+            self.results[student].extend(results)
+
+    def to_pandas(self):
+        """Return a pandas DataFrame indexed by student (requires pandas)."""
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required for CheckTable.to_pandas()")
+        return pd.DataFrame(self.columns, index=pd.Index(self.students, name='student'))
+
+    def to_csv(self, output_file: str):
+        """Write the table as CSV, one row per student."""
+        import csv
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['student'] + list(self.columns))
+            for i, student in enumerate(self.students):
+                writer.writerow([student] + [values[i] for values in self.columns.values()])
+
+
+def _run_check_safely(job: tuple) -> CheckResult:
+    """Run one check on one index, turning an exception into an ERROR result."""
+    check, index, kwargs = job
+    try:
+        return check(index, **kwargs)
+    except Exception as e:
+        return CheckResult(check.__name__, Status.ERROR, error=f"{check.__name__} failed: {e}")
+
+
+def run_check_batch(indexes: List[SubmissionIndex], check: Callable,
+                    workers: int = None, prefix: str = '', **kwargs) -> CheckTable:
+    """
+    Run one check over a whole cohort in a single parallel pass.
+
+    Dict results become one column per key; any other result becomes a
+    single 'result' column. Failed calls leave None in every column and
+    their message in the 'error' column. The CheckResults themselves are
+    kept in table.results for rendering.
+
+    Args:
+        indexes: One SubmissionIndex (or folder path) per student
+        check: A check function from this module (must be picklable)
+        workers: Number of worker processes (None = one per CPU, 1 = in-process)
+        prefix: Prefix for column names (e.g. the rubric item id)
+        **kwargs: Arguments passed to the check after the index
+
+    Returns:
+        CheckTable with one row per student
+    """
+    indexes = [as_index(index) for index in indexes]
+    table = CheckTable([os.path.basename(os.path.normpath(index.folder_path)) for index in indexes])
+    if not indexes:
+        return table
+
+    jobs = [(check, index, kwargs) for index in indexes]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        runs = [_run_check_safely(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_run_check_safely, jobs, chunksize=chunksize))
+
+    results = [run.value for run in runs]
+    keys = []
+    for result in results:
+        if isinstance(result, dict):
+            keys.extend(k for k in result if k not in keys)
+
+    if keys:
+        for key in keys:
+            table.add_column(f"{prefix}{key}",
+                             [r.get(key) if isinstance(r, dict) else None for r in results])
+    else:
+        table.add_column(f"{prefix}result", results)
+    table.add_column(f"{prefix}error", [run.error for run in runs])
+    for student, run in zip(table.students, runs):
+        table.results[student].append(run)
+    return table
 
-    return results
@@ -0,0 +1,192 @@
+"""
+Compiler and linker diagnostics as compact records.
+
+g++ is run with -fdiagnostics-format=json, which prints one JSON array
+per translation unit instead of source excerpts, carets and pages of
+template candidates. parse_compiler_output turns that into Diagnostic
+records (file, line, kind, message, number of attached notes), and
+parse_linker_output does the same for the linker's undefined and
+multiple definitions. Logs show the records capped per file, and
+cohort_error_summary counts how many students hit each error.
+"""
+
+import json
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Tuple
+
+MAX_PER_FILE = 10         # Diagnostics shown per file; the rest are counted
+MAX_MESSAGE = 300         # Characters kept of one message
+MAX_OTHER_LINES = 20      # Non-JSON output lines kept (e.g. from an older g++)
+GCC_JSON_FLAG = '-fdiagnostics-format=json'
+
+_LINKER = re.compile(r"(?:(?P<file>[^:\s]+?)(?::\([^)]*\))?:\s*)?"
+                     r"(?P<what>undefined reference to|multiple definition of) [`'‘](?P<symbol>.+?)['’]")
+
+
+@dataclass(slots=True)
+class Diagnostic:
+    """One compiler or linker message."""
+    kind: str           # 'error', 'fatal error', 'warning', ...
+    message: str
+    file: str = ''
+    line: int = 0
+    column: int = 0
+    notes: int = 0      # Notes g++ attached (candidates, previous declarations)
+    step: str = ''      # 'syntax', 'compile' or 'link'
+
+    def format(self) -> str:
+        where = self.file
+        if self.line:
+            where += f":{self.line}:{self.column}" if self.column else f":{self.line}"
+        text = f"{where}: {self.kind}: {self.message}" if where else f"{self.kind}: {self.message}"
+        if self.notes:
+            text += f" [+{self.notes} note{'s' if self.notes != 1 else ''}]"
+        return text
+
+
+def _shorten(message: str) -> str:
+    message = ' '.join(message.split())
+    if len(message) > MAX_MESSAGE:
+        return message[:MAX_MESSAGE - 3] + '...'
+    return message
+
+
+def _from_json(item: dict, step: str) -> Diagnostic:
+    caret = {}
+    if item.get('locations'):
+        caret = item['locations'][0].get('caret', {})
+    return Diagnostic(
+        kind=item.get('kind', 'error'),
+        message=_shorten(item.get('message', '')),
+        file=caret.get('file', ''),
+        line=caret.get('line', 0),
+        column=caret.get('column', 0),
+        notes=len(item.get('children', [])),
+        step=step,
+    )
+
+
+def parse_compiler_output(stderr: str, step: str = 'compile') -> Tuple[List[Diagnostic], List[str]]:
+    """
+    Parse g++ output produced with GCC_JSON_FLAG.
+
+    Args:
+        stderr: What g++ wrote to stderr
+        step: Recorded on every diagnostic
+
+    Returns:
+        (diagnostics, other lines): lines that are not JSON (such as
+        "compilation terminated.") are returned as text, at most
+        MAX_OTHER_LINES of them
+    """
+    diagnostics, other = [], []
+    for line in stderr.splitlines():
+        if line.startswith('['):
+            try:
+                items = json.loads(line)
+            except ValueError:
+                items = None
+            if isinstance(items, list):
+                diagnostics.extend(_from_json(item, step) for item in items if isinstance(item, dict))
+                continue
+        if line.strip() and line.strip() != 'compilation terminated.':
+            other.append(line)
+    return diagnostics, other[:MAX_OTHER_LINES]
+
+
+def parse_linker_output(stderr: str) -> Tuple[List[Diagnostic], List[str]]:
+    """
+    Pick undefined and multiple definitions out of linker output.
+
+    Returns:
+        (diagnostics, other lines), as parse_compiler_output; each
+        symbol is reported once per file
+    """
+    diagnostics, other, seen = [], [], set()
+    for line in stderr.splitlines():
+        match = _LINKER.search(line)
+        if match:
+            message = f"{match['what']} '{match['symbol']}'"
+            if (match['file'], message) not in seen:
+                seen.add((match['file'], message))
+                diagnostics.append(Diagnostic('error', _shorten(message), match['file'] or '',
+                                              step='link'))
+        elif line.strip() and 'in function' not in line and not line.startswith('collect2:'):
+            other.append(line)
+    return diagnostics, other[:MAX_OTHER_LINES]
+
+
+def render_diagnostics(diagnostics: List[Diagnostic], per_file: int = MAX_PER_FILE) -> List[str]:
+    """
+    Log lines for a list of diagnostics, at most `per_file` per file.
+
+    Returns:
+        One line per diagnostic shown, plus one line per file saying how
+        many more it had
+    """
+    lines, shown, omitted = [], Counter(), Counter()
+    for diagnostic in diagnostics:
+        if shown[diagnostic.file] < per_file:
+            shown[diagnostic.file] += 1
+            lines.append(diagnostic.format())
+        else:
+            omitted[diagnostic.file] += 1
+    for file, count in omitted.items():
+        lines.append(f"[... {count} more diagnostic{'s' if count != 1 else ''} in {file or 'output'} ...]")
+    return lines
+
+
+def cap_diagnostics(diagnostics: List[Diagnostic], per_file: int = MAX_PER_FILE) -> List[Diagnostic]:
+    """The first `per_file` diagnostics of each file."""
+    kept, count = [], Counter()
+    for diagnostic in diagnostics:
+        count[diagnostic.file] += 1
+        if count[diagnostic.file] <= per_file:
+            kept.append(diagnostic)
+    return kept
+
+
+def as_records(diagnostics: List[Diagnostic]) -> List[dict]:
+    """JSON-ready dicts of diagnostics."""
+    return [asdict(d) for d in diagnostics]
+
+
+def cohort_error_summary(diagnostics_by_student: Dict[str, Iterable[dict]],
+                         top: int = 20, kinds: Tuple[str, ...] = ('error', 'fatal error')) -> List[str]:
+    """
+    Most common errors across a cohort, with the students who hit them.
+
+    Errors are grouped by kind and message (file and line are ignored), so
+    an assignment's shared class and function names make the same mistake
+    show up as one entry.
+
+    Args:
+        diagnostics_by_student: Student -> diagnostic records (see as_records)
+        top: Number of errors listed
+        kinds: Diagnostic kinds counted
+
+    Returns:
+        Report lines (empty if nobody had an error)
+    """
+    students: Dict[Tuple[str, str], set] = {}
+    for student, records in diagnostics_by_student.items():
+        for record in records:
+            if record['kind'] in kinds:
+                students.setdefault((record['kind'], record['message']), set()).add(student)
+    if not students:
+        return []
+
+    failing = set().union(*students.values())
+    ranked = sorted(students.items(), key=lambda item: (-len(item[1]), item[0]))
+    lines = [f"{len(failing)} submission(s) with compiler or linker errors; "
+             f"{len(ranked)} distinct errors", ""]
+    for (kind, message), who in ranked[:top]:
+        names = sorted(who)
+        listed = ', '.join(names[:10]) + (f", ... ({len(names) - 10} more)" if len(names) > 10 else '')
+        lines.append(f"{len(names):4d}  {kind}: {message}")
+        lines.append(f"      {listed}")
+    if len(ranked) > top:
+        lines.append(f"[... {len(ranked) - top} less common errors not listed ...]")
+    return lines
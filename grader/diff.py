@@ -0,0 +1,241 @@
+"""
+Bounded line diffs for instructor files that students modified.
+
+difflib's SequenceMatcher can take minutes on a heavily rewritten or
+reformatted file. This module uses Myers' linear-space algorithm over
+interned lines (each distinct line becomes an int, so comparisons are
+cheap), with a cap on how hard it searches a region: past MAX_EDIT_SEARCH
+edit steps the region is reported as one replaced block instead of
+being minimised. Output is a standard unified diff, capped in lines.
+
+Files whose code is the same once comments and whitespace are ignored
+are detected up front and not diffed at all.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from .strip import strip_source
+
+MAX_DIFF_LINES = 200      # Longest diff returned by diff_files / printed by log_diff
+MAX_EDIT_SEARCH = 128     # Edit steps searched per region before giving up on minimising it
+
+_SPACE = re.compile(r'\s+')
+_SPACE_AROUND_PUNCT = re.compile(r' ?([^\w ]) ?')
+
+
+def read_lines(path: str) -> List[str]:
+    """Lines of a text file, with line endings kept."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read().splitlines(keepends=True)
+
+
+def normalized_code(text: str) -> str:
+    """C/C++ code with comments removed and whitespace only where it separates words."""
+    code = _SPACE.sub(' ', strip_source(text).code).strip()
+    return _SPACE_AROUND_PUNCT.sub(r'\1', code)
+
+
+def same_code(a_text: str, b_text: str) -> bool:
+    """True if two sources differ only in comments and whitespace."""
+    return a_text == b_text or normalized_code(a_text) == normalized_code(b_text)
+
+
+def _intern(a: List[str], b: List[str]) -> Tuple[List[int], List[int]]:
+    ids = {}
+    return ([ids.setdefault(line, len(ids)) for line in a],
+            [ids.setdefault(line, len(ids)) for line in b])
+
+
+def _middle_snake(a, alo, ahi, b, blo, bhi, limit):
+    """
+    Find the middle snake of the shortest edit path between two ranges.
+
+    Returns:
+        (x, y, u, v) offsets of the snake from (alo, blo), or None if the
+        path needs more than 2 * limit edits
+    """
+    n, m = ahi - alo, bhi - blo
+    delta = n - m
+    odd = delta & 1
+    dmax = min((n + m + 1) // 2, limit)
+    size = 2 * dmax + 3
+    vf = [0] * size  # Furthest x on each forward diagonal k (negative k wraps)
+    vb = [0] * size  # Furthest steps back from the end on each reverse diagonal
+
+    for d in range(dmax + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[k - 1] < vf[k + 1]):
+                x = vf[k + 1]
+            else:
+                x = vf[k - 1] + 1
+            y = x - k
+            sx, sy = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            vf[k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + vb[delta - k] >= n:
+                return sx, sy, x, y
+
+        for c in range(-d, d + 1, 2):
+            if c == -d or (c != d and vb[c - 1] < vb[c + 1]):
+                x = vb[c + 1]
+            else:
+                x = vb[c - 1] + 1
+            y = x - c
+            sx, sy = x, y
+            while x < n and y < m and a[ahi - 1 - x] == b[bhi - 1 - y]:
+                x += 1
+                y += 1
+            vb[c] = x
+            if not odd and -d <= delta - c <= d and vf[delta - c] + x >= n:
+                return n - x, m - y, n - sx, m - sy
+    return None
+
+
+def _diff(a, alo, ahi, b, blo, bhi, limit, ops):
+    """Append (tag, i1, i2, j1, j2) opcodes for a[alo:ahi] -> b[blo:bhi] to ops."""
+    start = alo
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        alo += 1
+        blo += 1
+    if alo > start:
+        ops.append(('equal', start, alo, blo - (alo - start), blo))
+
+    suffix = 0
+    while ahi - suffix > alo and bhi - suffix > blo and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+        suffix += 1
+    ahi_, bhi_ = ahi - suffix, bhi - suffix
+
+    if alo == ahi_ and blo < bhi_:
+        ops.append(('insert', alo, alo, blo, bhi_))
+    elif blo == bhi_ and alo < ahi_:
+        ops.append(('delete', alo, ahi_, blo, blo))
+    elif alo < ahi_:
+        snake = _middle_snake(a, alo, ahi_, b, blo, bhi_, limit)
+        if snake is None:
+            ops.append(('replace', alo, ahi_, blo, bhi_))
+        else:
+            x, y, u, v = snake
+            _diff(a, alo, alo + x, b, blo, blo + y, limit, ops)
+            if u > x:
+                ops.append(('equal', alo + x, alo + u, blo + y, blo + v))
+            _diff(a, alo + u, ahi_, b, blo + v, bhi_, limit, ops)
+
+    if suffix:
+        ops.append(('equal', ahi_, ahi, bhi_, bhi))
+
+
+def diff_opcodes(a: List[str], b: List[str], limit: int = MAX_EDIT_SEARCH) -> List[tuple]:
+    """
+    Opcodes turning line list `a` into `b`, like SequenceMatcher.get_opcodes.
+
+    Args:
+        a: Old lines
+        b: New lines
+        limit: Edit steps searched per region before reporting it as replaced
+
+    Returns:
+        List of (tag, i1, i2, j1, j2) with tag 'equal', 'insert', 'delete'
+        or 'replace'; neighbouring changes are merged into 'replace'
+    """
+    ia, ib = _intern(a, b)
+    raw = []
+    _diff(ia, 0, len(ia), ib, 0, len(ib), limit, raw)
+
+    ops = []
+    for tag, i1, i2, j1, j2 in raw:
+        if ops and (ops[-1][0] == 'equal') == (tag == 'equal'):
+            prev = ops[-1]
+            tag = tag if tag == prev[0] else 'replace'
+            ops[-1] = (tag, prev[1], i2, prev[3], j2)
+        else:
+            ops.append((tag, i1, i2, j1, j2))
+    return ops
+
+
+def _hunks(ops: List[tuple], context: int) -> List[List[tuple]]:
+    """Group opcodes into hunks with `context` equal lines around each change."""
+    hunks, group = [], []
+    for tag, i1, i2, j1, j2 in ops:
+        if tag == 'equal':
+            if not group:
+                group.append((tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2))
+                continue
+            if i2 - i1 > 2 * context:
+                group.append((tag, i1, i1 + context, j1, j1 + context))
+                hunks.append(group)
+                group = [(tag, i2 - context, i2, j2 - context, j2)]
+                continue
+        group.append((tag, i1, i2, j1, j2))
+    if group and any(op[0] != 'equal' for op in group):
+        if group[-1][0] == 'equal':
+            tag, i1, i2, j1, j2 = group[-1]
+            group[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+        hunks.append(group)
+    return hunks
+
+
+def _range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def _line(prefix: str, text: str) -> str:
+    return prefix + (text if text.endswith('\n') else text + '\n')
+
+
+def unified_diff(a: List[str], b: List[str], fromfile: str = '', tofile: str = '',
+                 context: int = 3, max_lines: Optional[int] = MAX_DIFF_LINES,
+                 limit: int = MAX_EDIT_SEARCH) -> List[str]:
+    """
+    Unified diff of two line lists, in difflib.unified_diff's format.
+
+    Args:
+        a: Old lines
+        b: New lines
+        fromfile: Name shown for `a`
+        tofile: Name shown for `b`
+        context: Unchanged lines shown around each change
+        max_lines: Output cap; a truncation note is added past it (None: no cap)
+        limit: See diff_opcodes
+
+    Returns:
+        Diff lines, each ending in a newline (empty if a == b)
+    """
+    out = []
+    for group in _hunks(diff_opcodes(a, b, limit), context):
+        if not out:
+            out += [f"--- {fromfile}\n", f"+++ {tofile}\n"]
+        out.append(f"@@ -{_range(group[0][1], group[-1][2])} "
+                   f"+{_range(group[0][3], group[-1][4])} @@\n")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                out += [_line(' ', line) for line in a[i1:i2]]
+                continue
+            out += [_line('-', line) for line in a[i1:i2]]
+            out += [_line('+', line) for line in b[j1:j2]]
+        if max_lines is not None and len(out) > max_lines:
+            break
+
+    if max_lines is not None and len(out) > max_lines:
+        out = out[:max_lines] + [f"[... diff truncated after {max_lines} lines ...]\n"]
+    return out
+
+
+def diff_files(standard_file: str, student_file: str, max_lines: Optional[int] = MAX_DIFF_LINES,
+               fromfile: str = 'standard', tofile: str = 'student') -> Optional[List[str]]:
+    """
+    Diff a student's copy of a file against the instructor's.
+
+    Returns:
+        Unified diff lines (capped at max_lines), or None if the files
+        differ only in comments and whitespace
+    """
+    a, b = read_lines(standard_file), read_lines(student_file)
+    if same_code(''.join(a), ''.join(b)):
+        return None
+    return unified_diff(a, b, fromfile, tofile, max_lines=max_lines)
@@ -1,9 +1,19 @@
 import os
 import shutil
 import zipfile
-import glob
 from pathlib import Path
 
+# Directories to completely ignore (build artifacts, IDE files, etc.)
+IGNORE_DIRS = {
+    '.vs', 'x64', 'debug', 'release', 'build', 'bin', 'obj',
+    '__macosx', '.git', '.vscode', '.idea', 'cmake-build-debug',
+    'cmake-build-release', '.gradle', 'out', 'target'
+}
+
+# File extensions we care about
+SOURCE_EXTENSIONS = {'.cpp', '.h', '.hpp', '.c', '.cc', '.cxx', '.txt', '.md'}
+
+
 def prepare_submissions_folder(root_folder, submissions_folder="submissions_unzip"):
     submissions_path = os.path.join(root_folder, submissions_folder)
     os.makedirs(submissions_path, exist_ok=True)
@@ -47,16 +57,6 @@ def flatten(folder_name: str, exclude_dirs: list[str] = None):
     # Normalize exclude_dirs to lowercase for case-insensitive matching
     exclude_dirs_lower = [d.lower() for d in exclude_dirs]
     
-    # Directories to completely ignore (build artifacts, IDE files, etc.)
-    ignore_dirs = {
-        '.vs', 'x64', 'debug', 'release', 'build', 'bin', 'obj',
-        '__macosx', '.git', '.vscode', '.idea', 'cmake-build-debug',
-        'cmake-build-release', '.gradle', 'out', 'target'
-    }
-    
-    # File extensions we care about
-    source_extensions = {'.cpp', '.h', '.hpp', '.c', '.cc', '.cxx', '.txt', '.md'}
-    
     level = 1
     while True:
         print(f"Flattening level {level}...")
@@ -70,7 +70,7 @@ def flatten(folder_name: str, exclude_dirs: list[str] = None):
                 continue
             
             # Skip if we're in an ignored directory
-            if current_dir in ignore_dirs:
+            if current_dir in IGNORE_DIRS:
                 continue
             
             # Skip the top-level folder itself
@@ -87,7 +87,7 @@ def flatten(folder_name: str, exclude_dirs: list[str] = None):
                 _, ext = os.path.splitext(file.lower())
                 
                 # Only move files with source extensions
-                if ext not in source_extensions:
+                if ext not in SOURCE_EXTENSIONS:
                     continue
                 
                 src = os.path.join(root, file)
@@ -119,7 +119,7 @@ def flatten(folder_name: str, exclude_dirs: list[str] = None):
         for root, dirs, files in os.walk(folder_name, topdown=False):
             for dir_name in dirs:
                 dir_lower = dir_name.lower()
-                if dir_lower in exclude_dirs_lower or dir_lower in ignore_dirs:
+                if dir_lower in exclude_dirs_lower or dir_lower in IGNORE_DIRS:
                     continue
                     
                 dir_path = os.path.join(root, dir_name)
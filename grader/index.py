@@ -0,0 +1,100 @@
+import os
+from typing import Dict, List, Optional, Union
+
+from .manifest import Manifest, load_manifest
+from .outline import FileOutline, outline_source
+from .strip import strip_source
+
+
+class SubmissionIndex:
+    """
+    Directory listing and file content cache for one submission.
+
+    Built once per submission and shared by every check, so the folder is
+    walked once and each file is read, comment-stripped and outlined at most once.
+    When the submission has a manifest (see grader.manifest), the listing
+    comes from it and the folder is not walked at all.
+
+    Attributes:
+        folder_path: Path to the submission folder
+        entries: Names of files and directories at the top level
+        top_files: Names of files (not directories) at the top level
+        walk_files: Paths (relative to folder_path) of every file, recursively
+        manifest: The submission's manifest, or None
+    """
+
+    def __init__(self, folder_path: str):
+        self.folder_path = folder_path
+        self.entries: List[str] = []
+        self.top_files: List[str] = []
+        self.walk_files: List[str] = []
+        self._text: Dict[str, str] = {}
+        self._code: Dict[str, str] = {}
+        self._outline: Dict[str, FileOutline] = {}
+        self.manifest: Optional[Manifest] = load_manifest(folder_path)
+
+        if self.manifest is not None:
+            self.walk_files = [f.path.replace('/', os.sep) for f in self.manifest.files]
+            self.top_files = [f.path for f in self.manifest.files if '/' not in f.path]
+            top_dirs = [d for d in self.manifest.dirs if '/' not in d]
+            self.entries = sorted(self.top_files + top_dirs)
+            return
+
+        for root, dirs, files in os.walk(folder_path):
+            rel_root = os.path.relpath(root, folder_path)
+            if rel_root == '.':
+                self.entries = sorted(dirs + files)
+                self.top_files = sorted(files)
+                rel_root = ''
+            for f in sorted(files):
+                self.walk_files.append(os.path.join(rel_root, f))
+
+    def path(self, rel_path: str) -> str:
+        """Absolute (folder-joined) path of a file in the submission."""
+        return os.path.join(self.folder_path, rel_path)
+
+    def exists(self, name: str) -> bool:
+        """Whether a top-level file or directory exists."""
+        return name in self.entries
+
+    def files(self, extensions: tuple = None, recursive: bool = False) -> List[str]:
+        """
+        List files, optionally filtered by extension.
+
+        Args:
+            extensions: Tuple of extensions (e.g. ('.h', '.cpp')), or None for all
+            recursive: Include files in subdirectories (relative paths)
+
+        Returns:
+            List of file names (top level) or relative paths (recursive)
+        """
+        names = self.walk_files if recursive else self.top_files
+        if extensions is None:
+            return list(names)
+        return [f for f in names if f.endswith(extensions)]
+
+    def read(self, rel_path: str) -> str:
+        """Return the text of a file, reading it on first use."""
+        if rel_path not in self._text:
+            with open(self.path(rel_path), 'r', encoding='utf-8', errors='ignore') as f:
+                self._text[rel_path] = f.read()
+        return self._text[rel_path]
+
+    def code(self, rel_path: str) -> str:
+        """Return a file's source with comments stripped (line numbers kept)."""
+        if rel_path not in self._code:
+            self._code[rel_path] = strip_source(self.read(rel_path)).code
+        return self._code[rel_path]
+
+    def outline(self, rel_path: str) -> FileOutline:
+        """Return a file's structural outline (cached by content across submissions)."""
+        if rel_path not in self._outline:
+            self._outline[rel_path] = outline_source(self.read(rel_path))
+        return self._outline[rel_path]
+
+
+def as_index(folder: Union[str, SubmissionIndex]) -> SubmissionIndex:
+    """Accept either a folder path or an existing index."""
+    if isinstance(folder, SubmissionIndex):
+        return folder
+    return SubmissionIndex(folder)
@@ -0,0 +1,79 @@
+"""
+Grading journal: one JSON line per finished submission.
+
+Each submission is appended (and flushed to disk) as soon as it is
+graded, after a 'run' record naming the rubric, so an interrupted run
+loses at most the submissions in flight. The reports are rebuilt from
+the journal, and a resumed run skips the submissions it has graded.
+"""
+
+import json
+import os
+
+
+class JournalError(Exception):
+    """A journal cannot be resumed (it belongs to another rubric)."""
+
+
+def append_journal(journal, record: dict):
+    """Append one record to an open journal and force it to disk."""
+    journal.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def open_journal(journal_path: str):
+    """Open a journal for appending, ending a line left partly written by a crash."""
+    journal = open(journal_path, 'a+', encoding='utf-8')
+    if journal.tell() > 0:
+        journal.seek(journal.tell() - 1)
+        if journal.read(1) != '\n':
+            journal.write('\n')
+    return journal
+
+
+def read_journal(journal_path: str) -> tuple:
+    """
+    Read a grading journal.
+
+    A partly written last line (from a crash mid-write) is ignored. When a
+    submission was journaled more than once, its latest record wins.
+
+    Returns:
+        (run header record, {submission: latest submission record})
+    """
+    run_info, records = {}, {}
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get('type') == 'run':
+                run_info = run_info or record
+            elif record.get('type') == 'submission':
+                records[record['entry']] = record
+    return run_info, records
+
+
+def start_journal(rubric: dict, rubric_path, journal_path: str, resume: bool) -> dict:
+    """
+    Start a new journal, or keep the existing one when resuming.
+
+    Returns:
+        {submission: record} of the submissions the kept journal has
+        graded (timeouts and errors are left out, so they are graded again)
+
+    Raises:
+        JournalError: If the kept journal is for a different rubric
+    """
+    if resume and os.path.exists(journal_path):
+        run_info, done = read_journal(journal_path)
+        if run_info.get('rubric') != rubric['name']:
+            raise JournalError(f"{journal_path} is a journal for '{run_info.get('rubric')}', "
+                               f"not '{rubric['name']}'; run without --resume to start over")
+        return {entry: record for entry, record in done.items() if record['status'] == 'graded'}
+    with open(journal_path, 'w', encoding='utf-8') as journal:
+        append_journal(journal, {'type': 'run', 'rubric': rubric['name'],
+                                 'rubric_path': str(rubric_path)})
+    return {}
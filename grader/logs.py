@@ -0,0 +1,77 @@
+"""
+Per-submission log files.
+
+A log is written section by section from text and FileRef parts (see
+grader/results.py). Dumped source files are copied in byte for byte
+(capped at DUMP_CAP_BYTES); a file dumped more than once in a log is
+written once and referenced afterwards. write_log returns the byte range
+of each section, which the log index stores for scripts/view_log.py.
+"""
+
+import os
+
+from .results import FileRef
+from .utils import DUMP_CAP_BYTES, copy_file_bytes, truncation_marker
+
+
+def log_banner(entry: str) -> str:
+    """First lines of a submission's log."""
+    return f"\n{'='*70}\nProcessing: {entry}\n{'='*70}\n\n"
+
+
+def _copy_into_log(f, path: str) -> int:
+    """Copy a file (capped) into an open log; returns the bytes written."""
+    try:
+        size = os.path.getsize(path)
+        written = copy_file_bytes(path, f, DUMP_CAP_BYTES)
+    except OSError as e:
+        data = f"Error reading file: {e}".encode('utf-8')
+        f.write(data)
+        return len(data)
+    if size > written:
+        marker = truncation_marker(written, size).encode('utf-8')
+        f.write(marker)
+        written += len(marker)
+    return written
+
+
+def write_log(log_path: str, sections: list, folder: str = '.') -> list:
+    """
+    Write a log file section by section.
+
+    Text parts are encoded; FileRef parts are copied from `folder` without
+    decoding. The first dump of a file holds its bytes and later dumps of
+    the same file in this log only write a reference to it.
+
+    Returns:
+        List of {'title', 'offset', 'length', 'refs'} dicts (byte ranges in
+        the file); each ref is {'path', 'at', 'marker', 'offset', 'length'}:
+        the reference text at byte `at` (`marker` bytes long) stands for
+        the copy at `offset`
+    """
+    index = []
+    copies = {}
+    offset = 0
+    with open(log_path, 'wb') as f:
+        for title, parts in sections:
+            start = offset
+            refs = []
+            for part in parts:
+                if isinstance(part, FileRef):
+                    if part.path in copies:
+                        copy_title, copy_offset, copy_length = copies[part.path]
+                        data = f"[{part.path}: shown above under {copy_title}]".encode('utf-8')
+                        refs.append({'path': part.path, 'at': offset, 'marker': len(data),
+                                     'offset': copy_offset, 'length': copy_length})
+                        f.write(data)
+                        offset += len(data)
+                    else:
+                        length = _copy_into_log(f, os.path.join(folder, part.path))
+                        copies[part.path] = (title, offset, length)
+                        offset += length
+                else:
+                    data = part.encode('utf-8')
+                    f.write(data)
+                    offset += len(data)
+            index.append({'title': title, 'offset': start, 'length': offset - start, 'refs': refs})
+    return index
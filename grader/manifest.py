@@ -0,0 +1,152 @@
+"""
+Per-submission file manifest, built once at extraction time.
+
+After a submission is extracted and flattened, build_manifest walks it
+once, hashes every file that matters and records it with its role:
+
+    source      student code (.cpp, .h, ...)
+    instructor  files or directories the instructor provided
+                (rubric setting `instructor_files`, e.g. LinkedBagDS)
+    data        other text files (.txt, .md), e.g. test cases
+    junk        build outputs, IDE folders, archive metadata, dotfiles
+
+The manifest is saved as MANIFEST_FILE inside the submission folder, so
+later stages (SubmissionIndex, the compile step, the similarity checker)
+read it instead of listing the folder again. It describes the tree as
+extracted; files created later (object files, executables) are not in it.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, List, Optional
+
+from .extract import IGNORE_DIRS, SOURCE_EXTENSIONS
+from .utils import file_digest
+
+MANIFEST_FILE = '.manifest.json'
+MANIFEST_VERSION = 1
+CODE_EXTENSIONS = {'.cpp', '.h', '.hpp', '.c', '.cc', '.cxx'}
+
+
+@dataclass(slots=True)
+class ManifestFile:
+    """One file of a submission."""
+    path: str       # Relative to the submission folder, '/'-separated
+    size: int
+    ext: str        # Lowercase extension, e.g. '.cpp'
+    sha256: str     # Empty for junk (not hashed)
+    role: str       # 'source', 'instructor', 'data' or 'junk'
+
+
+@dataclass(slots=True)
+class Manifest:
+    """
+    Files and directories of one extracted submission.
+
+    Attributes:
+        folder: Path to the submission folder
+        files: Every file, in walk order (top level first, sorted per directory)
+        dirs: Relative path of every directory, in walk order
+        tree_hash: Hash of the paths and contents of all non-junk files;
+            equal for submissions that grading cannot tell apart
+    """
+    folder: str
+    files: List[ManifestFile] = field(default_factory=list)
+    dirs: List[str] = field(default_factory=list)
+    tree_hash: str = ''
+
+    def select(self, extensions: Iterable[str] = None, roles: Iterable[str] = None,
+               top_level: bool = False) -> List[ManifestFile]:
+        """Files filtered by extension, role and/or depth."""
+        extensions = set(extensions) if extensions is not None else None
+        roles = set(roles) if roles is not None else None
+        return [f for f in self.files
+                if (extensions is None or f.ext in extensions)
+                and (roles is None or f.role in roles)
+                and (not top_level or '/' not in f.path)]
+
+    def save(self):
+        """Write the manifest into its submission folder."""
+        data = {'version': MANIFEST_VERSION, 'tree_hash': self.tree_hash, 'dirs': self.dirs,
+                'files': [asdict(f) for f in self.files]}
+        with open(os.path.join(self.folder, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+
+
+def file_role(rel_path: str, instructor_files: Iterable[str] = ()) -> str:
+    """
+    Classify a file by its path relative to the submission folder.
+
+    Args:
+        rel_path: '/'-separated relative path
+        instructor_files: Names (any case) of provided files or directories
+    """
+    parts = rel_path.split('/')
+    name = parts[-1]
+    ext = os.path.splitext(name.lower())[1]
+    if (any(p.lower() in IGNORE_DIRS or p.startswith('.') for p in parts[:-1])
+            or name.startswith('.') or ext not in SOURCE_EXTENSIONS):
+        return 'junk'
+    provided = {n.lower() for n in instructor_files}
+    if any(p.lower() in provided for p in parts):
+        return 'instructor'
+    return 'source' if ext in CODE_EXTENSIONS else 'data'
+
+
+def tree_hash(files: List[ManifestFile]) -> str:
+    """Hash of the sorted paths and contents of the non-junk files."""
+    digest = hashlib.sha256()
+    for f in sorted(files, key=lambda f: f.path):
+        if f.role != 'junk':
+            digest.update(f"{f.path}\0{f.sha256}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def build_manifest(folder: str, instructor_files: Iterable[str] = ()) -> Manifest:
+    """
+    Walk a submission once, hash its files and save the manifest.
+
+    Args:
+        folder: Extracted (and flattened) submission folder
+        instructor_files: Names of provided files or directories
+
+    Returns:
+        The saved Manifest
+    """
+    manifest = Manifest(folder)
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        rel_root = os.path.relpath(root, folder).replace(os.sep, '/')
+        prefix = '' if rel_root == '.' else rel_root + '/'
+        manifest.dirs.extend(prefix + d for d in dirs)
+        for name in sorted(files):
+            rel_path = prefix + name
+            if rel_path == MANIFEST_FILE:
+                continue
+            path = os.path.join(root, name)
+            role = file_role(rel_path, instructor_files)
+            manifest.files.append(ManifestFile(
+                path=rel_path,
+                size=os.path.getsize(path),
+                ext=os.path.splitext(name.lower())[1],
+                sha256='' if role == 'junk' else file_digest(path),
+                role=role,
+            ))
+
+    manifest.tree_hash = tree_hash(manifest.files)
+    manifest.save()
+    return manifest
+
+
+def load_manifest(folder: str) -> Optional[Manifest]:
+    """Load a submission's saved manifest, or None if it has none (or an old one)."""
+    try:
+        with open(os.path.join(folder, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != MANIFEST_VERSION:
+        return None
+    return Manifest(folder, [ManifestFile(**f) for f in data['files']], data['dirs'], data['tree_hash'])
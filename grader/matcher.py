@@ -0,0 +1,143 @@
+import re
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+from .patterns import bounded_text
+
+# Characters that make a keyword a regular expression rather than a literal
+_REGEX_CHARS = set('.^$*+?{}[]\\|()')
+
+
+def is_literal(keyword: str) -> bool:
+    """Whether a keyword contains no regex syntax."""
+    return not (_REGEX_CHARS & set(keyword))
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a set of literal strings.
+
+    Finds every occurrence of every word in a single left-to-right pass,
+    so scanning costs O(len(text) + hits) regardless of the word count.
+    """
+
+    def __init__(self, words: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+
+        for word in words:
+            state = 0
+            for ch in word:
+                if ch not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = len(self._goto) - 1
+                state = self._goto[state][ch]
+            if word not in self._out[state]:
+                self._out[state].append(word)
+
+        # Breadth-first: a state's failure link points at the longest proper
+        # suffix of its path that is also a path in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text: str):
+        """Yield (word, start offset) for every occurrence in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for word in out[state]:
+                yield word, i - len(word) + 1
+
+
+class KeywordMatcher:
+    """
+    Match many keywords against a text in one pass per kind.
+
+    Literal keywords go into an Aho-Corasick automaton; regex keywords are
+    combined into one alternation with a named group per keyword. Like
+    re.search without DOTALL, regex keywords match within a single line;
+    texts are bounded first (see patterns.bounded_text) so a long line
+    cannot make them backtrack for long.
+    """
+
+    def __init__(self, keywords: List[str], ignore_case: bool = False):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.ignore_case = ignore_case
+
+        literals = [k for k in self.keywords if is_literal(k)]
+        self._literal_keys = {(k.lower() if ignore_case else k): k for k in literals}
+        self._automaton = AhoCorasick(list(self._literal_keys)) if literals else None
+
+        flags = re.IGNORECASE if ignore_case else 0
+        self._regex_keywords = [k for k in self.keywords if not is_literal(k)]
+        self._group_names = {f'k{i}': k for i, k in enumerate(self._regex_keywords)}
+        self._combined = None
+        self._singles = {}
+        if self._regex_keywords:
+            self._combined = re.compile(
+                '|'.join(f'(?P<{name}>{k})' for name, k in self._group_names.items()),
+                flags)
+            self._singles = {k: re.compile(k, flags) for k in self._regex_keywords}
+
+    def scan(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Find every keyword hit in text.
+
+        Returns:
+            List of (keyword, line number) tuples sorted by position
+        """
+        text = bounded_text(text)
+        hits = []  # (offset, keyword)
+
+        if self._automaton:
+            haystack = text.lower() if self.ignore_case else text
+            for word, offset in self._automaton.finditer(haystack):
+                hits.append((offset, self._literal_keys[word]))
+
+        if self._combined:
+            pos = 0
+            while True:
+                match = self._combined.search(text, pos)
+                if not match:
+                    break
+                start = match.start()
+                # An earlier alternative can hide others starting at the same
+                # offset; re-test just those, only at offsets that already hit
+                for keyword in self._regex_keywords:
+                    if keyword == self._group_names[match.lastgroup] or \
+                            self._singles[keyword].match(text, start):
+                        hits.append((start, keyword))
+                pos = start + 1
+
+        if not hits:
+            return []
+        hits.sort()
+        newlines = [m.start() for m in re.finditer('\n', text)]
+        return [(keyword, bisect_right(newlines, offset) + 1) for offset, keyword in hits]
+
+    def found(self, text: str) -> Set[str]:
+        """Set of keywords that occur anywhere in text."""
+        return {keyword for keyword, _ in self.scan(text)}
+
+
+@lru_cache(maxsize=128)
+def get_matcher(keywords: Tuple[str, ...], ignore_case: bool = False) -> KeywordMatcher:
+    """Return a (cached) matcher for a tuple of keywords."""
+    return KeywordMatcher(list(keywords), ignore_case)
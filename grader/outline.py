@@ -0,0 +1,552 @@
+"""
+Lightweight C++ outline extractor.
+
+Builds a structural outline of one source file in a single tokenizer
+pass over its comment-stripped code: classes (with bases, access and
+template flag), member declarations, friend declarations, operator
+overloads, special members and function definitions, each with its line
+number. This is not a C++ parser; it understands just enough declaration
+syntax for the grading checks, and never raises on malformed input.
+
+Outlines are cached by content hash, so identical files (instructor
+LinkedBag code, resubmissions) are only parsed once per run.
+"""
+
+import re
+import hashlib
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .strip import strip_source
+
+_TOKEN_PATTERN = re.compile(
+    r'''
+      (?P<ws>\s+)
+    | (?P<pp>(?<![^\n])[ \t]*\#(?:[^\n\\]|\\.)*)        # preprocessor line
+    | (?P<raw>\b(?:u8|u|U|L)?R"(?P<delim>[^()\\\s"]{0,16})\(.*?\)(?P=delim)")
+    | (?P<str>(?:\b(?:u8|u|U|L))?"(?:[^"\\\n]|\\.)*"?)
+    | (?P<chr>'(?:[^'\\\n]|\\.)*'?)
+    | (?P<id>[A-Za-z_]\w*)
+    | (?P<num>\.?\d(?:[\w.]|'\w)*)
+    | (?P<op>::|->\*?|\.\.\.|<=>|<<=|>>=|<<|>>|<=|>=|==|!=|&&|\|\||\+\+|--
+             |[-+*/%^&|~!=<>]=?|[(){}\[\];,.?:])
+    ''',
+    re.DOTALL | re.VERBOSE,
+)
+
+_SKIPPED_TOKENS = {'ws', 'pp'}
+_CLASS_KEYS = {'class', 'struct', 'union'}
+_ACCESS = {'public', 'protected', 'private'}
+_DECL_SPECIFIERS = {'virtual', 'static', 'inline', 'explicit', 'constexpr',
+                    'consteval', 'friend', 'extern', 'mutable'}
+
+# Tokens that may follow `operator` to name an operator function
+_OPERATOR_TOKENS = {'+', '-', '*', '/', '%', '^', '&', '|', '~', '!', '=', '<', '>',
+                    '+=', '-=', '*=', '/=', '%=', '^=', '&=', '|=', '<<', '>>',
+                    '<<=', '>>=', '==', '!=', '<=', '>=', '<=>', '&&', '||', '++',
+                    '--', ',', '->*', '->', 'new', 'delete'}
+
+
+@dataclass
+class Token:
+    text: str
+    kind: str
+    start: int
+    end: int
+    line: int
+
+
+@dataclass
+class BaseClass:
+    name: str
+    access: str
+    virtual: bool = False
+
+
+@dataclass
+class Function:
+    """A function declaration or definition (member, friend or free)."""
+    name: str
+    line: int
+    owner: str = ''          # Enclosing or qualifying class, '' for free functions
+    params: str = ''
+    returns: str = ''
+    operator: str = ''       # Operator symbol for operator overloads (e.g. '<<')
+    special: str = ''        # destructor, copy_constructor, copy_assignment, ...
+    is_definition: bool = False
+    is_friend: bool = False
+    deleted: bool = False
+    access: str = ''
+
+
+@dataclass
+class Field:
+    name: str
+    line: int
+    declaration: str
+    access: str = ''
+
+
+@dataclass
+class ClassInfo:
+    name: str
+    kind: str
+    line: int
+    template: bool = False
+    bases: List[BaseClass] = field(default_factory=list)
+    methods: List[Function] = field(default_factory=list)
+    fields: List[Field] = field(default_factory=list)
+    friends: List[Function] = field(default_factory=list)
+    friend_classes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FileOutline:
+    """Everything the outline extractor found in one file."""
+    classes: List[ClassInfo] = field(default_factory=list)
+    functions: List[Function] = field(default_factory=list)  # Namespace-scope
+
+    def find_class(self, name: str) -> Optional[ClassInfo]:
+        """First class with the given name, if any."""
+        return next((c for c in self.classes if c.name == name), None)
+
+    def all_functions(self) -> List[Function]:
+        """Namespace-scope functions plus every class's methods and friends."""
+        result = list(self.functions)
+        for cls in self.classes:
+            result.extend(cls.methods)
+            result.extend(cls.friends)
+        return result
+
+    def special_members(self, class_name: str) -> Dict[str, int]:
+        """
+        Special members of a class declared or defined in this file.
+
+        Returns:
+            Dict mapping kind (destructor, copy_constructor, ...) to the
+            line of its first declaration or definition
+        """
+        found = {}
+        for func in self.all_functions():
+            if func.owner == class_name and func.special and not func.deleted:
+                found.setdefault(func.special, func.line)
+        return found
+
+    def operators(self, symbol: str) -> List[Function]:
+        """Every operator overload for the given symbol."""
+        return [f for f in self.all_functions() if f.operator == symbol]
+
+
+def tokenize(code: str) -> List[Token]:
+    """Split comment-free code into tokens, dropping whitespace and preprocessor lines."""
+    newlines = [m.start() for m in re.finditer('\n', code)]
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(code):
+        kind = match.lastgroup
+        if kind == 'delim':
+            kind = 'raw'
+        if kind in _SKIPPED_TOKENS:
+            continue
+        tokens.append(Token(match.group(), kind, match.start(), match.end(),
+                            bisect_right(newlines, match.start()) + 1))
+    return tokens
+
+
+def _match_brackets(tokens: List[Token]) -> Dict[int, int]:
+    """Map each '{' and '(' token index to the index of its closing token."""
+    pairs = {}
+    stacks = {'{': [], '(': []}
+    closers = {'}': '{', ')': '('}
+    for i, tok in enumerate(tokens):
+        if tok.text in stacks:
+            stacks[tok.text].append(i)
+        elif tok.text in closers and stacks[closers[tok.text]]:
+            pairs[stacks[closers[tok.text]].pop()] = i
+    return pairs
+
+
+def _skip_angles(stmt: List[Token], i: int) -> int:
+    """Given stmt[i] == '<', return the index just past the matching '>'."""
+    depth = 0
+    while i < len(stmt):
+        text = stmt[i].text
+        if text == '<':
+            depth += 1
+        elif text == '>':
+            depth -= 1
+        elif text == '>>':
+            depth -= 2
+        i += 1
+        if depth <= 0:
+            break
+    return i
+
+
+def _strip_template_prefix(stmt: List[Token]) -> tuple:
+    """Remove leading `template <...>` clauses. Returns (tokens, was_template)."""
+    is_template = False
+    while len(stmt) >= 2 and stmt[0].text == 'template' and stmt[1].text == '<':
+        stmt = stmt[_skip_angles(stmt, 1):]
+        is_template = True
+    return stmt, is_template
+
+
+def _split_top_level(stmt: List[Token], separator: str) -> List[List[Token]]:
+    """Split tokens on a separator that is outside (), <> and []."""
+    parts, current, depth = [], [], 0
+    for tok in stmt:
+        if tok.text in ('(', '<', '['):
+            depth += 1
+        elif tok.text in (')', '>', ']'):
+            depth -= 1
+        elif tok.text == '>>':
+            depth -= 2
+        if tok.text == separator and depth == 0:
+            parts.append(current)
+            current = []
+        else:
+            current.append(tok)
+    parts.append(current)
+    return parts
+
+
+def _text(code: str, tokens: List[Token]) -> str:
+    """Original source text spanned by a token list."""
+    if not tokens:
+        return ''
+    return ' '.join(code[tokens[0].start:tokens[-1].end].split())
+
+
+def _find_declarator(stmt: List[Token]) -> Optional[tuple]:
+    """
+    Locate a function declarator in a statement.
+
+    Returns:
+        (name start index, name end index, '(' index) or None if the
+        statement does not look like a function declaration
+    """
+    for i, tok in enumerate(stmt):
+        if tok.text == 'operator':
+            j = i + 1
+            if j + 1 < len(stmt) and stmt[j].text == '(' and stmt[j + 1].text == ')':
+                j += 2                      # operator()
+            elif j + 1 < len(stmt) and stmt[j].text == '[' and stmt[j + 1].text == ']':
+                j += 2                      # operator[]
+            else:
+                while j < len(stmt) and stmt[j].text != '(':
+                    j += 1
+            if j < len(stmt) and stmt[j].text == '(':
+                return i, j, j
+            return None
+        if tok.text == '(':
+            if i == 0 or stmt[i - 1].kind != 'id':
+                return None
+            start = i - 1
+            if start > 0 and stmt[start - 1].text == '~':
+                start -= 1
+            return start, i, i
+        if tok.text in ('=', '{'):
+            return None
+    return None
+
+
+def _qualifier(stmt: List[Token], name_start: int) -> str:
+    """Class qualifying a declarator, e.g. 'LinkedBag' for LinkedBag<T>::operator=."""
+    i = name_start - 1
+    if i < 0 or stmt[i].text != '::':
+        return ''
+    i -= 1
+    if i >= 0 and stmt[i].text in ('>', '>>'):
+        depth = 0
+        while i >= 0:
+            if stmt[i].text == '>':
+                depth += 1
+            elif stmt[i].text == '>>':
+                depth += 2
+            elif stmt[i].text == '<':
+                depth -= 1
+            i -= 1
+            if depth <= 0:
+                break
+    return stmt[i].text if i >= 0 and stmt[i].kind == 'id' else ''
+
+
+def _returns_start(stmt: List[Token], name_start: int) -> int:
+    """Index where the return type begins (after specifiers and any qualifier)."""
+    i = 0
+    while i < name_start and stmt[i].text in _DECL_SPECIFIERS:
+        i += 1
+    return i
+
+
+_COPY_PARAM = r'^\s*(?:const\s+)?{name}\s*(?:<[^()]*>)?\s*(?:const\s*)?&(?!&)'
+_MOVE_PARAM = r'^\s*{name}\s*(?:<[^()]*>)?\s*&&'
+
+
+def _classify_special(func: Function) -> str:
+    """Classify a function as a special member of its owner class, if it is one."""
+    owner = func.owner
+    if not owner:
+        return ''
+    name = re.escape(owner)
+    params = func.params
+    if func.name == f'~{owner}':
+        return 'destructor'
+    if func.name == owner:
+        if re.match(_COPY_PARAM.format(name=name), params):
+            return 'copy_constructor'
+        if re.match(_MOVE_PARAM.format(name=name), params):
+            return 'move_constructor'
+        if params.strip() in ('', 'void'):
+            return 'default_constructor'
+        return 'constructor'
+    if func.operator == '=':
+        if re.match(_COPY_PARAM.format(name=name), params):
+            return 'copy_assignment'
+        if re.match(_MOVE_PARAM.format(name=name), params):
+            return 'move_assignment'
+    return ''
+
+
+def _make_function(code: str, stmt: List[Token], pairs_in_stmt: Dict[int, int],
+                   owner: str, is_definition: bool) -> Optional[Function]:
+    """Build a Function from a declaration statement, or None if it isn't one."""
+    found = _find_declarator(stmt)
+    if not found:
+        return None
+    name_start, name_end, paren = found
+    close = pairs_in_stmt.get(paren)
+    if close is None:
+        return None
+
+    name_tokens = stmt[name_start:name_end]
+    operator = ''
+    if name_tokens[0].text == 'operator':
+        operator = ''.join(t.text for t in name_tokens[1:])
+        name = 'operator' + operator
+    else:
+        name = ''.join(t.text for t in name_tokens)
+
+    qualifier = _qualifier(stmt, name_start)
+    is_friend = any(t.text == 'friend' for t in stmt[:name_start])
+    type_start = _returns_start(stmt, name_start)
+    type_end = name_start
+    if qualifier:
+        # Drop `Qualifier<...>::` from the return type text
+        while type_end > type_start and stmt[type_end - 1].text != '::':
+            type_end -= 1
+        type_end -= 1
+        while type_end > type_start and stmt[type_end - 1].text != qualifier:
+            type_end -= 1
+        type_end = max(type_start, type_end - 1)
+    tail = stmt[close + 1:]
+
+    func = Function(
+        name=name,
+        line=name_tokens[0].line,
+        owner=qualifier or ('' if is_friend else owner),
+        params=_text(code, stmt[paren + 1:close]),
+        returns=_text(code, stmt[type_start:type_end]),
+        operator=operator,
+        is_definition=is_definition,
+        is_friend=is_friend,
+        deleted=any(t.text == 'delete' for t in tail),
+    )
+    func.special = _classify_special(func)
+    return func
+
+
+def _parse_class_head(stmt: List[Token]) -> Optional[ClassInfo]:
+    """Parse `class Name [final] [: bases]` into a ClassInfo (None if anonymous)."""
+    stmt, is_template = _strip_template_prefix(stmt)
+    if stmt and stmt[0].text == 'typedef':
+        stmt = stmt[1:]
+    if not stmt or stmt[0].text not in _CLASS_KEYS:
+        return None
+    kind = stmt[0].text
+
+    i = 1
+    name = None
+    while i < len(stmt) and stmt[i].text != ':':
+        tok = stmt[i]
+        if tok.text == '[':                       # [[attributes]]
+            while i < len(stmt) and stmt[i].text != ']':
+                i += 1
+        elif tok.kind == 'id' and tok.text not in ('final', 'alignas') and name is None:
+            name = tok
+        elif tok.text == '<' and name is not None:  # explicit specialization
+            i = _skip_angles(stmt, i) - 1
+        i += 1
+    if name is None:
+        return None
+
+    cls = ClassInfo(name=name.text, kind=kind, line=name.line, template=is_template)
+    default_access = 'private' if kind == 'class' else 'public'
+    for part in _split_top_level(stmt[i + 1:], ','):
+        words = [t for t in part if t.kind == 'id']
+        access = next((w.text for w in words if w.text in _ACCESS), default_access)
+        virtual = any(w.text == 'virtual' for w in words)
+        base_tokens = [t for t in part if t.text not in _ACCESS and t.text != 'virtual']
+        # Base name: last identifier before any template arguments
+        cut = next((k for k, t in enumerate(base_tokens) if t.text == '<'), len(base_tokens))
+        ids = [t.text for t in base_tokens[:cut] if t.kind == 'id']
+        if ids:
+            cls.bases.append(BaseClass(name=ids[-1], access=access, virtual=virtual))
+    return cls
+
+
+def _brace_opens_body(stmt: List[Token]) -> bool:
+    """
+    Whether a '{' ending this statement opens a function body.
+
+    Brace initializers (`int x{1};`, `v = {1, 2}`, `: member{x}` inside a
+    constructor's initializer list) return False.
+    """
+    found = _find_declarator(stmt)
+    if not found:
+        return False
+    # Constructor initializer list: `) : a(1), b` -- a '{' right after an
+    # identifier or template argument list initializes a member
+    depth = 0
+    in_init_list = False
+    for tok in stmt[found[2]:]:
+        if tok.text == '(':
+            depth += 1
+        elif tok.text == ')':
+            depth -= 1
+        elif tok.text == ':' and depth == 0:
+            in_init_list = True
+    if in_init_list and stmt[-1].text != ')' and (stmt[-1].kind == 'id' or stmt[-1].text in ('>', '>>')):
+        return False
+    return True
+
+
+def parse_outline(content: str) -> FileOutline:
+    """
+    Extract the outline of one C++ source file.
+
+    Args:
+        content: Source text (comments are stripped here)
+
+    Returns:
+        FileOutline with classes and namespace-scope functions
+    """
+    code = strip_source(content).code
+    tokens = tokenize(code)
+    pairs = _match_brackets(tokens)
+    outline = FileOutline()
+
+    # Scope stack entries: (kind, ClassInfo or None, current access)
+    scopes = [('namespace', None, '')]
+    stmt: List[Token] = []
+    stmt_index: List[int] = []   # Token index of each stmt entry (for bracket pairs)
+    i = 0
+
+    def local_pairs() -> Dict[int, int]:
+        positions = {idx: k for k, idx in enumerate(stmt_index)}
+        return {positions[a]: positions[b] for a, b in pairs.items()
+                if a in positions and b in positions}
+
+    def finish_statement(is_definition: bool):
+        kind, cls, access = scopes[-1]
+        body, _ = _strip_template_prefix(stmt)
+        if not body or body[0].text in ('using', 'typedef', 'static_assert', 'namespace'):
+            return
+        if kind == 'class':
+            if body[0].text == 'friend' and len(body) > 1 and body[1].text in _CLASS_KEYS:
+                cls.friend_classes.append(body[-1].text)
+                return
+            offset = len(stmt) - len(body)
+            body_pairs = {a - offset: b - offset for a, b in local_pairs().items() if a >= offset}
+            func = _make_function(code, body, body_pairs, cls.name, is_definition)
+            if func:
+                func.access = access
+                (cls.friends if func.is_friend else cls.methods).append(func)
+            elif not is_definition and body[0].text not in _CLASS_KEYS | {'enum'}:
+                cut = next((k for k, t in enumerate(body) if t.text in ('=', '[', '{')), len(body))
+                ids = [t for t in body[:cut] if t.kind == 'id']
+                if ids:
+                    cls.fields.append(Field(ids[-1].text, ids[-1].line,
+                                            _text(code, body[:cut]), access))
+        elif kind == 'namespace':
+            if body[0].text in _CLASS_KEYS | {'enum'}:
+                return
+            offset = len(stmt) - len(body)
+            body_pairs = {a - offset: b - offset for a, b in local_pairs().items() if a >= offset}
+            func = _make_function(code, body, body_pairs, '', is_definition)
+            if func:
+                outline.functions.append(func)
+
+    while i < len(tokens):
+        tok = tokens[i]
+        kind, cls, access = scopes[-1]
+
+        if tok.text == ';':
+            finish_statement(False)
+            stmt, stmt_index = [], []
+        elif tok.text == '{':
+            head, _ = _strip_template_prefix(stmt)
+            first = head[0].text if head else ''
+            if kind == 'function':
+                i = pairs.get(i, len(tokens) - 1)
+            elif first == 'namespace' or (first == 'extern' and len(head) > 1 and head[1].kind == 'str'):
+                scopes.append(('namespace', None, ''))
+                stmt, stmt_index = [], []
+            elif first in _CLASS_KEYS or (first == 'typedef' and len(head) > 1 and head[1].text in _CLASS_KEYS):
+                new_cls = _parse_class_head(stmt)
+                if new_cls:
+                    outline.classes.append(new_cls)
+                    scopes.append(('class', new_cls,
+                                   'private' if new_cls.kind == 'class' else 'public'))
+                else:
+                    scopes.append(('class', ClassInfo('', first, tok.line), 'public'))
+                stmt, stmt_index = [], []
+            elif first == 'enum':
+                i = pairs.get(i, len(tokens) - 1)
+            elif _brace_opens_body(stmt):
+                finish_statement(True)
+                stmt, stmt_index = [], []
+                i = pairs.get(i, len(tokens) - 1)   # Skip the function body
+            else:
+                # Brace initializer: keep it inside the statement, unparsed
+                end = pairs.get(i, len(tokens) - 1)
+                stmt.append(tok)
+                stmt_index.append(i)
+                i = end
+        elif tok.text == '}':
+            if len(scopes) > 1:
+                scopes.pop()
+            stmt, stmt_index = [], []
+        elif tok.text == ':' and kind == 'class' and len(stmt) == 1 and stmt[0].text in _ACCESS:
+            scopes[-1] = (kind, cls, stmt[0].text)
+            stmt, stmt_index = [], []
+        else:
+            stmt.append(tok)
+            stmt_index.append(i)
+        i += 1
+
+    return outline
+
+
+_CACHE: "OrderedDict[str, FileOutline]" = OrderedDict()
+_CACHE_SIZE = 4096
+_CACHE_LOCK = threading.Lock()  # Pipeline stages outline files from several threads
+
+
+def outline_source(content: str) -> FileOutline:
+    """Outline of a source text, cached by content hash."""
+    key = hashlib.sha1(content.encode('utf-8', 'surrogatepass')).hexdigest()
+    with _CACHE_LOCK:
+        outline = _CACHE.get(key)
+        if outline is not None:
+            _CACHE.move_to_end(key)
+            return outline
+    outline = parse_outline(content)
+    with _CACHE_LOCK:
+        _CACHE[key] = outline
+        if len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return outline
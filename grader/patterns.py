@@ -0,0 +1,96 @@
+"""
+Bounded regex searches for pattern checks.
+
+Rubric patterns such as `display.*all.*event` can backtrack badly on long
+minified or generated files. Every search here is line-bounded, runs over
+at most MAX_SCAN_CHARS of a file with lines truncated to MAX_LINE_CHARS,
+and uses precompiled patterns. When the optional `re2` module is
+installed, patterns it supports run on RE2 (linear time, no
+backtracking); everything else falls back to `re`.
+
+All functions are pure, so they are safe in worker threads and processes.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+MAX_SCAN_CHARS = 512 * 1024  # Only the first 512 KB of a file are searched
+MAX_LINE_CHARS = 1000        # Longer lines are truncated before searching
+
+
+@lru_cache(maxsize=512)
+def compile_pattern(pattern: str, flags: int = 0):
+    """
+    Compile a pattern once per process.
+
+    Uses RE2 when available and the pattern is supported by it
+    (no backreferences or lookaround), otherwise `re`.
+    """
+    if re2 is not None:
+        try:
+            prefix = '(?i)' if flags & re.IGNORECASE else ''
+            return re2.compile(prefix + pattern)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
+
+def bounded_text(text: str) -> str:
+    """
+    Cap a text to MAX_SCAN_CHARS and truncate lines longer than MAX_LINE_CHARS.
+
+    Line numbers of the kept lines are unchanged.
+    """
+    if len(text) > MAX_SCAN_CHARS:
+        text = text[:MAX_SCAN_CHARS]
+    if len(text) <= MAX_LINE_CHARS:
+        return text
+    lines = text.split('\n')
+    if all(len(line) <= MAX_LINE_CHARS for line in lines):
+        return text
+    return '\n'.join(line[:MAX_LINE_CHARS] for line in lines)
+
+
+def bounded_lines(text: str) -> List[str]:
+    """Lines of bounded_text(text)."""
+    return bounded_text(text).split('\n')
+
+
+def search_lines(pattern: str, text: str, flags: int = 0) -> Optional[Tuple[int, str]]:
+    """
+    Find the first line matching a pattern.
+
+    Returns:
+        (line number, line) of the first match, or None
+    """
+    compiled = compile_pattern(pattern, flags)
+    for i, line in enumerate(bounded_lines(text), start=1):
+        if compiled.search(line):
+            return i, line
+    return None
+
+
+def findall_lines(pattern: str, text: str, flags: int = 0) -> List[Tuple[int, str]]:
+    """
+    Find every match of a pattern, searching one line at a time.
+
+    Returns:
+        List of (line number, matched text) tuples
+    """
+    compiled = compile_pattern(pattern, flags)
+    found = []
+    for i, line in enumerate(bounded_lines(text), start=1):
+        for match in compiled.finditer(line):
+            found.append((i, match.group(0)))
+    return found
+
+
+def count_matches(pattern: str, text: str, flags: int = 0) -> int:
+    """Number of (line-bounded) matches of a pattern in a text."""
+    return len(findall_lines(pattern, text, flags))
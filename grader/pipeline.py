@@ -0,0 +1,172 @@
+"""
+Per-submission pipeline as a DAG of stages.
+
+Each stage declares the stages it depends on. run_pipeline starts every
+stage whose prerequisites have passed, runs independent stages at the
+same time in a thread pool (e.g. rubric checks while g++ compiles), and
+skips everything downstream of a stage that failed, so a submission that
+does not even parse never reaches link, run or the tests.
+
+A stage function receives a dict of the values returned by the stages
+before it. It fails by raising; what it prints is captured per stage.
+Progress is reported through an optional event callback, always called
+from the thread that called run_pipeline.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .results import Status
+from .utils import BudgetExceeded, capture_output, run_with_budget
+
+
+class PipelineError(Exception):
+    """Raised for an invalid stage graph (unknown dependency or cycle)."""
+
+
+@dataclass(slots=True)
+class Stage:
+    """
+    One step of the pipeline.
+
+    Attributes:
+        name: Unique stage name
+        func: Called with {stage name: value} of the stages before it
+        deps: Names of stages that must pass first
+        budget: Seconds the stage may take (None: no limit)
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    budget: Optional[float] = None
+
+
+@dataclass(slots=True)
+class StageResult:
+    """Outcome of one stage: PASS, FAIL, ERROR (timeout or budget) or SKIPPED."""
+    name: str
+    status: Status
+    value: Any = None
+    output: str = ''
+    error: Optional[str] = None
+    seconds: float = 0.0
+    exception: Optional[BaseException] = None  # What the stage raised, for callers that need details
+
+
+def order_stages(stages: List[Stage]) -> List[Stage]:
+    """
+    Sort stages so every stage comes after its dependencies.
+
+    Raises:
+        PipelineError: On an unknown dependency or a cycle
+    """
+    by_name = {stage.name: stage for stage in stages}
+    ordered, state = [], {}
+
+    def visit(stage, path):
+        if state.get(stage.name) == 'done':
+            return
+        if state.get(stage.name) == 'visiting':
+            raise PipelineError(f"Stage cycle: {' -> '.join(path + [stage.name])}")
+        state[stage.name] = 'visiting'
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise PipelineError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+            visit(by_name[dep], path + [stage.name])
+        state[stage.name] = 'done'
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage, [])
+    return ordered
+
+
+def _call(stage: Stage, values: Dict[str, Any]) -> tuple:
+    with capture_output() as output:
+        try:
+            return stage.func(values), output.getvalue(), None
+        except Exception as e:
+            return None, output.getvalue(), e
+
+
+def _run_stage(stage: Stage, values: Dict[str, Any]) -> StageResult:
+    start = time.monotonic()
+    try:
+        if stage.budget is None:
+            value, output, error = _call(stage, values)
+        else:
+            value, output, error = run_with_budget(_call, stage.budget, stage, values)
+    except BudgetExceeded as e:
+        value, output, error = None, '', e
+    seconds = round(time.monotonic() - start, 3)
+
+    if error is None:
+        return StageResult(stage.name, Status.PASS, value, output, None, seconds)
+    status = Status.ERROR if isinstance(error, TimeoutError) else Status.FAIL
+    return StageResult(stage.name, status, None, output, str(error) or type(error).__name__, seconds,
+                       error)
+
+
+def run_pipeline(stages: List[Stage], workers: int = 4,
+                 on_event: Callable[[dict], None] = None) -> Dict[str, StageResult]:
+    """
+    Run a stage graph, concurrently where dependencies allow.
+
+    Args:
+        stages: Stages to run (any order)
+        workers: Stages run at the same time
+        on_event: Called with {'event': 'start'|'finish'|'skip', 'stage',
+            'status', 'seconds', 'error'} as stages start, end or are cut off
+
+    Returns:
+        Stage name -> StageResult, in dependency order
+    """
+    ordered = order_stages(stages)
+    results: Dict[str, StageResult] = {}
+    values: Dict[str, Any] = {}
+    emit = on_event or (lambda event: None)
+    pending = list(ordered)
+    running = {}
+
+    def cut_off():
+        # Skip stages whose prerequisites can no longer pass
+        changed = True
+        while changed:
+            changed = False
+            for stage in list(pending):
+                failed = [d for d in stage.deps if d in results and results[d].status != Status.PASS]
+                if failed:
+                    pending.remove(stage)
+                    reason = f"{failed[0]} did not pass"
+                    results[stage.name] = StageResult(stage.name, Status.SKIPPED, error=reason)
+                    emit({'event': 'skip', 'stage': stage.name, 'status': Status.SKIPPED.value,
+                          'seconds': 0.0, 'error': reason})
+                    changed = True
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stage')
+    try:
+        while pending or running:
+            for stage in list(pending):
+                if all(results.get(d) is not None and results[d].status == Status.PASS
+                       for d in stage.deps):
+                    pending.remove(stage)
+                    emit({'event': 'start', 'stage': stage.name, 'status': 'running',
+                          'seconds': 0.0, 'error': None})
+                    running[pool.submit(_run_stage, stage, dict(values))] = stage
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                result = future.result()
+                results[stage.name] = result
+                if result.status == Status.PASS:
+                    values[stage.name] = result.value
+                emit({'event': 'finish', 'stage': stage.name, 'status': result.status.value,
+                      'seconds': result.seconds, 'error': result.error})
+            cut_off()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return {stage.name: results[stage.name] for stage in ordered}
@@ -0,0 +1,191 @@
+"""
+Live progress of a cohort run.
+
+Grading scripts send their log output to files, so a long run shows
+nothing on the terminal until it ends. Workers call emit() with small
+event dicts (a submission started, a pipeline stage started or
+finished, a submission was journaled); emit only puts the dict on a
+queue, so workers never wait on the display. A ProgressReporter thread
+in the main process drains the queue and, about once a second,
+redraws one status line on the real terminal (sys.__stderr__, when it
+is a terminal) and rewrites a status file. When stdout is that same
+terminal, the status is printed as a plain line every LINE_INTERVAL
+seconds instead, so it does not garble the per-submission lines:
+
+    [ 45/300] 12.3/min  ETA 20m41s  | slowest: studentY 1m35s (run)
+
+    Workers:
+      4121  studentX.zip  compile, benchmark  12s
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+from queue import Empty
+from typing import Dict, List, Optional
+
+LINE_INTERVAL = 30  # Seconds between status lines when stdout shares the terminal
+
+_events = None  # Queue emit() puts events on (see set_event_queue)
+
+
+def set_event_queue(events):
+    """
+    Send this process's progress events to `events` (None: drop them).
+
+    Also used as the initializer of grading worker processes.
+    """
+    global _events
+    _events = events
+
+
+def emit(event: str, entry: str = '', **fields):
+    """Report a progress event; does nothing when no queue is set."""
+    if _events is not None:
+        _events.put(dict(fields, event=event, entry=entry, worker=os.getpid()))
+
+
+def _duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressReporter:
+    """
+    Collects progress events and shows them on the terminal and in a file.
+
+    Events (dicts with 'event', 'entry' and 'worker'):
+        prepared            a submission was extracted
+        submission_start    a worker started grading a submission
+        start / finish / skip
+                            a pipeline stage changed (see run_pipeline),
+                            with 'stage'
+        submission_end      a submission was journaled
+    """
+
+    def __init__(self, events, total: int, status_path: Optional[str] = None,
+                 interval: float = 1.0, stream=None):
+        self.events = events
+        self.total = total
+        self.status_path = status_path
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.__stderr__
+        on_terminal = bool(self.stream) and self.stream.isatty()
+        shares_terminal = on_terminal and sys.stdout is not None and sys.stdout.isatty()
+        self.live = on_terminal and not shares_terminal    # Redraw one line in place
+        self.lined = shares_terminal                       # Print a line now and then
+        self._last_line = 0.0
+        self.prepared = 0
+        self.completed = 0
+        self.started_at: Optional[float] = None
+        self.running: Dict[str, dict] = {}     # entry -> {'worker', 'since', 'stages'}
+        self._thread = threading.Thread(target=self._loop, name='progress', daemon=True)
+        self._stop = threading.Event()
+
+    def handle(self, event: dict):
+        """Update the counters with one event."""
+        now = time.monotonic()
+        kind, entry = event['event'], event.get('entry', '')
+        if kind == 'prepared':
+            self.prepared += 1
+        elif kind == 'submission_start':
+            self.started_at = self.started_at or now
+            self.running[entry] = {'worker': event.get('worker'), 'since': now, 'stages': []}
+        elif kind in ('start', 'finish', 'skip') and entry in self.running:
+            stages = self.running[entry]['stages']
+            if kind == 'start':
+                stages.append(event['stage'])
+            elif event['stage'] in stages:
+                stages.remove(event['stage'])
+        elif kind == 'submission_end':
+            self.started_at = self.started_at or now
+            self.completed += 1
+            self.running.pop(entry, None)
+
+    def summary(self) -> str:
+        """One status line: counts, throughput, ETA and the slowest submission in flight."""
+        now = time.monotonic()
+        width = len(str(self.total))
+        if self.started_at is None:
+            return f"Extracting [{self.prepared:>{width}}/{self.total}]"
+        line = f"[{self.completed:>{width}}/{self.total}]"
+        elapsed = now - self.started_at
+        if self.completed and elapsed > 0:
+            rate = self.completed / elapsed
+            line += f" {rate * 60:.1f}/min  ETA {_duration((self.total - self.completed) / rate)}"
+        else:
+            line += " -/min  ETA -"
+        if self.running:
+            entry, info = min(self.running.items(), key=lambda item: item[1]['since'])
+            doing = ', '.join(info['stages']) or 'starting'
+            line += f"  | slowest: {entry} {_duration(now - info['since'])} ({doing})"
+        return line
+
+    def lines(self) -> List[str]:
+        """Status file contents: the summary, then what each worker is doing."""
+        now = time.monotonic()
+        lines = [self.summary(), ""]
+        if self.running:
+            lines.append("Workers:")
+            for entry, info in sorted(self.running.items(), key=lambda item: str(item[1]['worker'])):
+                doing = ', '.join(info['stages']) or 'starting'
+                lines.append(f"  {info['worker']}  {entry}  {doing}  {_duration(now - info['since'])}")
+        return lines
+
+    def render(self, final: bool = False):
+        """Redraw the terminal line and rewrite the status file."""
+        if self.live:
+            columns = shutil.get_terminal_size((100, 20)).columns
+            self.stream.write("\r" + self.summary()[:columns - 1].ljust(columns - 1))
+            if final:
+                self.stream.write("\n")
+            self.stream.flush()
+        elif self.lined and (final or time.monotonic() - self._last_line >= LINE_INTERVAL):
+            self._last_line = time.monotonic()
+            self.stream.write(f"Progress: {self.summary()}\n")
+            self.stream.flush()
+        if self.status_path:
+            partial = f"{self.status_path}.tmp"
+            with open(partial, 'w', encoding='utf-8') as f:
+                f.write("\n".join(self.lines()) + "\n")
+            os.replace(partial, self.status_path)
+
+    def _drain(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event = self.events.get(timeout=remaining)
+            except Empty:
+                return
+            self.handle(event)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._drain(self.interval)
+            self.render()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Handle the remaining events and draw the final state."""
+        self._stop.set()
+        self._thread.join()
+        self._drain(0.2)
+        self.render(final=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,264 @@
+"""
+Structured check results and their renderers.
+
+Checks return a CheckResult instead of printing. Source files shown for
+manual review are kept as references (FileDump) and only read when a
+result is rendered, so rendering can run later, elsewhere, or in
+parallel with grading. render_parts leaves each dumped file as a FileRef
+so a log writer can copy its bytes straight from disk.
+"""
+
+import html
+import json
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Callable, List, Optional, Union
+
+from .utils import DUMP_CAP_BYTES, truncation_marker
+
+
+class Status(str, Enum):
+    PASS = 'pass'
+    PARTIAL = 'partial'
+    FAIL = 'fail'
+    WARN = 'warn'
+    INFO = 'info'
+    SKIPPED = 'skipped'
+    ERROR = 'error'
+    MANUAL = 'manual'
+
+
+MARKS = {
+    Status.PASS: '✓',
+    Status.PARTIAL: '⚠',
+    Status.FAIL: '✗',
+    Status.WARN: '⚠',
+    Status.INFO: '',
+    Status.SKIPPED: '✗',
+    Status.ERROR: '✗',
+    Status.MANUAL: '⚠',
+}
+
+
+@dataclass(slots=True)
+class Evidence:
+    """One finding of a check, optionally pointing at a source line."""
+    status: Status
+    message: str
+    file: str = ''
+    line: int = 0
+    text: str = ''      # Source excerpt shown under the message
+    indent: int = 0
+
+
+@dataclass(slots=True)
+class FileDump:
+    """Files to show in full for manual review, by path (read at render time)."""
+    title: str
+    files: List[str]
+    note: str = ''          # Shown instead when there are no files
+    style: str = 'class'    # 'class' (--- f --- blocks) or 'source' (banner per file)
+
+
+@dataclass(frozen=True, slots=True)
+class FileRef:
+    """Placeholder for a file's contents inside rendered parts."""
+    path: str
+
+
+Part = Union[str, FileRef]
+
+
+@dataclass(slots=True)
+class CheckResult:
+    """
+    Result of one check call.
+
+    Attributes:
+        check: Name of the check function
+        status: Overall status of the check
+        value: Raw result used for scoring (dict, list, bool or count)
+        evidence: Findings, in the order they were made
+        dumps: Files to show for manual review
+        error: Error message when status is ERROR
+    """
+    check: str
+    status: Status = Status.INFO
+    value: Any = None
+    evidence: List[Evidence] = field(default_factory=list)
+    dumps: List[FileDump] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def add(self, status: Status, message: str, file: str = '', line: int = 0,
+            text: str = '', indent: int = 0) -> Evidence:
+        """Record a finding."""
+        evidence = Evidence(status, message, file, line, text, indent)
+        self.evidence.append(evidence)
+        return evidence
+
+    @property
+    def locations(self) -> List[tuple]:
+        """(file, line) of every finding that points at a source line."""
+        return [(e.file, e.line) for e in self.evidence if e.file and e.line]
+
+
+@dataclass(slots=True)
+class ItemResult:
+    """
+    Scored result of one rubric item.
+
+    Items merged into one check call share its CheckResult; only the
+    first of them (show_check) renders it.
+    """
+    id: str
+    title: str
+    status: Status
+    points: float
+    score: Optional[float] = 0.0
+    error: Optional[str] = None
+    check: Optional[CheckResult] = None
+    show_check: bool = False
+
+
+def status_from_flags(flags) -> Status:
+    """PASS if every flag is truthy, PARTIAL if some are, FAIL if none (or no flags)."""
+    flags = [bool(f) for f in flags]
+    if flags and all(flags):
+        return Status.PASS
+    return Status.PARTIAL if any(flags) else Status.FAIL
+
+
+def _dump_order(files: List[str]) -> List[str]:
+    """Headers first, then .cpp files, each sorted."""
+    headers = sorted(f for f in files if f.endswith('.h'))
+    others = sorted(f for f in files if not f.endswith('.h'))
+    return headers + others
+
+
+def _read_or_error(read: Callable[[str], str], path: str) -> str:
+    try:
+        text = read(path)
+    except Exception as e:
+        return f"Error reading file: {e}"
+    if len(text) > DUMP_CAP_BYTES:
+        text = text[:DUMP_CAP_BYTES] + truncation_marker(DUMP_CAP_BYTES, len(text))
+    return text
+
+
+def _lines_to_parts(lines: List[Part]) -> List[Part]:
+    """Join lines with newlines, merging neighbouring strings."""
+    parts = []
+    for i, line in enumerate(lines):
+        for piece in (('\n', line) if i else (line,)):
+            if isinstance(piece, str) and parts and isinstance(parts[-1], str):
+                parts[-1] += piece
+            else:
+                parts.append(piece)
+    return parts
+
+
+def join_parts(parts: List[Part], read: Callable[[str], str]) -> str:
+    """Build the text of rendered parts, reading FileRefs through `read`."""
+    return ''.join(p if isinstance(p, str) else _read_or_error(read, p.path) for p in parts)
+
+
+def _dump_lines(dump: FileDump) -> List[Part]:
+    if dump.style == 'source':
+        lines = ["", "=" * 70, dump.title, "=" * 70]
+        if not dump.files:
+            lines.append(dump.note or "No files found")
+        for path in _dump_order(dump.files):
+            lines += ["", "=" * 70, f"FILE: {path}", "=" * 70, FileRef(path)]
+        lines += ["", "=" * 70, f"END OF {dump.title}", "=" * 70, ""]
+        return lines
+
+    lines = ["", "-" * 50, dump.title, "-" * 50]
+    if not dump.files and dump.note:
+        lines.append(dump.note)
+    for path in _dump_order(dump.files):
+        lines += ["", f"--- {path} ---", FileRef(path), f"--- END {path} ---"]
+    return lines
+
+
+def dump_parts(dump: FileDump) -> List[Part]:
+    """Render a file dump as text parts, with a FileRef per file."""
+    return _lines_to_parts(_dump_lines(dump))
+
+
+def render_dump_text(dump: FileDump, read: Callable[[str], str]) -> str:
+    """Render a file dump as text, reading the files through `read`."""
+    return join_parts(dump_parts(dump), read)
+
+
+def render_parts(result: CheckResult, dumps: bool = True) -> List[Part]:
+    """
+    Render a check result as text parts.
+
+    Args:
+        result: Result to render
+        dumps: Include file dumps (as FileRefs)
+
+    Returns:
+        Parts ending in a newline (empty if nothing to show)
+    """
+    lines = []
+    for e in result.evidence:
+        prefix = '  ' * e.indent
+        mark = MARKS[e.status]
+        lines.append(f"{prefix}{mark} {e.message}" if mark else f"{prefix}{e.message}")
+        if e.text:
+            lines.append(f"{prefix}    {e.text}")
+    if dumps:
+        for dump in result.dumps:
+            lines += _dump_lines(dump)
+    return _lines_to_parts(lines + ['']) if lines else []
+
+
+def render_text(result: CheckResult, read: Callable[[str], str] = None) -> str:
+    """
+    Render a check result as plain text.
+
+    Args:
+        result: Result to render
+        read: Function returning a file's text by relative path; file
+            dumps are skipped when not given
+
+    Returns:
+        Rendered text ending in a newline (empty if nothing to show)
+    """
+    return join_parts(render_parts(result, dumps=read is not None), read)
+
+
+def as_dict(result) -> dict:
+    """JSON-ready dict of a CheckResult or ItemResult (file dumps stay as paths)."""
+    return asdict(result)
+
+
+def render_json(result) -> str:
+    """Render a CheckResult or ItemResult as JSON."""
+    return json.dumps(as_dict(result), ensure_ascii=False, default=str)
+
+
+def render_html(result: CheckResult, read: Callable[[str], str] = None) -> str:
+    """
+    Render a check result as an HTML fragment.
+
+    Findings become a list; dumped files become collapsed <details> blocks.
+    """
+    parts = [f'<div class="check {result.status.value}">', '<ul>']
+    for e in result.evidence:
+        location = f' <span class="loc">{html.escape(e.file)}:{e.line}</span>' if e.file and e.line else ''
+        excerpt = f'<pre>{html.escape(e.text)}</pre>' if e.text else ''
+        parts.append(f'<li class="{e.status.value}">{MARKS[e.status]} '
+                     f'{html.escape(e.message)}{location}{excerpt}</li>')
+    parts.append('</ul>')
+    if read is not None:
+        for dump in result.dumps:
+            parts.append(f'<h4>{html.escape(dump.title)}</h4>')
+            if not dump.files and dump.note:
+                parts.append(f'<p>{html.escape(dump.note)}</p>')
+            for path in _dump_order(dump.files):
+                parts.append(f'<details><summary>{html.escape(path)}</summary>'
+                             f'<pre>{html.escape(_read_or_error(read, path))}</pre></details>')
+    parts.append('</div>')
+    return '\n'.join(parts)
@@ -0,0 +1,463 @@
+"""
+Declarative rubric engine.
+
+A rubric is a TOML file listing sections of checks, each with a point
+value, parameters and optional dependencies on other checks:
+
+    name = "Assignment 2"
+
+    [settings]
+    exclude_dirs = ["LinkedBagDS"]         # kept as folders when flattening
+    instructor_files = ["LinkedBagDS"]     # provided files/folders (manifest role)
+    required_program_files = ["Organizer.cpp"]
+
+    [[section]]
+    title = "Part 3: LinkedBag function 'findKthItem' (10 pts)"
+    notes = ["Implementation: 6 pts | Use in program: 4 pts"]
+
+      [[section.item]]
+      id = "findKthItem_impl"
+      title = "Implementation"
+      check = "function_exists"
+      points = 6
+      args = { filename_pattern = "linkedbag", function_names = ["findKthItem"] }
+
+      [[section.item]]
+      id = "findKthItem_usage"
+      title = "Use in program"
+      check = "function_usage"
+      points = 4
+      depends_on = ["findKthItem_impl"]
+      args = { function_names = ["findKthItem"] }
+
+Items with `check = "manual"` are listed with their points but not scored.
+
+An optional [benchmark] table times required functions with an
+instructor driver (see grader/complexity.py); the driver path is
+relative to the rubric file:
+
+    [benchmark]
+    driver = "../2_assignment_misc/benchmark/linkedbag_bench.cpp"
+    header = "LinkedBag.h"
+    functions = ["reverseAppendK", "findKthItem"]
+    expected = { reverseAppendK = 1, findKthItem = 1 }   # n^x per call
+    budget = 60                                           # seconds for all runs
+
+Scoring options per item:
+    expect:       the check result must equal this value (e.g. a count)
+    require:      result keys that must be truthy (dict results)
+    mode:         "fraction" (default, partial credit), "all" or "any"
+    extra_credit: points count as earned but not towards the possible total
+"""
+
+import os
+import json
+import html
+import tomllib
+from typing import Dict, List
+
+from .design_check import (
+    check_class_files_exist,
+    find_inheritance,
+    check_function_exists_in_file,
+    check_function_usage,
+    count_pattern_in_files,
+    check_keyword_in_files,
+    check_files_exist,
+    check_smart_pointers,
+    check_friend_operator_overload,
+    check_big3_implementation,
+    check_linkedbag_operator_overload,
+    check_test_case_files,
+    CheckTable,
+    run_check_batch,
+)
+from .index import SubmissionIndex
+from .results import (CheckResult, ItemResult, MARKS, Status, as_dict, join_parts, render_html,
+                      render_parts)
+from .utils import BudgetExceeded, run_with_budget
+
+# check name -> (function, list argument that can be merged across items)
+CHECKS = {
+    'class_files': (check_class_files_exist, 'class_names'),
+    'inheritance': (find_inheritance, None),
+    'function_exists': (check_function_exists_in_file, 'function_names'),
+    'function_usage': (check_function_usage, 'function_names'),
+    'pattern_count': (count_pattern_in_files, None),
+    'keywords': (check_keyword_in_files, 'keywords'),
+    'files_exist': (check_files_exist, 'filenames'),
+    'smart_pointers': (check_smart_pointers, None),
+    'friend_operators': (check_friend_operator_overload, 'operators'),
+    'big3': (check_big3_implementation, None),
+    'linkedbag_assignment': (check_linkedbag_operator_overload, None),
+    'test_case_files': (check_test_case_files, None),
+}
+
+DEFAULT_TIMEOUT = 10
+
+# Statuses that make dependent items skip
+FAILED_STATUSES = {Status.FAIL, Status.ERROR, Status.SKIPPED}
+
+
+class RubricError(ValueError):
+    """Raised when a rubric file is malformed."""
+
+
+def load_rubric(path) -> dict:
+    """
+    Load and validate a rubric file.
+
+    Returns:
+        Rubric dict with 'name', 'settings' and 'section' keys (and
+        'benchmark', with an absolute driver path, if the file has one);
+        every item has 'id', 'check', 'points', 'args' and 'depends_on'
+    """
+    with open(path, 'rb') as f:
+        rubric = tomllib.load(f)
+
+    rubric.setdefault('name', str(path))
+    rubric.setdefault('settings', {})
+    rubric.setdefault('section', [])
+
+    seen = set()
+    for section in rubric['section']:
+        section.setdefault('notes', [])
+        section.setdefault('item', [])
+        for item in section['item']:
+            if 'id' not in item or 'check' not in item:
+                raise RubricError(f"Item in '{section.get('title')}' needs 'id' and 'check'")
+            if item['id'] in seen:
+                raise RubricError(f"Duplicate item id '{item['id']}'")
+            if item['check'] != 'manual' and item['check'] not in CHECKS:
+                raise RubricError(f"Unknown check '{item['check']}' in item '{item['id']}'")
+            seen.add(item['id'])
+            item.setdefault('title', item['id'])
+            item.setdefault('points', 0)
+            item.setdefault('args', {})
+            item.setdefault('depends_on', [])
+
+    for item in rubric_items(rubric):
+        for dep in item['depends_on']:
+            if dep not in seen:
+                raise RubricError(f"Item '{item['id']}' depends on unknown item '{dep}'")
+
+    if 'benchmark' in rubric:
+        benchmark = rubric['benchmark']
+        for key in ('driver', 'header', 'functions'):
+            if key not in benchmark:
+                raise RubricError(f"[benchmark] needs '{key}'")
+        benchmark['driver'] = os.path.normpath(
+            os.path.join(os.path.dirname(os.path.abspath(path)), benchmark['driver']))
+
+    return rubric
+
+
+def rubric_items(rubric: dict) -> List[dict]:
+    """All items of a rubric, in file order."""
+    return [item for section in rubric['section'] for item in section['item']]
+
+
+def plan_items(rubric: dict) -> List[dict]:
+    """
+    Order items so every item comes after its dependencies.
+
+    Items keep their file order wherever dependencies allow.
+
+    Raises:
+        RubricError: If the dependencies contain a cycle
+    """
+    items = rubric_items(rubric)
+    by_id = {item['id']: item for item in items}
+    order = []
+    state = {}  # id -> 'visiting' | 'done'
+
+    def visit(item):
+        if state.get(item['id']) == 'done':
+            return
+        if state.get(item['id']) == 'visiting':
+            raise RubricError(f"Dependency cycle through '{item['id']}'")
+        state[item['id']] = 'visiting'
+        for dep in item['depends_on']:
+            visit(by_id[dep])
+        state[item['id']] = 'done'
+        order.append(item)
+
+    for item in items:
+        visit(item)
+    return order
+
+
+def _batch_key(item: dict) -> str:
+    """Items with the same check and arguments (minus the mergeable list) share one call."""
+    _, merge_arg = CHECKS[item['check']]
+    args = {k: v for k, v in item['args'].items() if k != merge_arg}
+    return json.dumps([item['check'], args], sort_keys=True)
+
+
+def plan_batches(items: List[dict]) -> Dict[str, dict]:
+    """
+    Group items into check calls.
+
+    Returns:
+        Dict mapping batch key -> {'check', 'args', 'timeout', 'items'},
+        where list arguments of merged items are concatenated
+    """
+    batches = {}
+    for item in items:
+        if item['check'] == 'manual':
+            continue
+        key = _batch_key(item)
+        _, merge_arg = CHECKS[item['check']]
+        batch = batches.setdefault(key, {
+            'check': item['check'],
+            'args': {k: v for k, v in item['args'].items() if k != merge_arg},
+            'timeout': 0,
+            'items': [],
+        })
+        batch['items'].append(item['id'])
+        batch['timeout'] = max(batch['timeout'], item.get('timeout', DEFAULT_TIMEOUT))
+        if merge_arg and merge_arg in item['args']:
+            merged = batch['args'].setdefault(merge_arg, [])
+            merged.extend(v for v in item['args'][merge_arg] if v not in merged)
+    return batches
+
+
+def _run_batch(batch: dict, index: SubmissionIndex) -> CheckResult:
+    """Run one check call within its time budget."""
+    func, _ = CHECKS[batch['check']]
+    try:
+        return run_with_budget(func, batch['timeout'], index, **batch['args'])
+    except BudgetExceeded:
+        error = f"budget exceeded: {batch['check']} took longer than {batch['timeout']}s"
+    except Exception as e:
+        error = f"{batch['check']} failed: {e}"
+    return CheckResult(func.__name__, Status.ERROR, error=error)
+
+
+def score_fraction(result, item: dict) -> float:
+    """Turn a raw check result into the fraction of the item's points earned."""
+    if 'expect' in item:
+        return 1.0 if result == item['expect'] else 0.0
+
+    if isinstance(result, dict):
+        _, merge_arg = CHECKS[item['check']]
+        keys = item.get('require') or item['args'].get(merge_arg) or list(result.keys())
+        values = [bool(result.get(k)) for k in keys]
+        if not values:
+            return 0.0
+        mode = item.get('mode', 'fraction')
+        if mode == 'any':
+            return 1.0 if any(values) else 0.0
+        if mode == 'all':
+            return 1.0 if all(values) else 0.0
+        return sum(values) / len(values)
+
+    # Lists (e.g. inheritance found), booleans and counts: any hit passes
+    return 1.0 if result else 0.0
+
+
+def run_rubric(rubric: dict, index: SubmissionIndex) -> Dict[str, ItemResult]:
+    """
+    Run every check of a rubric against one submission.
+
+    Checks are planned so that items sharing a call run it once, and
+    items whose prerequisite failed are skipped without running.
+
+    Args:
+        rubric: Rubric loaded with load_rubric
+        index: Index of the submission to grade
+
+    Returns:
+        Dict mapping item id -> ItemResult, whose status is
+        pass/partial/fail/skipped/error/manual
+    """
+    items = plan_items(rubric)
+    batches = plan_batches(items)
+    batch_runs = {}
+    results = {}
+
+    for item in items:
+        entry = ItemResult(item['id'], item['title'], Status.MANUAL, item['points'])
+        results[item['id']] = entry
+
+        if item['check'] == 'manual':
+            entry.score = None
+            continue
+
+        failed = [dep for dep in item['depends_on']
+                  if results[dep].status in FAILED_STATUSES]
+        if failed:
+            entry.status = Status.SKIPPED
+            entry.error = f"prerequisite failed: {', '.join(failed)}"
+            continue
+
+        key = _batch_key(item)
+        # Show a shared call's result once, under the first item that used it
+        entry.show_check = key not in batch_runs
+        if key not in batch_runs:
+            batch_runs[key] = _run_batch(batches[key], index)
+        entry.check = batch_runs[key]
+
+        if entry.check.status == Status.ERROR:
+            entry.status = Status.ERROR
+            entry.error = entry.check.error
+            continue
+
+        fraction = score_fraction(entry.check.value, item)
+        entry.score = round(item['points'] * fraction, 2)
+        entry.status = Status.PASS if fraction >= 1 else Status.PARTIAL if fraction > 0 else Status.FAIL
+
+    return results
+
+
+def score_item_batch(rubric: dict, item_id: str, indexes: List[SubmissionIndex],
+                     workers: int = None) -> CheckTable:
+    """
+    Re-evaluate one rubric item over a whole cohort in one parallel pass.
+
+    Dependencies are ignored; the item's check always runs.
+
+    Args:
+        rubric: Rubric loaded with load_rubric
+        item_id: Id of the item to evaluate
+        indexes: One SubmissionIndex (or folder path) per student
+        workers: Number of worker processes (None = one per CPU)
+
+    Returns:
+        CheckTable with the check's result columns (prefixed "<id>.")
+        plus "<id>.score"
+    """
+    item = next((i for i in rubric_items(rubric) if i['id'] == item_id), None)
+    if item is None:
+        raise RubricError(f"Unknown item '{item_id}'")
+    if item['check'] == 'manual':
+        raise RubricError(f"Item '{item_id}' is graded manually")
+
+    func, _ = CHECKS[item['check']]
+    prefix = f"{item_id}."
+    table = run_check_batch(indexes, func, workers=workers, prefix=prefix, **item['args'])
+
+    # Rebuild each student's raw result from its columns to score it
+    result_columns = [name for name in table.columns if name != f"{prefix}error"]
+    scores = []
+    for i in range(len(table)):
+        if table.column(f"{prefix}error")[i]:
+            scores.append(0.0)
+            continue
+        if result_columns == [f"{prefix}result"]:
+            result = table.column(f"{prefix}result")[i]
+        else:
+            result = {name[len(prefix):]: table.column(name)[i] for name in result_columns}
+        scores.append(round(item['points'] * score_fraction(result, item), 2))
+    table.add_column(f"{prefix}score", scores)
+    return table
+
+
+def score_totals(rubric: dict, results: Dict[str, ItemResult]) -> dict:
+    """
+    Sum scores over a rubric.
+
+    Returns:
+        Dict with 'earned', 'possible' (auto-graded, excluding extra
+        credit) and 'manual' points
+    """
+    earned = possible = manual = 0.0
+    for item in rubric_items(rubric):
+        entry = results[item['id']]
+        if entry.status == Status.MANUAL:
+            manual += item['points']
+        else:
+            if not item.get('extra_credit'):
+                possible += item['points']
+            earned += entry.score or 0.0
+    return {'earned': round(earned, 2), 'possible': possible, 'manual': manual}
+
+
+def _item_line(item: dict, entry: ItemResult) -> str:
+    """One-line verdict for a rubric item."""
+    mark = MARKS[entry.status]
+    if entry.status == Status.MANUAL:
+        note = item.get('note', 'MANUALLY GRADE')
+        return f"{mark} {note} ({item['points']} pts)"
+    if entry.status in (Status.SKIPPED, Status.ERROR):
+        return (f"{mark} {item['title']}: {entry.status.value.upper()} - "
+                f"{entry.error} (0/{item['points']} pts)")
+    return f"{mark} {item['title']} ({entry.score}/{item['points']} pts)"
+
+
+def render_rubric_sections(rubric: dict, results: Dict[str, ItemResult], dumps: bool = True) -> List[tuple]:
+    """
+    Render rubric results one section at a time, in rubric order.
+
+    Args:
+        rubric: Rubric loaded with load_rubric
+        results: Results from run_rubric
+        dumps: Include file dumps (as FileRef parts, see render_parts)
+
+    Returns:
+        List of (section title, parts) pairs, ending with the score total
+    """
+    sections = []
+    for section in rubric['section']:
+        parts = ['\n'.join([f"\n--- {section['title']} ---"] + section['notes']) + '\n']
+
+        for item in section['item']:
+            entry = results[item['id']]
+            if entry.check is not None and entry.show_check:
+                parts.extend(render_parts(entry.check, dumps))
+            parts.append(_item_line(item, entry) + '\n')
+        sections.append((section['title'], parts))
+
+    sections.append(('AUTO-GRADED SCORE', [f"\n{score_summary(rubric, results)}\n"]))
+    return sections
+
+
+def score_summary(rubric: dict, results: Dict[str, ItemResult]) -> str:
+    """One-line score total, e.g. for log indexes."""
+    totals = score_totals(rubric, results)
+    return (f"AUTO-GRADED SCORE: {totals['earned']} / {totals['possible']} pts "
+            f"(+{totals['manual']} pts graded manually)")
+
+
+def render_rubric_text(rubric: dict, results: Dict[str, ItemResult], read=None) -> str:
+    """
+    Render rubric results as one text block (see render_rubric_sections).
+
+    File dumps are read through `read` and skipped when it is not given.
+    """
+    sections = render_rubric_sections(rubric, results, dumps=read is not None)
+    return ''.join(join_parts(parts, read) for _, parts in sections)
+
+
+def render_rubric_html(rubric: dict, results: Dict[str, ItemResult], read=None) -> str:
+    """Render rubric results as an HTML fragment (see render_rubric_text)."""
+    parts = []
+    for section in rubric['section']:
+        parts.append(f"<h3>{html.escape(section['title'])}</h3>")
+        parts.extend(f"<p>{html.escape(note)}</p>" for note in section['notes'])
+        for item in section['item']:
+            entry = results[item['id']]
+            if entry.check is not None and entry.show_check:
+                parts.append(render_html(entry.check, read))
+            parts.append(f'<p class="item {entry.status.value}">{html.escape(_item_line(item, entry))}</p>')
+    totals = score_totals(rubric, results)
+    parts.append(f"<p><b>AUTO-GRADED SCORE: {totals['earned']} / {totals['possible']} pts</b> "
+                 f"(+{totals['manual']} pts graded manually)</p>")
+    return '\n'.join(parts)
+
+
+def rubric_results_dict(rubric: dict, results: Dict[str, ItemResult]) -> dict:
+    """
+    JSON-ready results of one submission.
+
+    Returns:
+        Dict with 'totals' and 'items' (item id -> result, each shared
+        check result included once, under the item that shows it)
+    """
+    items = {}
+    for item_id, entry in results.items():
+        data = as_dict(entry)
+        if not entry.show_check:
+            data['check'] = None
+        items[item_id] = data
+    return {'totals': score_totals(rubric, results), 'items': items}
@@ -0,0 +1,187 @@
+"""
+Scratch build directories and a content-addressed object cache.
+
+Builds used to write .o files and executables into each extracted
+submission, next to the sources, so a rerun found stale objects from the
+last one and every build went through the disk. Now each build runs in
+its own scratch directory (build_sandbox), on tmpfs (/dev/shm) when the
+machine has one: the submission's files are symlinked in, g++ writes its
+outputs there, and the directory is removed when grading is done.
+
+The only thing carried from one build to the next is the object cache.
+An object file is stored under a hash of everything that went into it
+(compiler, flags, and the path and contents of the source and every
+file it includes), so it is reused only when recompiling would give the
+same result, whichever submission or run it came from.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List
+
+from .extract import IGNORE_DIRS
+from .index import SubmissionIndex
+from .utils import file_digest, install_file
+
+SCRATCH_DIRS = ('/dev/shm',)     # Preferred (RAM-backed) places for scratch files
+SANDBOX_PREFIX = 'build-'
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+ARTIFACT_EXTENSIONS = {'.o', '.obj', '.exe', '.out', '.a', '.so', '.gch', '.pch'}
+
+
+def scratch_root() -> str:
+    """Folder for sandboxes and the object cache: on tmpfs if possible, else the temp folder."""
+    for base in SCRATCH_DIRS:
+        if os.path.isdir(base) and os.access(base, os.W_OK | os.X_OK):
+            break
+    else:
+        base = tempfile.gettempdir()
+    root = os.path.join(base, f"grader-{os.getuid()}" if hasattr(os, 'getuid') else 'grader')
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def _sandbox_files(index: SubmissionIndex) -> List[str]:
+    """Files a build may read: everything but build outputs and IDE/build folders."""
+    files = []
+    for path in index.walk_files:
+        parts = path.replace(os.sep, '/').split('/')
+        if any(p.lower() in IGNORE_DIRS or p.startswith('.') for p in parts):
+            continue
+        if os.path.splitext(parts[-1].lower())[1] in ARTIFACT_EXTENSIONS:
+            continue
+        files.append(path)
+    return files
+
+
+@contextmanager
+def build_sandbox(index: SubmissionIndex):
+    """
+    Scratch directory for building and running one submission.
+
+    The submission's files are symlinked in at the same relative paths,
+    so #include "..." resolves exactly as in the submission folder. The
+    directory and everything built in it are removed on exit.
+
+    Yields:
+        Absolute path of the sandbox
+    """
+    parent = os.path.join(scratch_root(), 'sandboxes')
+    os.makedirs(parent, exist_ok=True)
+    sandbox = tempfile.mkdtemp(prefix=f"{SANDBOX_PREFIX}{os.getpid()}-", dir=parent)
+    try:
+        for path in _sandbox_files(index):
+            link = os.path.join(sandbox, path)
+            os.makedirs(os.path.dirname(link), exist_ok=True)
+            os.symlink(os.path.abspath(index.path(path)), link)
+        yield sandbox
+    finally:
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+
+def prune_sandboxes():
+    """Remove sandboxes left behind by grading processes that no longer exist."""
+    parent = os.path.join(scratch_root(), 'sandboxes')
+    if not os.path.isdir(parent):
+        return
+    for name in os.listdir(parent):
+        try:
+            pid = int(name[len(SANDBOX_PREFIX):].split('-', 1)[0])
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+        except (ValueError, OSError):
+            continue
+
+
+def object_key(index: SubmissionIndex, source: str, depends: List[str], build_id: str) -> str:
+    """
+    Cache key of the object file built from `source`.
+
+    Args:
+        index: Index of the submission
+        source: .cpp file (relative path)
+        depends: Files it includes (see BuildPlan.depends)
+        build_id: Compiler version and flags (see grader.compile.build_id)
+    """
+    digests = {}
+    if index.manifest is not None:
+        digests = {f.path: f.sha256 for f in index.manifest.files}
+    key = hashlib.sha256(build_id.encode('utf-8'))
+    for path in [source] + list(depends):
+        path = path.replace(os.sep, '/')
+        digest = digests.get(path) or file_digest(index.path(path))
+        key.update(f"\0{path}\0{digest}".encode('utf-8'))
+    return key.hexdigest()
+
+
+def object_keys(index: SubmissionIndex, depends: Dict[str, List[str]], build_id: str) -> Dict[str, str]:
+    """Cache key of every file to compile (see BuildPlan.depends)."""
+    return {source: object_key(index, source, deps, build_id) for source, deps in depends.items()}
+
+
+class ObjectCache:
+    """
+    Object files stored by key (see object_key), shared by every build.
+
+    Entries are installed into sandboxes as hard links where possible and
+    written atomically, so parallel graders can use one cache.
+    """
+
+    def __init__(self, folder: str = None, max_bytes: int = MAX_CACHE_BYTES):
+        self.folder = folder or os.path.join(scratch_root(), 'objects')
+        self.max_bytes = max_bytes
+        os.makedirs(self.folder, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, key[:2], key + '.o')
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def fetch(self, key: str, dst: str) -> bool:
+        """Install the cached object for `key` at dst; False if there is none."""
+        path = self._path(key)
+        try:
+            install_file(path, dst)
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key: str, src: str):
+        """Add a freshly built object file to the cache."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            install_file(src, partial)
+            os.replace(partial, path)
+        except OSError:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    def prune(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
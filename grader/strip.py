@@ -0,0 +1,96 @@
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+# One alternation scanned left to right in a single pass. Only comments are
+# removed; string, character and raw string literals are matched so that a
+# `//` or `/*` inside them is never mistaken for a comment.
+_TOKEN_PATTERN = re.compile(
+    r'''
+      (?P<line>//(?:[^\\\n]|\\\r?\n|\\.)*)              # // comment, with \-newline continuations
+    | (?P<block>/\*.*?(?:\*/|\Z))                       # /* comment */ (or unterminated)
+    | (?P<raw>\b(?:u8|u|U|L)?R"                         # R"delim( ... )delim"
+          (?P<delim>[^()\\\s"]{0,16})\(.*?\)(?P=delim)")
+    | (?P<string>(?:\b(?:u8|u|U|L))?"(?:[^"\\\n]|\\.)*"?)
+    | (?P<char>(?:(?<!\w)|(?<=\bu8)|(?<=\b[uUL]))'      # not a digit separator (1'000)
+          (?:[^'\\\n]|\\.)*'?)
+    ''',
+    re.DOTALL | re.VERBOSE,
+)
+
+
+@dataclass
+class StrippedSource:
+    """
+    C/C++ source with comments removed.
+
+    Attributes:
+        code: Source with comments removed but every newline kept, so line
+              N of `code` is line N of the original file
+        lines: Non-empty lines of `code`, whitespace-stripped
+        line_numbers: Original 1-based line number of each entry in `lines`
+    """
+    code: str
+    lines: List[str] = field(default_factory=list)
+    line_numbers: List[int] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Compact view: non-empty stripped lines joined by newlines."""
+        return '\n'.join(self.lines)
+
+    def original_line(self, index: int) -> int:
+        """Map an index into `lines` back to its original line number."""
+        return self.line_numbers[index]
+
+
+def strip_source(content: str) -> StrippedSource:
+    """
+    Remove C/C++ comments in a single pass.
+
+    Understands string and character literals, raw strings and line
+    continuations. Comments are replaced by their newlines (or a single
+    space) so line numbers and token boundaries are preserved.
+
+    Args:
+        content: Source text
+
+    Returns:
+        StrippedSource with the stripped code and the compact line view
+    """
+    pieces = []
+    pos = 0
+    for match in _TOKEN_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind not in ('line', 'block'):
+            continue
+        pieces.append(content[pos:match.start()])
+        newlines = match.group().count('\n')
+        if newlines:
+            pieces.append('\n' * newlines)
+        elif kind == 'block':
+            pieces.append(' ')
+        pos = match.end()
+    pieces.append(content[pos:])
+    code = ''.join(pieces)
+
+    lines = []
+    line_numbers = []
+    for number, line in enumerate(code.split('\n'), 1):
+        line = line.strip()
+        if line:
+            lines.append(line)
+            line_numbers.append(number)
+
+    return StrippedSource(code, lines, line_numbers)
+
+
+def strip_comments(content: str) -> str:
+    """Remove C/C++ comments, blank lines and surrounding whitespace."""
+    return strip_source(content).text
+
+
+def read_stripped(path) -> StrippedSource:
+    """Read a source file (ignoring undecodable bytes) and strip it."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return strip_source(f.read())
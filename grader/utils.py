@@ -1,13 +1,245 @@
-import difflib
+import io
+import os
+import sys
+import hashlib
+import shutil
+import signal
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 
-def log_diff(student_file, standard_file, file_name):
+from .diff import MAX_DIFF_LINES, diff_files
+
+def log_diff(student_file, standard_file, file_name, max_lines=MAX_DIFF_LINES):
     print(f"\n--- Differences in {file_name} ---")
-    diff_lines = difflib.unified_diff(
-        open(standard_file).readlines(),
-        open(student_file).readlines(),
-        fromfile='standard',
-        tofile='student',
-    )
-    diff_output = "".join(diff_lines)
-    print(diff_output)
+    diff_lines = diff_files(standard_file, student_file, max_lines)
+    if diff_lines is None:
+        print("(only comments or whitespace differ)")
+    else:
+        print("".join(diff_lines))
     print(f"--- End of differences in {file_name} ---\n")
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_FICLONE = 0x40049409  # Linux ioctl: share extents with another file (reflink)
+
+
+def _reflink(src: str, dst: str):
+    import fcntl
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+
+
+def install_file(src: str, dst: str, hardlink: bool = True) -> str:
+    """
+    Put a copy of `src` at `dst` without duplicating its bytes when possible.
+
+    Tries a hardlink (unless hardlink=False), then a reflink (copy-on-write
+    clone), then a plain copy. A hardlinked file is the same inode as
+    `src`, so it must not be edited in place; pass hardlink=False when
+    `dst` may be written to.
+
+    Returns:
+        How the file was installed: 'link', 'reflink' or 'copy'
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return 'link'
+        except OSError:
+            pass
+    try:
+        _reflink(src, dst)
+        return 'reflink'
+    except (ImportError, OSError):
+        if os.path.exists(dst):
+            os.remove(dst)
+    shutil.copyfile(src, dst)
+    return 'copy'
+
+
+@contextmanager
+def timeout(seconds):
+    """Context manager for timing out operations (main thread only; see run_with_budget)"""
+    def timeout_handler(signum, frame):
+        raise TimeoutError(f"Operation timed out after {seconds} seconds")
+
+    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, old_handler)
+
+
+class BudgetExceeded(TimeoutError):
+    """Raised when a call does not finish within its time budget."""
+
+
+def run_with_budget(func, seconds, *args, **kwargs):
+    """
+    Run func(*args, **kwargs) in a worker thread and wait at most `seconds`.
+
+    Unlike timeout(), this does not rely on SIGALRM, so it works from any
+    thread and can be nested. A call that exceeds its budget cannot be
+    killed; it is abandoned (the thread is a daemon) and its result dropped.
+
+    Raises:
+        BudgetExceeded: If the call did not finish in time
+    """
+    future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, daemon=True,
+                     name=f"budget-{getattr(func, '__name__', 'call')}").start()
+    try:
+        return future.result(timeout=seconds)
+    except TimeoutError:
+        if future.done():
+            raise
+        raise BudgetExceeded(f"budget exceeded after {seconds} seconds")
+
+
+class _ThreadLocalStdout:
+    """sys.stdout stand-in that sends each thread's writes to its own capture buffer, if any."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def _target(self):
+        buffer = getattr(self.local, 'buffer', None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def fileno(self):
+        # Writing to the real descriptor would bypass an active capture
+        if getattr(self.local, 'buffer', None) is not None:
+            raise io.UnsupportedOperation("fileno")
+        return self.stream.fileno()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+_stdout_lock = threading.Lock()
+
+
+@contextmanager
+def capture_output(buffer=None):
+    """
+    Capture what the current thread prints, leaving other threads alone.
+
+    Unlike contextlib.redirect_stdout, which swaps sys.stdout for the whole
+    process, this is safe while checks run in several threads.
+
+    Args:
+        buffer: Text buffer to write into (a new StringIO by default)
+    """
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStdout):
+            sys.stdout = _ThreadLocalStdout(sys.stdout)
+        proxy = sys.stdout
+    buffer = io.StringIO() if buffer is None else buffer
+    previous = getattr(proxy.local, 'buffer', None)
+    proxy.local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        proxy.local.buffer = previous
+
+
+DUMP_CAP_BYTES = 256 * 1024   # Largest file dumped into a log in full
+_COPY_BUFFER = 1024 * 1024
+
+
+def truncation_marker(shown: int, total: int) -> str:
+    """Line appended to a dump cut at `shown` of `total` bytes."""
+    return f"\n[... truncated: showing first {shown} of {total} bytes ...]"
+
+
+def copy_file_bytes(src_path: str, dst, limit: int = DUMP_CAP_BYTES) -> int:
+    """
+    Copy up to `limit` bytes of a file into an open binary stream, undecoded.
+
+    Uses os.sendfile (kernel-side copy) when `dst` has a file descriptor,
+    otherwise reads and writes in 1 MB chunks.
+
+    Returns:
+        Number of bytes written
+    """
+    sent = 0
+    with open(src_path, 'rb') as src:
+        try:
+            out_fd = dst.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            out_fd = None
+
+        if out_fd is not None and hasattr(os, 'sendfile'):
+            dst.flush()
+            try:
+                while sent < limit:
+                    n = os.sendfile(out_fd, src.fileno(), sent, limit - sent)
+                    if n == 0:
+                        break
+                    sent += n
+                return sent
+            except OSError:
+                pass  # e.g. unsupported file types; finish with plain copies
+
+        src.seek(sent)
+        while sent < limit:
+            chunk = src.read(min(_COPY_BUFFER, limit - sent))
+            if not chunk:
+                break
+            dst.write(chunk)
+            sent += len(chunk)
+    return sent
+
+
+def dump_file(stream, path: str, limit: int = DUMP_CAP_BYTES):
+    """
+    Write a file's contents (capped, with a truncation marker) to a text stream.
+
+    Bytes go straight to the stream's file descriptor when it has one
+    (e.g. a redirected sys.stdout); otherwise the capped text is written.
+    """
+    size = os.path.getsize(path)
+    try:
+        stream.flush()
+        binary = os.fdopen(os.dup(stream.fileno()), 'wb')
+    except (AttributeError, io.UnsupportedOperation, OSError):
+        binary = None
+
+    if binary is not None:
+        with binary:
+            copy_file_bytes(path, binary, limit)
+    else:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            stream.write(f.read(limit))
+    if size > limit:
+        stream.write(truncation_marker(limit, size))
+    stream.write("\n")
@@ -0,0 +1,326 @@
+"""
+Drop-directory watcher for grading submissions as they arrive.
+
+DirectoryWatcher reports .zip files that were written into (or moved
+into) a folder. On Linux it uses inotify through ctypes, so an idle
+watch costs nothing. Elsewhere, or if inotify is unavailable, it polls
+the folder and reports a file once its size and modification time stop
+changing. Either way a file is only reported once it is complete, and
+arrivals close together are reported as one batch.
+
+ingest_archive copies what changed into the submissions folder:
+
+    submissions.zip   the whole cohort, re-downloaded; only the students
+                      whose entries differ from the last copy are taken
+    <student>.zip     one student's archive, dropped on its own
+
+Each student's previous extracted folder is removed, so a resubmission
+is graded from a clean tree.
+
+watch_submissions ties the two together for the grader's watch mode
+(scripts/grade.py --watch): it ingests whatever arrives and hands each
+batch of new or changed submissions to a grading callback, keeping a
+record of what was ingested across restarts.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import shutil
+import signal
+import struct
+import sys
+import time
+import zipfile
+import zlib
+from typing import Callable, Dict, List, Optional, Set
+
+from .progress import set_event_queue
+
+COHORT_ARCHIVE = 'submissions.zip'
+POLL_INTERVAL = 2.0     # Seconds between scans when polling
+SETTLE_SECONDS = 2.0    # Quiet time that ends a batch of arrivals
+
+# inotify(7)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _is_archive(name: str) -> bool:
+    return name.lower().endswith('.zip') and not name.startswith('.')
+
+
+class DirectoryWatcher:
+    """
+    Watches one folder for complete .zip files.
+
+    Attributes:
+        folder: Folder being watched
+        mode: 'inotify' or 'poll'
+    """
+
+    def __init__(self, folder: str, poll_interval: float = POLL_INTERVAL,
+                 settle: float = SETTLE_SECONDS, force_poll: bool = False):
+        self.folder = os.path.abspath(folder)
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._fd: Optional[int] = None
+        self._seen: Dict[str, tuple] = {}
+        self._pending: Dict[str, tuple] = {}
+        if not force_poll:
+            self._fd = self._open_inotify()
+        self.mode = 'inotify' if self._fd is not None else 'poll'
+        self._seen = self._scan()
+
+    def _open_inotify(self) -> Optional[int]:
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                return None
+            if libc.inotify_add_watch(fd, os.fsencode(self.folder), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+                os.close(fd)
+                return None
+        except (OSError, AttributeError):
+            return None
+        return fd
+
+    def _scan(self) -> Dict[str, tuple]:
+        state = {}
+        for name in os.listdir(self.folder):
+            if _is_archive(name):
+                try:
+                    st = os.stat(os.path.join(self.folder, name))
+                except FileNotFoundError:
+                    continue
+                state[name] = (st.st_size, st.st_mtime_ns)
+        return state
+
+    def existing(self) -> List[str]:
+        """Archives already in the folder when watching started."""
+        return sorted(self._seen)
+
+    def _read_inotify(self, timeout: float) -> Set[str]:
+        names = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        while ready:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if _is_archive(name):
+                    names.add(name)
+            ready, _, _ = select.select([self._fd], [], [], 0)
+        return names
+
+    def _poll(self, timeout: float) -> Set[str]:
+        time.sleep(timeout)
+        current = self._scan()
+        changed = {name for name, stat in current.items() if self._seen.get(name) != stat}
+        # A file is complete once it looks the same on two scans in a row
+        complete = {name for name in changed if self._pending.get(name) == current[name]}
+        self._pending = {name: current[name] for name in changed - complete}
+        for name in complete:
+            self._seen[name] = current[name]
+        return complete
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Wait for archives to arrive.
+
+        Args:
+            timeout: Seconds to wait for the first arrival (None: forever)
+
+        Returns:
+            Names of the archives that arrived (empty on timeout); arrivals
+            within `settle` seconds of each other are returned together
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        names: Set[str] = set()
+        while True:
+            if names:
+                step = self.settle
+            elif deadline is None:
+                step = self.poll_interval
+            else:
+                step = max(0.0, min(self.poll_interval, deadline - time.monotonic()))
+            if self._fd is not None:
+                arrived = self._read_inotify(step)
+            else:
+                arrived = self._poll(step)
+            if names and not arrived:
+                return sorted(names)
+            names |= arrived
+            if not names and deadline is not None and time.monotonic() >= deadline:
+                return []
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _content_key(files: List[str]) -> str:
+    """Key of an entry from one "name, size, CRC-32" line per file."""
+    return hashlib.sha256("\n".join(sorted(files)).encode('utf-8')).hexdigest()
+
+
+def _member_keys(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Content key of every top-level entry of a cohort archive."""
+    parts: Dict[str, List[str]] = {}
+    for info in archive.infolist():
+        top = info.filename.split('/', 1)[0]
+        if not top or top.startswith('.') or top.lower() == '__macosx' or info.is_dir():
+            continue
+        parts.setdefault(top, []).append(f"{info.filename}\0{info.file_size}\0{info.CRC}")
+    return {top: _content_key(lines) for top, lines in parts.items()}
+
+
+def _file_key(path: str) -> str:
+    """Content key of a student archive dropped on its own (equal to its key as a cohort member)."""
+    crc, size = 0, 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+    return _content_key([f"{os.path.basename(path)}\0{size}\0{crc}"])
+
+
+def _replace_entry(submissions_path: str, entry: str):
+    """Remove a student's previous archive and extracted folder."""
+    target = os.path.join(submissions_path, entry)
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    elif os.path.exists(target):
+        os.remove(target)
+    if entry.lower().endswith('.zip'):
+        shutil.rmtree(os.path.splitext(target)[0], ignore_errors=True)
+
+
+def ingest_archive(path: str, submissions_path: str, seen: Dict[str, str]) -> List[str]:
+    """
+    Copy new or changed submissions from an arrived archive.
+
+    Args:
+        path: The archive (a cohort submissions.zip or one student's .zip)
+        submissions_path: Folder submissions are graded from
+        seen: Entry -> content key of the version last ingested; updated
+
+    Returns:
+        Entries (names in submissions_path) that are new or changed
+
+    Raises:
+        zipfile.BadZipFile: If the archive is not a complete zip file
+    """
+    changed = []
+    if os.path.basename(path).lower() == COHORT_ARCHIVE:
+        with zipfile.ZipFile(path) as archive:
+            for entry, key in sorted(_member_keys(archive).items()):
+                if seen.get(entry) == key:
+                    continue
+                _replace_entry(submissions_path, entry)
+                members = [m for m in archive.namelist() if m.split('/', 1)[0] == entry]
+                archive.extractall(submissions_path, members)
+                seen[entry] = key
+                changed.append(entry)
+        return changed
+
+    with zipfile.ZipFile(path) as archive:
+        archive.testzip()
+    entry = os.path.basename(path)
+    key = _file_key(path)
+    if seen.get(entry) != key:
+        _replace_entry(submissions_path, entry)
+        partial = os.path.join(submissions_path, f".{entry}.part")
+        shutil.copyfile(path, partial)
+        os.replace(partial, os.path.join(submissions_path, entry))
+        seen[entry] = key
+        changed.append(entry)
+    return changed
+
+
+def load_state(state_path: str) -> Dict[str, str]:
+    """What earlier watch runs ingested: entry -> content key (empty if none)."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state_path: str, seen: Dict[str, str]):
+    partial = f"{state_path}.tmp"
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump(seen, f, indent=2, sort_keys=True)
+    os.replace(partial, state_path)
+
+
+def watch_worker(events):
+    """Grading worker initializer for watch mode: Ctrl-C is left to the main process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    set_event_queue(events)
+
+
+def watch_submissions(drop_dir: str, submissions_path: str, state_path: str,
+                      grade: Callable[[List[str]], None], pending: Callable[[], List[str]],
+                      poll: bool = False):
+    """
+    Ingest archives dropped into a folder and grade what changed, until Ctrl-C.
+
+    Args:
+        drop_dir: Folder to watch
+        submissions_path: Folder submissions are graded from
+        state_path: JSON file recording what was ingested, kept across restarts
+        grade: Called with the entries (names in submissions_path) to grade
+        pending: Returns the entries not graded yet, e.g. left by an earlier
+            run; one that was tried and failed is graded again only once it
+            changes
+        poll: Poll the folder instead of using inotify
+
+    Raises:
+        KeyboardInterrupt: When stopped; the record of what was ingested
+            only covers batches that were graded
+    """
+    seen = load_state(state_path)
+    attempted: Set[str] = set()
+    with DirectoryWatcher(drop_dir, force_poll=poll) as watcher:
+        print(f"Watching {watcher.folder} ({watcher.mode}); Ctrl-C to stop")
+
+        def ingest(names):
+            changed = set()
+            for name in names:
+                try:
+                    changed.update(ingest_archive(os.path.join(watcher.folder, name), submissions_path, seen))
+                except (zipfile.BadZipFile, OSError) as e:
+                    print(f"Skipping {name}: {e}")
+            return changed
+
+        # Archives already in the folder, and anything left ungraded by an earlier run
+        changed = ingest(watcher.existing())
+        while True:
+            todo = sorted(changed | (set(pending()) - attempted))
+            if todo:
+                grade(todo)
+                attempted.update(todo)
+                save_state(state_path, seen)
+            changed = ingest(watcher.wait())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Side-by-side view of the regions two source files have in common.
+
+Usage:
+    python3 scripts/compare_two.py file1.cpp file2.cpp [-o out.html]
+    python3 scripts/compare_two.py student1 student2 Organizer.cpp [-o out.txt]
+
+With three arguments the files are looked up in the submissions folder
+used by the similarity checker. Output goes to stdout unless -o is given;
+an .html output path produces an HTML table instead of text.
+
+Lines are stripped and hashed exactly as the similarity checker does,
+so the identical-line count is the one it reports, and matching regions
+are found wherever they are in either file (functions copied and then
+moved around still show up).
+"""
+
+import sys
+import html
+import argparse
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.similarity_checker import (
+    SUBMISSIONS_FOLDER,
+    compare_fingerprints,
+    get_source_files,
+    hash_lines,
+)
+
+MIN_REGION_LINES = 3  # Shorter common runs are noise (braces, returns)
+COLUMN_WIDTH = 60
+
+
+def find_matching_regions(hashes1: list, hashes2: list,
+                          min_lines: int = MIN_REGION_LINES) -> list:
+    """
+    Find runs of identical lines two files have in common, in any order.
+
+    Every maximal run of consecutive equal line hashes is found through a
+    map from each hash of the second file to its line indexes, so code
+    that was moved around still shows up. The longest runs are kept
+    first, and each line is used by at most one region.
+
+    Args:
+        hashes1: Line hashes of the first file (see similarity_checker.hash_lines)
+        hashes2: Line hashes of the second file
+        min_lines: Minimum run length to report
+
+    Returns:
+        List of (start1, start2, length) index triples into the line lists,
+        in the order of the first file
+    """
+    positions = {}
+    for j, h in enumerate(hashes2):
+        positions.setdefault(h, []).append(j)
+
+    runs = []
+    for i, h in enumerate(hashes1):
+        for j in positions.get(h, ()):
+            if i and j and hashes1[i - 1] == hashes2[j - 1]:
+                continue  # Inside a run that starts earlier
+            size = 1
+            while (i + size < len(hashes1) and j + size < len(hashes2)
+                   and hashes1[i + size] == hashes2[j + size]):
+                size += 1
+            if size >= min_lines:
+                runs.append((i, j, size))
+
+    used1, used2 = set(), set()
+    regions = []
+    for a, b, size in sorted(runs, key=lambda run: (-run[2], run[0], run[1])):
+        lines1, lines2 = range(a, a + size), range(b, b + size)
+        if used1.isdisjoint(lines1) and used2.isdisjoint(lines2):
+            used1.update(lines1)
+            used2.update(lines2)
+            regions.append((a, b, size))
+    return sorted(regions)
+
+
+def render_text(name1: str, src1, name2: str, src2, regions: list, identical: int) -> str:
+    """Render matching regions as two fixed-width columns."""
+    out = []
+    out.append(f"File 1: {name1} ({len(src1.lines)} lines after stripping comments)")
+    out.append(f"File 2: {name2} ({len(src2.lines)} lines after stripping comments)")
+    out.append(f"Identical lines: {identical}")
+    out.append(f"Matching regions: {len(regions)} "
+               f"({sum(size for _, _, size in regions)} lines)")
+
+    for number, (a, b, size) in enumerate(regions, 1):
+        out.append("")
+        out.append(f"=== Region {number}: "
+                   f"lines {src1.original_line(a)}-{src1.original_line(a + size - 1)} <-> "
+                   f"{src2.original_line(b)}-{src2.original_line(b + size - 1)} "
+                   f"({size} lines) ===")
+        for i in range(size):
+            left = src1.lines[a + i][:COLUMN_WIDTH]
+            right = src2.lines[b + i][:COLUMN_WIDTH]
+            out.append(f"{src1.original_line(a + i):5} | {left:<{COLUMN_WIDTH}} || "
+                       f"{src2.original_line(b + i):5} | {right}")
+
+    return '\n'.join(out) + '\n'
+
+
+def render_html(name1: str, src1, name2: str, src2, regions: list, identical: int) -> str:
+    """Render matching regions as an HTML table."""
+    esc = html.escape
+    rows = []
+    for number, (a, b, size) in enumerate(regions, 1):
+        rows.append(f'<tr class="region"><th colspan="4">Region {number} '
+                    f'({size} lines)</th></tr>')
+        for i in range(size):
+            rows.append(
+                f'<tr><td class="n">{src1.original_line(a + i)}</td>'
+                f'<td><code>{esc(src1.lines[a + i])}</code></td>'
+                f'<td class="n">{src2.original_line(b + i)}</td>'
+                f'<td><code>{esc(src2.lines[b + i])}</code></td></tr>')
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{esc(name1)} vs {esc(name2)}</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td {{ border-bottom: 1px solid #eee; padding: 0 6px; vertical-align: top; }}
+td.n {{ color: #888; text-align: right; width: 3em; }}
+tr.region th {{ background: #fdd; text-align: left; padding: 4px; }}
+</style></head><body>
+<p>File 1: {esc(name1)} ({len(src1.lines)} lines)<br>
+File 2: {esc(name2)} ({len(src2.lines)} lines)<br>
+Identical lines: {identical}<br>
+Matching regions: {len(regions)}</p>
+<table>
+<tr><th colspan="2">{esc(name1)}</th><th colspan="2">{esc(name2)}</th></tr>
+{chr(10).join(rows)}
+</table></body></html>
+"""
+
+
+def resolve_files(args: list) -> tuple:
+    """Turn (file1, file2) or (student1, student2, filename) into two paths."""
+    if len(args) == 2:
+        return Path(args[0]), Path(args[1])
+    if len(args) == 3:
+        student1, student2, filename = args
+        paths = []
+        for student in (student1, student2):
+            files = get_source_files(SUBMISSIONS_FOLDER / student)
+            if filename not in files:
+                raise FileNotFoundError(f"{filename} not found for {student}")
+            paths.append(files[filename])
+        return paths[0], paths[1]
+    raise ValueError("expected <file1> <file2> or <student1> <student2> <filename>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two source files side by side")
+    parser.add_argument('targets', nargs='+',
+                        help="<file1> <file2> or <student1> <student2> <filename>")
+    parser.add_argument('-o', '--output', help="Write to this file (.html for HTML)")
+    parser.add_argument('--min-lines', type=int, default=MIN_REGION_LINES,
+                        help="Minimum length of a matching region")
+    args = parser.parse_args()
+
+    try:
+        file1, file2 = resolve_files(args.targets)
+        for path in (file1, file2):
+            if not path.is_file():
+                raise FileNotFoundError(f"{path} not found")
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    src1, hashes1 = hash_lines(file1)
+    src2, hashes2 = hash_lines(file2)
+    identical, _, _ = compare_fingerprints((frozenset(hashes1), len(hashes1)),
+                                           (frozenset(hashes2), len(hashes2)))
+    regions = find_matching_regions(hashes1, hashes2, args.min_lines)
+
+    if args.output and args.output.lower().endswith(('.html', '.htm')):
+        report = render_html(str(file1), src1, str(file2), src2, regions, identical)
+    else:
+        report = render_text(str(file1), src1, str(file2), src2, regions, identical)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"Comparison written to: {args.output}")
+    else:
+        sys.stdout.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Rubric-driven grader.
+
+Usage:
+    python3 scripts/grade.py rubrics/2_assignment.toml [-j N]
+    python3 scripts/grade.py rubrics/2_assignment.toml --resume
+    python3 scripts/grade.py rubrics/2_assignment.toml --watch ~/Downloads/drop
+
+Every assignment is described by a rubric file (see grader/rubric.py);
+this script runs the shared per-submission pipeline around it: extract,
+flatten, rubric checks, file listing, source dump, compile and run. See
+README.md for the outputs and options.
+"""
+
+from pathlib import Path
+import os
+import sys
+import csv
+import json
+import argparse
+import traceback
+import multiprocessing
+from queue import Queue
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from grader.extract import prepare_submissions_folder, unzip_submission, flatten
+from grader.complexity import profile_budget, profile_submission
+from grader.compile import CompileError, build_id, compile_cpp_files, link_executable, run_executable, syntax_check
+from grader.diagnostics import as_records, cap_diagnostics, cohort_error_summary
+from grader.design_check import check_program_design, source_files_dump
+from grader.includes import plan_build
+from grader.journal import JournalError, append_journal, open_journal, read_journal, start_journal
+from grader.logs import log_banner, write_log
+from grader.dedup import group_identical, shared_record
+from grader.index import SubmissionIndex
+from grader.manifest import build_manifest
+from grader.pipeline import Stage, run_pipeline
+from grader.progress import ProgressReporter, emit, set_event_queue
+from grader.results import CheckResult, Status, as_dict, dump_parts, render_text
+from grader.sandbox import ObjectCache, build_sandbox, object_keys, prune_sandboxes
+from grader.watch import watch_submissions, watch_worker
+from grader.rubric import (
+    load_rubric,
+    rubric_items,
+    run_rubric,
+    render_rubric_sections,
+    rubric_results_dict,
+    score_summary,
+)
+from grader.utils import timeout, capture_output
+from scripts.similarity_checker import SimilarityIndex
+
+# Configuration
+ROOT_FOLDER = str(project_root)
+LOG_DIR = "grading_logs"
+LOG_INDEX_FILE = "index.json"
+JOURNAL_FILE = "journal.jsonl"
+PROGRESS_FILE = "progress.txt"
+WATCH_STATE_FILE = "watch_state.json"
+SCORES_FILE = "grading_scores.csv"
+RESULTS_FILE = "grading_results.json"
+ERRORS_FILE = "grading_errors.txt"
+SUBMISSION_TIMEOUT = 300  # Overall timeout for one submission (5 minutes)
+COMPILE_TIMEOUT = 60      # Per g++ call (syntax check, compile, link)
+RUN_TIMEOUT = 3           # Running the program (it usually waits for input)
+STAGE_WORKERS = 4         # Pipeline stages run at once per submission
+BUILD_STAGES = ('files', 'plan', 'cache', 'syntax', 'compile', 'link', 'run')
+
+
+def prepare_entry(entry: str, rubric: dict) -> dict:
+    """
+    Extract and flatten one submission (zip or folder) in the current
+    directory and save its manifest.
+
+    Returns:
+        Dict with 'entry', 'folder' (absolute path), 'extract_output' and
+        'tree_hash' (from the manifest), or with 'error' (a traceback) if
+        that failed
+    """
+    settings = rubric['settings']
+    prepared = {'entry': entry}
+    try:
+        with timeout(SUBMISSION_TIMEOUT), capture_output() as extract_output:
+            if os.path.isdir(entry):
+                fname = entry
+            else:
+                fname = unzip_submission(entry)
+            flatten(fname, exclude_dirs=settings.get('exclude_dirs', []))
+            manifest = build_manifest(fname, settings.get('instructor_files', []))
+        prepared['folder'] = os.path.abspath(fname)
+        prepared['extract_output'] = extract_output.getvalue()
+        prepared['tree_hash'] = manifest.tree_hash
+    except Exception as e:
+        prepared['error'] = f"Error extracting {entry}: {e}\n\n{traceback.format_exc()}"
+    emit('prepared', entry)
+    return prepared
+
+
+def submission_stages(rubric: dict, index: SubmissionIndex, sandbox: str, cache: ObjectCache) -> list:
+    """
+    The grading pipeline of one submission as a stage graph (see grader/pipeline.py).
+
+    Rubric checks and the file structure check run alongside the build.
+    The build parses first (-fsyntax-only), and compiling waits for the
+    required files to be present, so a broken or incomplete submission
+    stops before compile, link and run. Files whose object is already
+    cached are neither parsed nor compiled again.
+
+    Args:
+        rubric: Rubric loaded with load_rubric
+        index: Index of the submission
+        sandbox: Scratch directory the build runs in (see build_sandbox)
+        cache: Object cache shared by every build
+    """
+    settings = rubric['settings']
+    folder = index.folder_path
+    required = settings.get('required_program_files', [])
+    executable_name = f"{Path(folder).name}_output"
+
+    def required_files(values):
+        missing = [f for f in required if not index.exists(f)]
+        if missing:
+            raise FileNotFoundError(f"Missing required files: {', '.join(missing)}")
+
+    def plan(values):
+        if index.manifest is not None:
+            cpp_files = [f.path for f in index.manifest.select(
+                ('.cpp',), roles=('source', 'instructor'), top_level=True)]
+        else:
+            cpp_files = index.files(('.cpp',))
+        build_plan = plan_build(index, cpp_files)
+        print("\n".join(build_plan.report()))
+        return build_plan
+
+    def cache_keys(values):
+        keys = object_keys(index, values['plan'].depends, build_id())
+        sources = values['plan'].sources
+        cached = sum(cache.has(keys[f]) for f in sources)
+        print(f"Object cache: {cached} of {len(sources)} files unchanged")
+        return keys
+
+    def syntax(values):
+        sources = values['plan'].sources
+        changed = [f for f in sources if not cache.has(values['cache'][f])]
+        if sources and not changed:
+            return
+        syntax_check(changed, sandbox, COMPILE_TIMEOUT)
+
+    def compile_objects(values):
+        return compile_cpp_files(values['plan'].sources, sandbox, COMPILE_TIMEOUT,
+                                 cache=cache, keys=values['cache'])
+
+    def link(values):
+        try:
+            return link_executable(values['compile'], executable_name, cwd=sandbox, timeout=COMPILE_TIMEOUT)
+        except CompileError as e:
+            # The plan matches definitions by name; before failing, try the files it left out
+            orphans = values['plan'].orphans
+            if not orphans or not any(d.message.startswith('undefined reference') for d in e.diagnostics):
+                raise
+            print(f"\nUndefined references; retrying with the files left out: {', '.join(orphans)}")
+            try:
+                objects = compile_cpp_files(orphans, sandbox, COMPILE_TIMEOUT,
+                                            cache=cache, keys=values['cache'])
+                return link_executable(values['compile'] + objects, executable_name,
+                                       cwd=sandbox, timeout=COMPILE_TIMEOUT)
+            except CompileError:
+                raise e
+
+    def run(values):
+        print(f"\nAttempting to run {values['link']}...")
+        if not run_executable(values['link'], RUN_TIMEOUT, cwd=sandbox):
+            raise RuntimeError("Execution failed")
+
+    stages = [
+        Stage('checks', lambda values: run_rubric(rubric, index)),
+        Stage('design', lambda values: check_program_design(index, required), budget=10),
+        Stage('files', required_files),
+        Stage('plan', plan),
+        Stage('cache', cache_keys, deps=('plan',)),
+        Stage('syntax', syntax, deps=('cache',)),
+        Stage('compile', compile_objects, deps=('syntax', 'files')),
+        Stage('link', link, deps=('compile',)),
+        Stage('run', run, deps=('link',)),
+    ]
+    if 'benchmark' in rubric:
+        stages.append(Stage('benchmark', lambda values: profile_submission(index, sandbox, rubric['benchmark']),
+                            budget=profile_budget(rubric['benchmark'])))
+    return stages
+
+
+def build_output_text(stages: dict) -> str:
+    """Build log: what each build stage printed, and why it failed or was skipped."""
+    parts = []
+    for name in BUILD_STAGES:
+        result = stages[name]
+        parts.append(result.output)
+        if result.status == Status.SKIPPED:
+            parts.append(f"✗ {name.capitalize()} skipped: {result.error}\n")
+        elif result.status != Status.PASS:
+            parts.append(f"✗ {name.capitalize()} failed: {result.error}\n")
+    return ''.join(parts)
+
+
+def grade_submission(prepared: dict, rubric: dict, on_event=None) -> dict:
+    """
+    Grade one extracted submission (see prepare_entry).
+
+    Args:
+        prepared: Result of prepare_entry
+        rubric: Rubric loaded with load_rubric
+        on_event: Called with each pipeline event (see run_pipeline)
+
+    Returns:
+        Dict with 'entry', 'folder' (absolute path), 'extract_output',
+        'items' (item id -> ItemResult), 'design' (CheckResult),
+        'sources' (FileDump), 'build_output', 'stages' (stage name ->
+        StageResult), 'diagnostics' (compiler and linker errors, capped
+        per file) and 'benchmark' (CheckResult, or None without a
+        [benchmark] table); render it with submission_sections
+    """
+    index = SubmissionIndex(prepared['folder'])
+    with build_sandbox(index) as sandbox:
+        stages = run_pipeline(submission_stages(rubric, index, sandbox, ObjectCache()),
+                              STAGE_WORKERS, on_event)
+
+    if stages['checks'].status != Status.PASS:
+        raise RuntimeError(f"Rubric checks failed: {stages['checks'].error}")
+    design = stages['design'].value
+    if stages['design'].status != Status.PASS:
+        design = CheckResult('check_program_design', Status.ERROR, error=stages['design'].error)
+        design.add(Status.ERROR, f"File structure check did not finish: {stages['design'].error}")
+
+    benchmark = stages['benchmark'].value if 'benchmark' in stages else None
+    if 'benchmark' in stages and stages['benchmark'].status != Status.PASS:
+        # Profiling is advisory: a benchmark that fails or overruns never costs the grade
+        benchmark = CheckResult('profile_complexity', Status.WARN, error=stages['benchmark'].error)
+        benchmark.add(Status.WARN, f"Profiling did not finish: {stages['benchmark'].error}")
+
+    diagnostics = []
+    for name in ('syntax', 'compile', 'link'):
+        diagnostics += getattr(stages[name].exception, 'diagnostics', [])
+
+    return {
+        'entry': prepared['entry'],
+        'folder': prepared['folder'],
+        'extract_output': prepared['extract_output'],
+        'items': stages['checks'].value,
+        'design': design,
+        'sources': source_files_dump(index),
+        'build_output': build_output_text(stages),
+        'stages': stages,
+        'diagnostics': cap_diagnostics(diagnostics),
+        'benchmark': benchmark,
+    }
+
+
+def submission_sections(rubric: dict, graded: dict) -> list:
+    """
+    Render one graded submission as the sections of its text log.
+
+    Returns:
+        List of (section title, parts) pairs; dumped files are left as
+        FileRefs relative to graded['folder'] for write_log to copy
+    """
+    header = "\n".join(["\n" + "="*60, f"{rubric['name'].upper()} GRADING CHECKS", "="*60])
+    return (
+        [('EXTRACT', [graded['extract_output']]), ('GRADING CHECKS', [header + "\n"])]
+        + render_rubric_sections(rubric, graded['items'])
+        + [
+            ('FILE STRUCTURE',
+             ["\n".join(["", "-"*70, "FILE STRUCTURE", "-"*70, render_text(graded['design'])])]),
+            ('SOURCE FILES', dump_parts(graded['sources']) + ["\n"]),
+            ('COMPILATION AND EXECUTION',
+             ["\n".join(["", "-"*70, "COMPILATION AND EXECUTION", "-"*70, graded['build_output']])]),
+        ]
+        + ([('COMPLEXITY',
+             ["\n".join(["", "-"*70, "COMPLEXITY", "-"*70, render_text(graded['benchmark'])])])]
+           if graded['benchmark'] is not None else [])
+    )
+
+
+def submission_results_dict(rubric: dict, graded: dict) -> dict:
+    """JSON-ready results of one graded submission."""
+    data = rubric_results_dict(rubric, graded['items'])
+    data['folder'] = graded['folder']
+    data['design'] = as_dict(graded['design'])
+    data['stages'] = {name: {'status': result.status.value, 'seconds': result.seconds,
+                             'error': result.error}
+                      for name, result in graded['stages'].items()}
+    data['diagnostics'] = as_records(graded['diagnostics'])
+    if graded['benchmark'] is not None:
+        data['benchmark'] = as_dict(graded['benchmark'])
+    return data
+
+
+def write_scores(rubric: dict, scores: dict, output_file: str):
+    """
+    Write one row per submission with each item's score and the totals.
+
+    Args:
+        scores: Submission -> results dict (see submission_results_dict),
+            or None for submissions that were not graded
+    """
+    items = [item for item in rubric_items(rubric) if item['check'] != 'manual']
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['submission'] + [item['id'] for item in items]
+                        + ['earned', 'possible', 'shared_with'])
+        for entry, results in scores.items():
+            if results is None:
+                writer.writerow([entry] + [''] * len(items) + ['', '', ''])
+                continue
+            totals = results['totals']
+            writer.writerow([entry] + [results['items'][item['id']]['score'] for item in items]
+                            + [totals['earned'], totals['possible'], results.get('shared_with', '')])
+
+
+def write_error_summary(records: dict, errors_path: str):
+    """Write the cohort's most common compiler and linker errors (see cohort_error_summary)."""
+    lines = cohort_error_summary({entry: record['results'].get('diagnostics', [])
+                                  for entry, record in records.items() if record['results']})
+    with open(errors_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines or ["No compiler or linker errors"]) + "\n")
+
+
+def write_reports(rubric: dict, records: dict, log_dir: str, scores_path: str, results_path: str,
+                  errors_path: str):
+    """Write the scores CSV, results JSON, error summary and log index from journal records."""
+    log_index = {'rubric': rubric['name'], 'students': {}}
+    for entry, record in sorted(records.items()):
+        log_index['students'][entry] = {
+            'log': os.path.relpath(record['log'], log_dir),
+            'status': record['status'],
+            'summary': record['summary'],
+            'sections': record['sections'],
+        }
+        if 'shared_with' in record:
+            log_index['students'][entry]['shared_with'] = record['shared_with']
+
+    write_scores(rubric, {entry: record['results'] for entry, record in sorted(records.items())},
+                 scores_path)
+    with open(results_path, 'w', encoding='utf-8') as results_file:
+        json.dump({entry: record['results'] for entry, record in sorted(records.items())},
+                  results_file, indent=2, ensure_ascii=False, default=str)
+    write_error_summary(records, errors_path)
+    with open(os.path.join(log_dir, LOG_INDEX_FILE), 'w', encoding='utf-8') as index_file:
+        json.dump(log_index, index_file, indent=2, ensure_ascii=False)
+
+
+def grade_entry(prepared: dict, rubric: dict, log_dir: str) -> dict:
+    """
+    Grade one extracted submission and write its log file.
+
+    Runs in a worker process when grading in parallel, so everything it
+    returns is plain data.
+
+    Returns:
+        Journal record: dict with 'type', 'entry', 'log', 'status'
+        (graded/timeout/error), 'summary', 'sections' (byte ranges),
+        'results' and 'tree_hash'
+    """
+    entry = prepared['entry']
+    log_path = os.path.join(log_dir, f"{entry}.txt")
+    banner = log_banner(entry)
+    record = {'type': 'submission', 'entry': entry, 'log': log_path, 'results': None,
+              'tree_hash': prepared.get('tree_hash')}
+    folder = '.'
+
+    emit('submission_start', entry)
+    try:
+        if 'error' in prepared:
+            raise RuntimeError(prepared['error'])
+        with timeout(SUBMISSION_TIMEOUT):
+            graded = grade_submission(prepared, rubric, on_event=lambda event: emit(
+                event['event'], entry, stage=event['stage'], status=event['status']))
+        sections = submission_sections(rubric, graded)
+        folder = graded['folder']
+        record['status'] = 'graded'
+        record['summary'] = score_summary(rubric, graded['items'])
+        record['results'] = submission_results_dict(rubric, graded)
+    except TimeoutError:
+        record['status'] = 'timeout'
+        record['summary'] = f"✗ OVERALL TIMEOUT: exceeded {SUBMISSION_TIMEOUT} seconds"
+        sections = [('ERROR', [f"\n{record['summary']}\n"])]
+    except Exception as e:
+        record['status'] = 'error'
+        if 'error' in prepared:
+            record['summary'] = prepared['error'].split('\n', 1)[0]
+            sections = [('ERROR', [prepared['error']])]
+        else:
+            record['summary'] = f"Error processing {entry}: {e}"
+            sections = [('ERROR', [f"{record['summary']}\n\n{traceback.format_exc()}"])]
+
+    sections = [('PROCESSING', [banner])] + sections
+    record['sections'] = write_log(log_path, sections, folder)
+    return record
+
+
+def journal_record(journal, record: dict):
+    """Journal a submission record and print its summary line."""
+    append_journal(journal, record)
+    emit('submission_end', record['entry'], status=record['status'])
+    print(f"{record['entry']}: {record['summary']}")
+
+
+def grade_batch(todo: list, rubric: dict, pool, journal_path: str, log_dir: str, done: dict) -> dict:
+    """
+    Extract, group and grade submissions in the current directory,
+    journaling each one as soon as it is done.
+
+    Args:
+        todo: Submissions (zip files or folders) to grade
+        rubric: Loaded rubric
+        pool: ProcessPoolExecutor, or None to grade in this process
+        journal_path: Journal to append to
+        log_dir: Folder for the per-submission logs
+        done: {submission: record} already graded; a submission with the
+            same tree hash as one of them (other than those in todo) gets
+            its results
+
+    Returns:
+        {submission: journal record} for every submission in todo
+    """
+    # Extract, flatten and hash every submission
+    if pool is not None:
+        prepared = list(pool.map(prepare_entry, todo, [rubric] * len(todo)))
+    else:
+        prepared = [prepare_entry(entry, rubric) for entry in todo]
+
+    # Group identical source trees; each group is graded once (or not at all
+    # if an identical submission was graded already)
+    shared, to_grade = group_identical(prepared, done)
+    records = {}
+
+    def journal(record):
+        journal_record(journal_file, record)
+        records[record['entry']] = record
+
+    with open_journal(journal_path) as journal_file:
+        for record, entry in shared:
+            journal(shared_record(record, entry, log_dir))
+
+        # Grade one submission per group, each writing its own log, and journal
+        # the group as soon as it is done
+        if pool is not None:
+            futures = {pool.submit(grade_entry, first, rubric, log_dir): duplicates
+                       for first, duplicates in to_grade}
+            graded = ((future.result(), futures[future]) for future in as_completed(futures))
+        else:
+            graded = ((grade_entry(first, rubric, log_dir), duplicates)
+                      for first, duplicates in to_grade)
+        for record, duplicates in graded:
+            journal(record)
+            for entry in duplicates:
+                journal(shared_record(record, entry, log_dir))
+    return records
+
+
+def list_entries() -> list:
+    """Submissions (zip files or folders) in the current directory."""
+    # (folders extracted from a zip by an earlier run are not submissions of their own)
+    return sorted(e for e in os.listdir(".") if not e.startswith('.') and
+                  (e.endswith(".zip") or (os.path.isdir(e) and not os.path.exists(e + ".zip"))))
+
+
+def entry_folder(entry: str) -> str:
+    """Folder a submission is extracted to (see unzip_submission)."""
+    return entry[:-len(".zip")] if entry.endswith(".zip") else entry
+
+
+def grading_pool(jobs: int, events, initializer=set_event_queue):
+    """Worker processes that send their progress events to `events` (a null context for jobs=1)."""
+    if jobs > 1:
+        return ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=(events,))
+    return nullcontext()
+
+
+def grade_cohort(rubric_path, jobs: int = 1, resume: bool = False):
+    """
+    Grade every submission with the given rubric, one log file each.
+
+    Args:
+        rubric_path: Path to the rubric TOML file
+        jobs: Number of submissions graded at once (worker processes)
+        resume: Keep the existing journal and skip submissions it already
+            has graded (timeouts and errors are graded again)
+    """
+    rubric = load_rubric(rubric_path)
+    scores_path = os.path.abspath(SCORES_FILE)
+    results_path = os.path.abspath(RESULTS_FILE)
+    errors_path = os.path.abspath(ERRORS_FILE)
+    log_dir = os.path.abspath(LOG_DIR)
+    journal_path = os.path.join(log_dir, JOURNAL_FILE)
+    os.makedirs(log_dir, exist_ok=True)
+    prune_sandboxes()
+    ObjectCache().prune()
+
+    try:
+        done = start_journal(rubric, rubric_path, journal_path, resume)
+    except JournalError as e:
+        raise SystemExit(str(e))
+
+    # 1. Prepare submissions folder
+    submissions_path = prepare_submissions_folder(ROOT_FOLDER)
+    os.chdir(submissions_path)
+
+    entries = list_entries()
+    todo = [entry for entry in entries if entry not in done]
+    if done:
+        print(f"Resuming: {len(entries) - len(todo)} of {len(entries)} submissions already graded")
+
+    # Progress events from this process and the workers go to one reporter thread
+    events = multiprocessing.Queue() if jobs > 1 else Queue()
+    set_event_queue(events)
+    reporter = ProgressReporter(events, len(todo), os.path.join(log_dir, PROGRESS_FILE))
+
+    # 2. Extract, group and grade every submission not graded yet
+    with reporter, grading_pool(jobs, events) as pool:
+        grade_batch(todo, rubric, pool, journal_path, log_dir, done)
+
+    set_event_queue(None)
+
+    # 3. Rebuild every report from the journal
+    _, records = read_journal(journal_path)
+    write_reports(rubric, {entry: records[entry] for entry in entries if entry in records},
+                  log_dir, scores_path, results_path, errors_path)
+
+    print(f"Grading complete. Logs written to {log_dir}, scores to {scores_path}, "
+          f"results to {results_path}, compiler errors to {errors_path}")
+
+
+def watch_cohort(rubric_path, drop_dir: str, jobs: int = 1, poll: bool = False):
+    """
+    Grade submissions as they are dropped into a folder, until interrupted.
+
+    Each new or changed submission (see grader/watch.py) is graded,
+    journaled and added to the similarity index right away, and the
+    reports are rewritten after every batch. The journal is kept across
+    restarts, as with --resume.
+
+    Args:
+        rubric_path: Path to the rubric TOML file
+        drop_dir: Folder to watch
+        jobs: Number of submissions graded at once (worker processes)
+        poll: Poll the folder instead of using inotify
+    """
+    rubric = load_rubric(rubric_path)
+    scores_path = os.path.abspath(SCORES_FILE)
+    results_path = os.path.abspath(RESULTS_FILE)
+    errors_path = os.path.abspath(ERRORS_FILE)
+    log_dir = os.path.abspath(LOG_DIR)
+    journal_path = os.path.join(log_dir, JOURNAL_FILE)
+    os.makedirs(log_dir, exist_ok=True)
+    prune_sandboxes()
+    ObjectCache().prune()
+
+    try:
+        done = start_journal(rubric, rubric_path, journal_path, resume=True)
+    except JournalError as e:
+        raise SystemExit(str(e))
+    submissions_path = os.path.join(ROOT_FOLDER, "submissions_unzip")
+    os.makedirs(submissions_path, exist_ok=True)
+    os.chdir(submissions_path)
+    similarity = SimilarityIndex(submissions_path)
+    similarity.update([entry_folder(entry) for entry in list_entries() if entry in done])
+
+    events = multiprocessing.Queue() if jobs > 1 else Queue()
+    set_event_queue(events)
+    reporter = ProgressReporter(events, 0, os.path.join(log_dir, PROGRESS_FILE))
+
+    with reporter, grading_pool(jobs, events, initializer=watch_worker) as pool:
+        def grade(todo):
+            reporter.total += len(todo)
+            for entry, record in grade_batch(todo, rubric, pool, journal_path, log_dir, done).items():
+                if record['status'] == 'graded':
+                    done[entry] = record
+                else:
+                    done.pop(entry, None)
+
+            entries = list_entries()
+            _, records = read_journal(journal_path)
+            write_reports(rubric, {entry: records[entry] for entry in entries if entry in records},
+                          log_dir, scores_path, results_path, errors_path)
+            matches = similarity.update([entry_folder(entry) for entry in todo])
+            similarity.write()
+            print(f"Graded {len(todo)} submission(s), {len(entries)} in total; "
+                  f"{matches} similarity match(es) involving them")
+
+        try:
+            watch_submissions(drop_dir, submissions_path, os.path.join(log_dir, WATCH_STATE_FILE), grade,
+                              pending=lambda: [entry for entry in list_entries() if entry not in done],
+                              poll=poll)
+        except KeyboardInterrupt:
+            # Submissions being graded finish; queued ones are dropped
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            print("Stopped watching")
+    set_event_queue(None)
+
+    print(f"Logs written to {log_dir}, scores to {scores_path}, "
+          f"results to {results_path}, compiler errors to {errors_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grade all submissions with a rubric")
+    parser.add_argument('rubric', help="Path to the rubric TOML file")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="Number of submissions to grade in parallel (default 1)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip submissions already graded in the journal of an earlier run")
+    parser.add_argument('--watch', metavar='DIR',
+                        help="Keep grading submissions dropped into DIR until interrupted")
+    parser.add_argument('--poll', action='store_true',
+                        help="With --watch, poll DIR instead of using inotify")
+    args = parser.parse_args()
+    if args.watch:
+        watch_cohort(Path(args.rubric).resolve(), args.watch, jobs=args.jobs, poll=args.poll)
+    else:
+        grade_cohort(Path(args.rubric).resolve(), jobs=args.jobs, resume=args.resume)
@@ -5,17 +5,44 @@ Compares source files across all submissions to detect potential plagiarism.
 """
 
 import os
-import re
+import sys
+import csv
+import hashlib
 import subprocess
 from pathlib import Path
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    import numpy as np
+    from scipy import sparse
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # Group analysis is skipped without NumPy/SciPy
+    np = None
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from grader.manifest import load_manifest
+from grader.strip import read_stripped, strip_source
+from scripts.similarity_report import (
+    write_record,
+    read_records,
+    iter_pair_summaries,
+    write_text_report,
+    write_html_report,
+)
+
 # Configuration
 ROOT_FOLDER = Path(__file__).resolve().parent.parent
 SUBMISSIONS_FOLDER = ROOT_FOLDER / "submissions_unzip"
 OUTPUT_FILE = ROOT_FOLDER / "similarity_report.txt"
+HTML_REPORT_FILE = ROOT_FOLDER / "similarity_report.html"
+RESULTS_FILE = ROOT_FOLDER / "similarity_results.jsonl"
+MATRIX_FILE = ROOT_FOLDER / "similarity_matrix.csv"
 SIMILARITY_THRESHOLD = 50  # Number of identical lines to flag
+WORKERS = None  # Fingerprinting processes (None = one per CPU)
+COMMON_LINE_FRACTION = 0.5  # Ignore lines shared by more than this fraction of students
 
 # Files/folders to skip
 SKIP_DIRS = {'linkedbagds', '.git', '.vs', 'x64', 'debug', 'release', 'build',
@@ -23,17 +50,6 @@ SKIP_DIRS = {'linkedbagds', '.git', '.vs', 'x64', 'debug', 'release', 'build',
 SKIP_PATTERNS = ['cmake', '.cmake', 'cmakelist']
 
 
-def strip_comments(content: str) -> str:
-    """Remove C/C++ comments from source code."""
-    # Remove single-line comments
-    content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-    # Remove multi-line comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-    # Remove empty lines and normalize whitespace
-    lines = [line.strip() for line in content.split('\n') if line.strip()]
-    return '\n'.join(lines)
-
-
 def should_skip_file(filename: str) -> bool:
     """Check if file should be skipped."""
     lower = filename.lower()
@@ -55,10 +71,20 @@ def should_skip_dir(dirname: str) -> bool:
 def get_source_files(submission_path: Path) -> dict:
     """
     Get all source files from a submission.
+    Uses the manifest written at grading time when there is one
+    (student-written .cpp/.h files only), otherwise walks the folder.
     Returns dict mapping filename -> full path
     """
     source_files = {}
 
+    manifest = load_manifest(str(submission_path))
+    if manifest is not None:
+        for f in manifest.select(('.cpp', '.h'), roles=('source',)):
+            name = f.path.rsplit('/', 1)[-1]
+            if not should_skip_file(name):
+                source_files[name] = submission_path / f.path
+        return source_files
+
     for root, dirs, files in os.walk(submission_path):
         # Filter out skipped directories
         dirs[:] = [d for d in dirs if not should_skip_dir(d)]
@@ -83,25 +109,255 @@ def count_identical_lines(content1: str, content2: str) -> int:
     return len(lines1.intersection(lines2))
 
 
+def line_hash(line: str) -> int:
+    """Stable 64-bit hash of a stripped line (same value in every process)."""
+    digest = hashlib.blake2b(line.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def hash_lines(path: Path) -> tuple:
+    """
+    Read and strip one source file and hash each of its non-empty lines.
+    Returns (StrippedSource, list of line hashes in file order)
+    """
+    try:
+        source = read_stripped(path)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        source = strip_source('')
+    return source, [line_hash(l) for l in source.lines]
+
+
+def fingerprint_file(path: Path) -> tuple:
+    """
+    Read and strip one source file, reducing it to a compact fingerprint.
+    Returns (set of line hashes, total non-empty lines)
+    """
+    _, hashes = hash_lines(path)
+    return frozenset(hashes), len(hashes)
+
+
+def fingerprint_submissions(submission_files: dict, workers: int = None) -> dict:
+    """
+    Fingerprint every source file of every submission exactly once,
+    spread across a process pool.
+
+    Args:
+        submission_files: Dict mapping submission name -> {filename: path}
+        workers: Number of worker processes (None = one per CPU)
+
+    Returns:
+        Dict mapping path -> (set of line hashes, total non-empty lines)
+    """
+    paths = sorted({path for files in submission_files.values() for path in files.values()})
+    if not paths:
+        return {}
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        fingerprints = pool.map(fingerprint_file, paths, chunksize=chunksize)
+        return dict(zip(paths, fingerprints))
+
+
+def compare_fingerprints(fp1: tuple, fp2: tuple) -> tuple:
+    """
+    Compare two precomputed file fingerprints.
+    Returns (identical_lines, total_lines_file1, total_lines_file2)
+    """
+    hashes1, total1 = fp1
+    hashes2, total2 = fp2
+    return len(hashes1 & hashes2), total1, total2
+
+
 def compare_files(file1: Path, file2: Path) -> tuple:
     """
     Compare two files after stripping comments.
     Returns (identical_lines, total_lines_file1, total_lines_file2)
     """
-    try:
-        with open(file1, 'r', encoding='utf-8', errors='ignore') as f:
-            content1 = strip_comments(f.read())
-        with open(file2, 'r', encoding='utf-8', errors='ignore') as f:
-            content2 = strip_comments(f.read())
+    return compare_fingerprints(fingerprint_file(file1), fingerprint_file(file2))
 
-        identical = count_identical_lines(content1, content2)
-        total1 = len([l for l in content1.split('\n') if l])
-        total2 = len([l for l in content2.split('\n') if l])
 
-        return identical, total1, total2
-    except Exception as e:
-        print(f"Error comparing files: {e}")
-        return 0, 0, 0
+def compare_submissions(sub1_name: str, sub1_files: dict, sub2_name: str, sub2_files: dict,
+                        fingerprints: dict, threshold: int) -> list:
+    """
+    Compare the files with matching names of two submissions.
+    Returns a 'match' record for each file pair with at least `threshold` identical lines
+    """
+    records = []
+    for filename in sorted(set(sub1_files.keys()) & set(sub2_files.keys())):
+        file1 = sub1_files[filename]
+        file2 = sub2_files[filename]
+        identical, total1, total2 = compare_fingerprints(fingerprints[file1], fingerprints[file2])
+        if identical >= threshold:
+            records.append({
+                'type': 'match',
+                'student1': sub1_name,
+                'student2': sub2_name,
+                'file': filename,
+                'identical_lines': identical,
+                'total_lines_1': total1,
+                'total_lines_2': total2,
+                'file1_path': str(file1),
+                'file2_path': str(file2)
+            })
+    return records
+
+
+def build_fingerprint_matrix(submission_files: dict, fingerprints: dict) -> tuple:
+    """
+    Build a sparse binary student x fingerprint matrix.
+
+    Each row is the union of line hashes over all of a student's files.
+    Lines shared by more than COMMON_LINE_FRACTION of the cohort (braces,
+    includes, instructor-provided code) are dropped so they don't glue
+    unrelated students together.
+
+    Returns (student names, CSR matrix of shape students x fingerprints)
+    """
+    students = list(submission_files.keys())
+    rows = []
+    for name in students:
+        hashes = set()
+        for path in submission_files[name].values():
+            hashes |= fingerprints[path][0]
+        rows.append(np.fromiter(hashes, dtype=np.uint64, count=len(hashes)))
+
+    row_ids = np.repeat(np.arange(len(students)), [len(r) for r in rows])
+    all_hashes = np.concatenate(rows) if rows else np.empty(0, dtype=np.uint64)
+    _, col_ids = np.unique(all_hashes, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(col_ids), dtype=np.int32), (row_ids, col_ids.ravel())),
+        shape=(len(students), int(col_ids.max()) + 1 if len(col_ids) else 0))
+
+    student_counts = np.asarray(matrix.sum(axis=0)).ravel()
+    max_count = max(2, int(COMMON_LINE_FRACTION * len(students)))
+    return students, matrix[:, np.flatnonzero(student_counts <= max_count)]
+
+
+def find_similarity_groups(students: list, matrix, threshold: int) -> tuple:
+    """
+    Score every pair of students in one sparse product and cluster them.
+
+    Students are linked when they share at least `threshold` fingerprints;
+    groups are the connected components of that graph.
+
+    Returns (overlap matrix, list of group dicts ranked by size then overlap)
+    """
+    overlap = (matrix @ matrix.T).tocsr()
+    overlap.setdiag(0)
+    overlap.eliminate_zeros()
+
+    linked = overlap >= threshold
+    _, labels = connected_components(linked, directed=False)
+
+    groups = []
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        if len(members) < 2:
+            continue
+        block = overlap[members][:, members].toarray()
+        pair_scores = block[np.triu_indices(len(members), k=1)]
+        groups.append({
+            'students': [students[i] for i in members],
+            'max_overlap': int(pair_scores.max()),
+            'mean_overlap': float(pair_scores.mean()),
+        })
+
+    groups.sort(key=lambda g: (len(g['students']), g['max_overlap']), reverse=True)
+    return overlap, groups
+
+
+def write_similarity_matrix(students: list, overlap, output_file: Path):
+    """Write the student x student overlap matrix as CSV, ready for a heat map."""
+    dense = overlap.toarray()
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([''] + students)
+        for name, row in zip(students, dense):
+            writer.writerow([name] + row.tolist())
+
+
+class SimilarityIndex:
+    """
+    Similarity results kept up to date one submission at a time.
+
+    Used by the grader's watch mode (scripts/grade.py --watch): each
+    submission is fingerprinted when it arrives and compared with the
+    ones already indexed, instead of comparing the whole cohort again.
+    write() produces the same results file and reports as main().
+    """
+
+    def __init__(self, submissions_folder: Path = SUBMISSIONS_FOLDER,
+                 threshold: int = SIMILARITY_THRESHOLD):
+        self.submissions_folder = Path(submissions_folder)
+        self.threshold = threshold
+        self.submission_files = {}  # name -> {filename: path}
+        self.fingerprints = {}      # path -> fingerprint
+        self.matches = {}           # (name1, name2) -> match records
+
+    def update(self, names: list) -> int:
+        """
+        (Re)index submission folders, comparing them with every other one.
+        Folders that no longer exist are dropped from the index.
+        Returns the number of matches found for them
+        """
+        names = set(names)
+        for name in names:
+            for path in self.submission_files.pop(name, {}).values():
+                self.fingerprints.pop(path, None)
+        self.matches = {pair: records for pair, records in self.matches.items()
+                        if not names & set(pair)}
+
+        added = {}
+        for name in names:
+            folder = self.submissions_folder / name
+            if folder.is_dir():
+                added[name] = get_source_files(folder)
+        if len(added) > 1:
+            self.fingerprints.update(fingerprint_submissions(added, WORKERS))
+        else:
+            for files in added.values():
+                self.fingerprints.update((path, fingerprint_file(path)) for path in files.values())
+        self.submission_files.update(added)
+
+        found = 0
+        for name in added:
+            for other in self.submission_files:
+                pair = tuple(sorted((name, other)))
+                if other == name or pair in self.matches:
+                    continue
+                self.matches[pair] = compare_submissions(
+                    pair[0], self.submission_files[pair[0]], pair[1], self.submission_files[pair[1]],
+                    self.fingerprints, self.threshold)
+                found += len(self.matches[pair])
+        return found
+
+    def write(self, results_file: Path = RESULTS_FILE, text_file: Path = OUTPUT_FILE,
+              html_file: Path = HTML_REPORT_FILE, matrix_file: Path = MATRIX_FILE):
+        """Rewrite the results file, matrix and reports from the index."""
+        with open(results_file, 'w', encoding='utf-8') as results:
+            write_record(results, {
+                'type': 'run',
+                'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'submissions_folder': str(self.submissions_folder),
+                'threshold': self.threshold,
+                'total_submissions': len(self.submission_files),
+            })
+            for pair in sorted(self.matches):
+                for record in self.matches[pair]:
+                    write_record(results, record)
+
+            if np is not None and self.submission_files:
+                submission_files = dict(sorted(self.submission_files.items()))
+                students, matrix = build_fingerprint_matrix(submission_files, self.fingerprints)
+                overlap, groups = find_similarity_groups(students, matrix, self.threshold)
+                write_similarity_matrix(students, overlap, matrix_file)
+                for rank, group in enumerate(groups, 1):
+                    write_record(results, {'type': 'group', 'rank': rank, **group})
+
+        write_text_report(results_file, text_file)
+        write_html_report(results_file, html_file)
 
 
 def main():
@@ -128,99 +384,90 @@ def main():
     for sub in submissions:
         submission_files[sub.name] = get_source_files(sub)
 
-    # Track similarities
-    similarities = []
-
-    # Compare each submission against all others
-    for i, sub1_name in enumerate(submission_files.keys()):
-        sub1_files = submission_files[sub1_name]
-
-        for sub2_name in list(submission_files.keys())[i+1:]:
-            sub2_files = submission_files[sub2_name]
-
-            # Compare files with matching names
-            common_files = set(sub1_files.keys()) & set(sub2_files.keys())
-
-            for filename in common_files:
-                file1 = sub1_files[filename]
-                file2 = sub2_files[filename]
-
-                identical, total1, total2 = compare_files(file1, file2)
+    # Read, strip and fingerprint each file once; pairs only touch the results
+    fingerprints = fingerprint_submissions(submission_files, WORKERS)
+    print(f"Fingerprinted {len(fingerprints)} source files")
+    print()
 
-                if identical >= SIMILARITY_THRESHOLD:
-                    similarity = {
-                        'student1': sub1_name,
-                        'student2': sub2_name,
-                        'file': filename,
-                        'identical_lines': identical,
-                        'total_lines_1': total1,
-                        'total_lines_2': total2,
-                        'file1_path': str(file1),
-                        'file2_path': str(file2)
-                    }
-                    similarities.append(similarity)
+    # Stream every finding to the results file as it is found
+    total_found = 0
+    pair_count = 0
+    with open(RESULTS_FILE, 'w', encoding='utf-8') as results:
+        write_record(results, {
+            'type': 'run',
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'submissions_folder': str(SUBMISSIONS_FOLDER),
+            'threshold': SIMILARITY_THRESHOLD,
+            'total_submissions': len(submissions),
+        })
+
+        # Compare each submission against all others
+        names = list(submission_files.keys())
+        for i, sub1_name in enumerate(names):
+            sub1_files = submission_files[sub1_name]
+
+            for sub2_name in names[i+1:]:
+                sub2_files = submission_files[sub2_name]
+
+                records = compare_submissions(sub1_name, sub1_files, sub2_name, sub2_files,
+                                              fingerprints, SIMILARITY_THRESHOLD)
+                for record in records:
+                    write_record(results, record)
+                    total_found += 1
 
                     # Print to console
                     print(f"SIMILARITY FOUND:")
                     print(f"  Students: {sub1_name} <-> {sub2_name}")
-                    print(f"  File: {filename}")
-                    print(f"  Identical lines: {identical}")
-                    print(f"  File 1: {file1} ({total1} lines)")
-                    print(f"  File 2: {file2} ({total2} lines)")
+                    print(f"  File: {record['file']}")
+                    print(f"  Identical lines: {record['identical_lines']}")
+                    print(f"  File 1: {record['file1_path']} ({record['total_lines_1']} lines)")
+                    print(f"  File 2: {record['file2_path']} ({record['total_lines_2']} lines)")
                     print()
 
-    # Write report to file
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(f"Similarity Report\n")
-        f.write(f"=================\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Submissions folder: {SUBMISSIONS_FOLDER}\n")
-        f.write(f"Threshold: {SIMILARITY_THRESHOLD} identical lines\n")
-        f.write(f"Total submissions: {len(submissions)}\n")
-        f.write(f"\n")
-
-        if similarities:
-            f.write(f"SIMILARITIES FOUND: {len(similarities)}\n")
-            f.write(f"{'='*60}\n\n")
-
-            # Group by student pairs
-            pair_similarities = defaultdict(list)
-            for sim in similarities:
-                pair = (sim['student1'], sim['student2'])
-                pair_similarities[pair].append(sim)
-
-            for pair, sims in pair_similarities.items():
-                f.write(f"Students: {pair[0]} <-> {pair[1]}\n")
-                f.write(f"-" * 50 + "\n")
-                for sim in sims:
-                    f.write(f"  File: {sim['file']}\n")
-                    f.write(f"    Identical lines: {sim['identical_lines']}\n")
-                    f.write(f"    Path 1: {sim['file1_path']} ({sim['total_lines_1']} lines)\n")
-                    f.write(f"    Path 2: {sim['file2_path']} ({sim['total_lines_2']} lines)\n")
-                f.write(f"\n")
-        else:
-            f.write("No similarities found above threshold.\n")
+                pair_count += bool(records)
+
+        # Cluster students into copying groups from one sparse product
+        if np is None:
+            print("NumPy/SciPy not installed; skipping group analysis")
+        elif submission_files:
+            students, matrix = build_fingerprint_matrix(submission_files, fingerprints)
+            overlap, groups = find_similarity_groups(students, matrix, SIMILARITY_THRESHOLD)
+            write_similarity_matrix(students, overlap, MATRIX_FILE)
+            for rank, group in enumerate(groups, 1):
+                write_record(results, {'type': 'group', 'rank': rank, **group})
+
+    # Reports are rebuilt from the results file, not from memory
+    write_text_report(RESULTS_FILE, OUTPUT_FILE)
+    write_html_report(RESULTS_FILE, HTML_REPORT_FILE)
 
     # Summary
     print(f"{'='*60}")
     print(f"SUMMARY")
     print(f"{'='*60}")
     print(f"Total submissions checked: {len(submissions)}")
-    print(f"Total similarities found: {len(similarities)}")
+    print(f"Total similarities found: {total_found}")
 
-    if similarities:
-        # Get unique student pairs
-        pairs = set((s['student1'], s['student2']) for s in similarities)
-        print(f"Student pairs with similarities: {len(pairs)}")
+    if total_found:
+        print(f"Student pairs with similarities: {pair_count}")
         print()
         print("Pairs:")
-        for pair in sorted(pairs):
-            pair_sims = [s for s in similarities
-                        if s['student1'] == pair[0] and s['student2'] == pair[1]]
-            print(f"  {pair[0]} <-> {pair[1]}: {len(pair_sims)} file(s)")
+        for pair in iter_pair_summaries(RESULTS_FILE):
+            print(f"  {pair['student1']} <-> {pair['student2']}: {len(pair['files'])} file(s)")
+
+    groups = list(read_records(RESULTS_FILE, 'group'))
+    if groups:
+        print()
+        print(f"Similarity groups: {len(groups)}")
+        for group in groups:
+            print(f"  {group['rank']}. {', '.join(group['students'])} "
+                  f"(max overlap {group['max_overlap']})")
 
     print()
+    print(f"Results written to: {RESULTS_FILE}")
     print(f"Full report written to: {OUTPUT_FILE}")
+    print(f"HTML summary written to: {HTML_REPORT_FILE}")
+    if np is not None and submission_files:
+        print(f"Similarity matrix written to: {MATRIX_FILE}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Report generator for similarity checker results.
+
+The similarity checker streams every finding to a JSONL results file as
+it is found. This module turns that file into the plain-text report and
+a sortable HTML summary of the top pairs and groups. Records are read one
+at a time, so memory stays bounded by the number of pairs shown.
+
+Usage:
+    python3 scripts/similarity_report.py [results.jsonl] [--top K] [--text FILE] [--html FILE]
+
+Reports for a results file other than the default are written next to
+it, named after it (results.txt, results.html).
+"""
+
+import sys
+import json
+import html
+import heapq
+import argparse
+from itertools import groupby
+from pathlib import Path
+
+# Configuration
+ROOT_FOLDER = Path(__file__).resolve().parent.parent
+RESULTS_FILE = ROOT_FOLDER / "similarity_results.jsonl"
+TEXT_REPORT_FILE = ROOT_FOLDER / "similarity_report.txt"
+HTML_REPORT_FILE = ROOT_FOLDER / "similarity_report.html"
+TOP_K = 50
+
+
+def write_record(stream, record: dict):
+    """Append one result record to an open JSONL results file."""
+    stream.write(json.dumps(record) + '\n')
+
+
+def read_records(results_file: Path, record_type: str = None):
+    """Yield records from a JSONL results file, optionally of one type."""
+    with open(results_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record_type is None or record.get('type') == record_type:
+                yield record
+
+
+def read_run_info(results_file: Path) -> dict:
+    """Return the run header record (first line of the results file)."""
+    return next(read_records(results_file, 'run'), {})
+
+
+def iter_pair_summaries(results_file: Path):
+    """
+    Yield one summary per student pair.
+
+    The checker compares pair by pair, so all matches for a pair are
+    contiguous in the results file and can be grouped without sorting.
+
+    Yields:
+        Dict with student1, student2, files (match records) and
+        identical_lines (total over all files)
+    """
+    matches = read_records(results_file, 'match')
+    for (student1, student2), records in groupby(
+            matches, key=lambda r: (r['student1'], r['student2'])):
+        files = list(records)
+        yield {
+            'student1': student1,
+            'student2': student2,
+            'files': files,
+            'identical_lines': sum(r['identical_lines'] for r in files),
+        }
+
+
+def write_text_report(results_file: Path, output_file: Path):
+    """Write the plain-text similarity report from a results file."""
+    run = read_run_info(results_file)
+    total = sum(1 for _ in read_records(results_file, 'match'))
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(f"Similarity Report\n")
+        f.write(f"=================\n")
+        f.write(f"Generated: {run.get('generated', '')}\n")
+        f.write(f"Submissions folder: {run.get('submissions_folder', '')}\n")
+        f.write(f"Threshold: {run.get('threshold', '')} identical lines\n")
+        f.write(f"Total submissions: {run.get('total_submissions', '')}\n")
+        f.write(f"\n")
+
+        if total:
+            f.write(f"SIMILARITIES FOUND: {total}\n")
+            f.write(f"{'='*60}\n\n")
+
+            for pair in iter_pair_summaries(results_file):
+                f.write(f"Students: {pair['student1']} <-> {pair['student2']}\n")
+                f.write(f"-" * 50 + "\n")
+                for sim in pair['files']:
+                    f.write(f"  File: {sim['file']}\n")
+                    f.write(f"    Identical lines: {sim['identical_lines']}\n")
+                    f.write(f"    Path 1: {sim['file1_path']} ({sim['total_lines_1']} lines)\n")
+                    f.write(f"    Path 2: {sim['file2_path']} ({sim['total_lines_2']} lines)\n")
+                f.write(f"\n")
+        else:
+            f.write("No similarities found above threshold.\n")
+
+        groups = list(read_records(results_file, 'group'))
+        if groups:
+            f.write(f"\nSIMILARITY GROUPS: {len(groups)}\n")
+            f.write(f"{'='*60}\n\n")
+            for group in groups:
+                f.write(f"Group {group['rank']}: {len(group['students'])} students "
+                        f"(max overlap {group['max_overlap']}, "
+                        f"mean {group['mean_overlap']:.1f} lines)\n")
+                f.write(f"  {', '.join(group['students'])}\n")
+
+
+_SORT_SCRIPT = """
+document.querySelectorAll('th[data-col]').forEach(function (th) {
+  th.addEventListener('click', function () {
+    var table = th.closest('table'), body = table.tBodies[0];
+    var col = +th.dataset.col, asc = th.dataset.asc !== '1';
+    table.querySelectorAll('th').forEach(function (h) { h.dataset.asc = ''; });
+    th.dataset.asc = asc ? '1' : '0';
+    var rows = Array.prototype.slice.call(body.rows);
+    rows.sort(function (a, b) {
+      var x = a.cells[col].dataset.v || a.cells[col].textContent;
+      var y = b.cells[col].dataset.v || b.cells[col].textContent;
+      var d = (isNaN(x) || isNaN(y)) ? x.localeCompare(y) : x - y;
+      return asc ? d : -d;
+    });
+    rows.forEach(function (r) { body.appendChild(r); });
+  });
+});
+"""
+
+
+def _table(headers: list, rows: list) -> str:
+    """Render a sortable HTML table; rows are lists of already-escaped cells."""
+    head = ''.join(f'<th data-col="{i}">{html.escape(h)}</th>'
+                   for i, h in enumerate(headers))
+    body = '\n'.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>'
+                     for row in rows)
+    return f'<table><thead><tr>{head}</tr></thead><tbody>\n{body}\n</tbody></table>'
+
+
+def write_html_report(results_file: Path, output_file: Path, top_k: int = TOP_K):
+    """
+    Write a sortable HTML summary of the top-K pairs and groups.
+
+    Args:
+        results_file: JSONL results file written by the similarity checker
+        output_file: Path of the HTML file to write
+        top_k: Number of pairs and groups to include
+    """
+    esc = html.escape
+    run = read_run_info(results_file)
+    top_pairs = heapq.nlargest(top_k, iter_pair_summaries(results_file),
+                               key=lambda p: p['identical_lines'])
+    groups = heapq.nsmallest(top_k, read_records(results_file, 'group'),
+                             key=lambda g: g['rank'])
+
+    pair_rows = []
+    for rank, pair in enumerate(top_pairs, 1):
+        files = ', '.join(f"{esc(r['file'])} ({r['identical_lines']})" for r in pair['files'])
+        pair_rows.append([rank, esc(pair['student1']), esc(pair['student2']),
+                          pair['identical_lines'], len(pair['files']), files])
+
+    group_rows = []
+    for group in groups:
+        group_rows.append([group['rank'], len(group['students']), group['max_overlap'],
+                           f"{group['mean_overlap']:.1f}",
+                           esc(', '.join(group['students']))])
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Similarity Report</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 8px; }}
+th {{ background: #eee; cursor: pointer; }}
+</style></head><body>
+<h1>Similarity Report</h1>
+<p>Generated: {esc(str(run.get('generated', '')))}<br>
+Threshold: {esc(str(run.get('threshold', '')))} identical lines<br>
+Total submissions: {esc(str(run.get('total_submissions', '')))}</p>
+<h2>Groups</h2>
+{_table(['Rank', 'Students', 'Max overlap', 'Mean overlap', 'Members'], group_rows)}
+<h2>Top {len(pair_rows)} pairs</h2>
+{_table(['Rank', 'Student 1', 'Student 2', 'Identical lines', 'Files', 'Per file'], pair_rows)}
+<script>{_SORT_SCRIPT}</script>
+</body></html>
+""")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build similarity reports from results")
+    parser.add_argument('results', nargs='?', default=str(RESULTS_FILE),
+                        help="JSONL results file from the similarity checker")
+    parser.add_argument('--top', type=int, default=TOP_K,
+                        help="Number of pairs and groups in the HTML summary")
+    parser.add_argument('--text', help="Text report to write (default: next to the results file)")
+    parser.add_argument('--html', help="HTML summary to write (default: next to the results file)")
+    args = parser.parse_args()
+
+    results_file = Path(args.results)
+    if not results_file.exists():
+        print(f"Error: results file not found: {results_file}")
+        sys.exit(1)
+
+    # Reports for the default results file keep their usual names; any other
+    # results file gets reports named after it, so they do not overwrite those
+    if results_file.resolve() == RESULTS_FILE.resolve():
+        text_file, html_file = TEXT_REPORT_FILE, HTML_REPORT_FILE
+    else:
+        text_file, html_file = results_file.with_suffix('.txt'), results_file.with_suffix('.html')
+    text_file = Path(args.text) if args.text else text_file
+    html_file = Path(args.html) if args.html else html_file
+
+    write_text_report(results_file, text_file)
+    write_html_report(results_file, html_file, args.top)
+    print(f"Text report written to: {text_file}")
+    print(f"HTML report written to: {html_file}")
+
+
+if __name__ == "__main__":
+    main()
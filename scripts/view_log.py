@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Viewer for per-student grading logs.
+
+grade.py writes one log per submission plus an index mapping each student
+to its log, the byte range of every section and a summary line. This
+script reads only the index and the requested byte range, so looking up
+one student (or one rubric section) costs the same for any cohort size.
+Files dumped more than once are stored once per log; printing a section
+fills its references back in from the first copy.
+
+Usage:
+    python3 scripts/view_log.py                      # one summary line per student
+    python3 scripts/view_log.py STUDENT              # list the student's sections
+    python3 scripts/view_log.py STUDENT SECTION      # print matching section(s)
+    python3 scripts/view_log.py STUDENT --all        # print the whole log
+"""
+
+import os
+import sys
+import json
+import argparse
+
+DEFAULT_INDEX = os.path.join("grading_logs", "index.json")
+
+
+def load_index(index_file: str) -> dict:
+    """Load a log index written by grade.py."""
+    with open(index_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def find_student(log_index: dict, name: str) -> str:
+    """
+    Resolve a student name: exact match first, then a unique substring.
+
+    Raises:
+        KeyError: If no student (or more than one) matches
+    """
+    students = log_index['students']
+    if name in students:
+        return name
+    matches = [s for s in students if name.lower() in s.lower()]
+    if len(matches) != 1:
+        raise KeyError(f"'{name}' matches {len(matches)} students: {', '.join(matches[:10])}")
+    return matches[0]
+
+
+def read_section(log_path: str, section: dict, expand: bool = True) -> str:
+    """
+    Read one section of a log by seeking straight to its byte range.
+
+    Args:
+        log_path: Path to the student's log
+        section: Section entry from the index
+        expand: Replace references to files dumped earlier in the log
+            with the dumped bytes
+    """
+    with open(log_path, 'rb') as f:
+        f.seek(section['offset'])
+        data = f.read(section['length'])
+        if expand:
+            for ref in reversed(section.get('refs', [])):
+                f.seek(ref['offset'])
+                copy = f.read(ref['length'])
+                at = ref['at'] - section['offset']
+                data = data[:at] + copy + data[at + ref['marker']:]
+    return data.decode('utf-8', errors='replace')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="View per-student grading logs")
+    parser.add_argument('student', nargs='?', help="Student (exact name or unique substring)")
+    parser.add_argument('section', nargs='?', help="Section title (substring, case-insensitive)")
+    parser.add_argument('--all', action='store_true', help="Print the student's whole log")
+    parser.add_argument('--index', default=DEFAULT_INDEX, help="Path to the log index")
+    args = parser.parse_args()
+
+    log_index = load_index(args.index)
+    log_dir = os.path.dirname(os.path.abspath(args.index))
+
+    if not args.student:
+        print(f"{log_index['rubric']}: {len(log_index['students'])} submissions")
+        for student, info in sorted(log_index['students'].items()):
+            print(f"  {student}: {info['summary']}")
+        return
+
+    try:
+        student = find_student(log_index, args.student)
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(1)
+    info = log_index['students'][student]
+    log_path = os.path.join(log_dir, info['log'])
+
+    if args.all:
+        for section in info['sections']:
+            sys.stdout.write(read_section(log_path, section, expand=False))
+        return
+
+    if not args.section:
+        print(f"{student}: {info['summary']}")
+        print(f"Log: {log_path}")
+        for section in info['sections']:
+            print(f"  {section['title']} ({section['length']} bytes)")
+        return
+
+    wanted = [s for s in info['sections'] if args.section.lower() in s['title'].lower()]
+    if not wanted:
+        print(f"No section matching '{args.section}' for {student}")
+        sys.exit(1)
+    for section in wanted:
+        sys.stdout.write(read_section(log_path, section))
+
+
+if __name__ == "__main__":
+    main()